@@ -3,25 +3,21 @@ from turtle import Turtle
 
 class Alien(Turtle):
     """
-    A class to represent an alien in the game.
+    A class to represent an alien sprite in the game.
 
     Attributes:
         frames (list): List of image frames for alien animation.
         frame_index (int): Current index of the frame being displayed.
-        direction (int): Current direction of movement (1 for right, -1 for left).
-        speed (float): Speed of the alien's movement.
 
     Methods:
-        move(): Moves the alien and changes direction at screen edges.
-        update_animation(): Updates the alien's animation frame.
+        set_frame(frame_index): Shows the given animation frame.
     """
 
-    def __init__(self, speed, frames):
+    def __init__(self, frames):
         """
-        Initializes the alien with its animation frames and movement speed.
+        Initializes the alien with its animation frames.
 
         Args:
-            speed (float): Speed of the alien's movement.
             frames (list): List of image frames for alien animation.
         """
         super().__init__()
@@ -29,22 +25,14 @@ class Alien(Turtle):
         self.frame_index = 0
         self.shape(self.frames[self.frame_index])
         self.penup()
-        self.direction = 1  # 1 for right, -1 for left
-        self.speed = speed
 
-    def move(self):
+    def set_frame(self, frame_index):
         """
-        Moves the alien in the current direction and changes direction at screen edges.
-        """
-        new_x = self.xcor() + self.direction * self.speed
-        self.goto(new_x, self.ycor())
-        if self.xcor() > 350 or self.xcor() < -350:
-            self.direction *= -1
-            self.goto(self.xcor(), self.ycor() - 40)
+        Shows the given animation frame if it is not already displayed.
 
-    def update_animation(self):
-        """
-        Updates the alien's animation frame.
+        Args:
+            frame_index (int): Index of the frame to display.
         """
-        self.frame_index = (self.frame_index + 1) % len(self.frames)
-        self.shape(self.frames[self.frame_index])
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.shape(self.frames[frame_index])
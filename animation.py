@@ -0,0 +1,89 @@
+class AnimationScheduler:
+    """
+    Time-based animation of sprite kinds with batched shape updates.
+
+    Every sprite kind (alien, projectile, ...) shows the same frame at a given
+    moment, chosen from the elapsed time and the kind's own frame duration. A
+    kind is reported as changed only on the renders where its frame index
+    actually moves, kinds with a single frame are never registered, and the
+    resulting shape updates are queued and applied once per render.
+
+    Attributes:
+        kinds (dict): [frame_count, duration, index] lists keyed by kind name.
+        stretch (float): A factor applied to every frame duration, to animate
+            at a lower rate.
+        pending (dict): Frame indices to show, keyed by sprite.
+
+    Methods:
+        add(kind, frame_count, duration): Registers an animated sprite kind.
+        advance(now): Updates every kind and returns those whose frame changed.
+        frame(kind): Returns the frame index a kind currently shows.
+        queue(sprite, frame_index): Schedules a frame change for a sprite.
+        flush(): Applies every scheduled frame change.
+    """
+
+    def __init__(self):
+        """Initializes the scheduler with no kinds."""
+        self.kinds = {}
+        self.pending = {}
+        self.stretch = 1
+
+    def add(self, kind, frame_count, duration):
+        """
+        Registers an animated sprite kind; single-frame kinds are ignored.
+
+        Args:
+            kind (str): The name of the sprite kind.
+            frame_count (int): The number of frames in the animation.
+            duration (float): How long each frame is shown, in seconds.
+        """
+        if frame_count > 1 and duration > 0:
+            self.kinds[kind] = [frame_count, duration, 0]
+
+    def advance(self, now):
+        """
+        Updates every kind and returns those whose frame changed.
+
+        Args:
+            now (float): The current time, in seconds.
+
+        Returns:
+            list: The names of the kinds that moved to a new frame.
+        """
+        changed = []
+        for kind, animation in self.kinds.items():
+            frame_count, duration, index = animation
+            new_index = int(now / (duration * self.stretch)) % frame_count
+            if new_index != index:
+                animation[2] = new_index
+                changed.append(kind)
+        return changed
+
+    def frame(self, kind):
+        """
+        Returns the frame index a kind currently shows.
+
+        Args:
+            kind (str): The name of the sprite kind.
+
+        Returns:
+            int: The frame index, 0 for kinds that are not animated.
+        """
+        animation = self.kinds.get(kind)
+        return animation[2] if animation else 0
+
+    def queue(self, sprite, frame_index):
+        """
+        Schedules a frame change for a sprite.
+
+        Args:
+            sprite (Turtle): A sprite with a `set_frame` method.
+            frame_index (int): The frame to show.
+        """
+        self.pending[sprite] = frame_index
+
+    def flush(self):
+        """Applies every scheduled frame change."""
+        for sprite, frame_index in self.pending.items():
+            sprite.set_frame(frame_index)
+        self.pending.clear()
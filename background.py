@@ -0,0 +1,52 @@
+from tkinter import PhotoImage
+
+
+class BackgroundAnimator:
+    """
+    Animates the background by swapping pre-loaded images on a single canvas item.
+
+    `Screen.bgpic` looks the image up by file name and restacks the background
+    item on every call. The animator instead loads every frame once, owns one
+    image item at the bottom of the canvas and only reconfigures it on the
+    renders where the frame index actually changes.
+
+    Attributes:
+        canvas (Canvas): The Tk canvas of the turtle screen.
+        images (list): The pre-loaded background frames.
+        item (int): The canvas item showing the current frame.
+        fps (float): Background frames per second, independent of the tick rate.
+        frame_index (int): Index of the frame being displayed.
+
+    Methods:
+        update(now): Shows the frame due at the given time if it changed.
+    """
+
+    def __init__(self, screen, frames, fps):
+        """
+        Loads the frames and shows the first one.
+
+        Args:
+            screen (Screen): The turtle screen to draw on.
+            frames (list): File paths of the background frames.
+            fps (float): Background frames per second; 0 keeps the first frame.
+        """
+        self.canvas = screen.getcanvas()
+        self.images = [PhotoImage(file=frame, master=self.canvas) for frame in frames]
+        self.item = self.canvas.create_image(0, 0, image=self.images[0])
+        self.canvas.tag_lower(self.item)
+        self.fps = fps
+        self.frame_index = 0
+
+    def update(self, now):
+        """
+        Shows the frame due at the given time if it differs from the current one.
+
+        Args:
+            now (float): The current time, in seconds.
+        """
+        if self.fps <= 0 or len(self.images) < 2:
+            return
+        frame_index = int(now * self.fps) % len(self.images)
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.canvas.itemconfig(self.item, image=self.images[frame_index])
@@ -1,16 +1,34 @@
-from turtle import Turtle
+import base64
+import io
+from tkinter import PhotoImage
+from turtle import Turtle, Shape
+from barrier_mask import eroded_pixels
 
 
 class Barrier(Turtle):
     """
     A class to represent a barrier in the game.
 
+    Once the barrier is hit, its frames are drawn through its eroded bitmask.
+    Each frame is regenerated only the first time it is shown after the mask
+    changed, into a Tk image owned by the barrier. The image is registered
+    under a name built from the barrier's slot and mask version, and the name
+    it replaces is unregistered, so the screen never holds more than one
+    eroded shape per frame and the sprite can be reused for every level.
+
     Attributes:
         frames (list): List of image frames for barrier animation.
         frame_index (int): Current index of the frame being displayed.
+        mask (ndarray): The eroded occupancy bitmask, or None while intact.
+        key (tuple): The (slot, version) of the mask in the world's
+            `BarrierMasks`, or None while intact.
+        images (dict): The barrier's eroded Tk images keyed by frame index.
+        names (dict): The registered shape name of each eroded image.
+        stale (set): Indexes of the eroded images drawn from an older mask.
 
     Methods:
-        update_animation(): Updates the barrier's animation frame.
+        set_frame(frame_index): Shows the given animation frame.
+        set_mask(mask, key): Shows the barrier eroded to a bitmask, or intact.
     """
 
     def __init__(self, position, frames=[]):
@@ -24,16 +42,92 @@ class Barrier(Turtle):
         super().__init__()
         self.frames = frames
         self.frame_index = 0
+        self.mask = None
+        self.key = None
+        self.images = {}
+        self.names = {}
+        self.stale = set()
         self.shape(
             self.frames[self.frame_index] if self.frames else "assets/barrier.gif"
         )
         self.penup()
         self.goto(position)
 
-    def update_animation(self):
+    def set_frame(self, frame_index):
+        """
+        Shows the given animation frame if it is not already displayed.
+
+        Args:
+            frame_index (int): Index of the frame to display.
+        """
+        if self.frames and frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.shape(self.frame_shape(frame_index))
+
+    def set_mask(self, mask, key=None):
+        """
+        Shows the barrier eroded to a bitmask, or intact again.
+
+        Args:
+            mask (ndarray): The barrier's occupancy bitmask, the size of a
+                frame, or None to show the intact frames.
+            key (tuple, optional): The (slot, version) of the mask in the
+                world's `BarrierMasks`, naming its shapes; required with a mask.
+        """
+        if not self.frames:
+            return
+        self.mask = mask
+        self.key = key
+        self.stale.update(self.images)
+        if mask is None:
+            for frame_index in list(self.names):
+                self.forget_shape(frame_index)
+        self.shape(self.frame_shape(self.frame_index))
+
+    def forget_shape(self, frame_index):
+        """
+        Unregisters the eroded shape of a frame; its Tk image is kept for reuse.
+
+        Args:
+            frame_index (int): Index of the frame.
+        """
+        name = self.names.pop(frame_index, None)
+        if name is not None:
+            # turtle has no public way to unregister a shape
+            self.screen._shapes.pop(name, None)
+
+    def frame_shape(self, frame_index):
         """
-        Updates the barrier's animation frame.
+        Returns the shape of a frame, eroding it first if it is out of date.
+
+        Args:
+            frame_index (int): Index of the frame.
+
+        Returns:
+            str: The registered shape name.
         """
-        if self.frames:
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
-            self.shape(self.frames[self.frame_index])
+        frame = self.frames[frame_index]
+        if self.mask is None:
+            return frame
+        slot, version = self.key
+        name = f"{frame}#{slot}v{version}"
+        image = self.images.get(frame_index)
+        if image is None or frame_index in self.stale:
+            from PIL import Image
+
+            buffer = io.BytesIO()
+            Image.fromarray(eroded_pixels(frame, self.mask)).save(buffer, "PNG")
+            data = base64.b64encode(buffer.getvalue())
+            if image is None:
+                image = PhotoImage(
+                    data=data, format="png", master=self.screen.getcanvas()
+                )
+                self.images[frame_index] = image
+            else:
+                image.configure(data=data, format="png")
+            self.stale.discard(frame_index)
+        if self.names.get(frame_index) != name:
+            self.forget_shape(frame_index)
+            self.screen.register_shape(name, Shape("image", image))
+            self.names[frame_index] = name
+        return name
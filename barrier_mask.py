@@ -0,0 +1,226 @@
+import functools
+import hashlib
+import math
+import os
+import numpy as np
+from config import MASK_CACHE_DIR
+
+
+@functools.lru_cache(maxsize=None)
+def load_mask(gif_path, cache_dir=MASK_CACHE_DIR):
+    """
+    Returns the occupancy bitmask of an image: the pixels of its first frame
+    that are not transparent.
+
+    Every `World` needs the barrier mask, and the game builds its world before
+    the assets are decoded, so the mask is cached as a NumPy file keyed by
+    the SHA-256 of the image. PIL is only imported when an image is first
+    seen or has changed.
+
+    Args:
+        gif_path (str): The path to the image.
+        cache_dir (str): The directory holding the cached masks.
+
+    Returns:
+        ndarray: A read-only (height, width) boolean array, row 0 at the top.
+    """
+    with open(gif_path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()
+    name = os.path.splitext(os.path.basename(gif_path))[0]
+    cache_path = os.path.join(cache_dir, f"{name}_mask_{digest[:16]}.npy")
+    try:
+        mask = np.load(cache_path)
+    except (OSError, ValueError):
+        from PIL import Image
+
+        with Image.open(gif_path) as img:
+            mask = np.array(img.convert("RGBA"))[:, :, 3] > 0
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            partial = f"{cache_path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as file:
+                np.save(file, mask)
+            os.replace(partial, cache_path)
+        except OSError:
+            pass  # a read-only install decodes the image every launch
+    mask.flags.writeable = False
+    return mask
+
+
+@functools.lru_cache(maxsize=None)
+def load_pixels(frame_path):
+    """
+    Returns the RGBA pixels of a frame image.
+
+    Args:
+        frame_path (str): The path to the frame.
+
+    Returns:
+        ndarray: A read-only (height, width, 4) uint8 array.
+    """
+    from PIL import Image
+
+    with Image.open(frame_path) as img:
+        pixels = np.array(img.convert("RGBA"))
+    pixels.flags.writeable = False
+    return pixels
+
+
+def eroded_pixels(frame_path, mask):
+    """
+    Returns a frame with every pixel outside a bitmask made transparent.
+
+    Args:
+        frame_path (str): The path to the frame.
+        mask (ndarray): The occupancy bitmask, the size of the frame.
+
+    Returns:
+        ndarray: A new (height, width, 4) uint8 array.
+    """
+    pixels = load_pixels(frame_path).copy()
+    pixels[:, :, 3][~mask] = 0
+    return pixels
+
+
+def crater(radius):
+    """
+    Returns a disc-shaped stamp.
+
+    Args:
+        radius (int): The radius of the disc, in pixels.
+
+    Returns:
+        ndarray: A (2 * radius + 1) square boolean array.
+    """
+    offsets = np.arange(-radius, radius + 1)
+    return offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius * radius
+
+
+class BarrierMasks:
+    """
+    The occupancy bitmasks of every barrier, eroded by the shots that hit them.
+
+    Each barrier starts from the same mask, one pixel per world unit and
+    centred on the barrier's position. Hit tests look up every candidate
+    point in one fancy-indexing operation; a hit carves a crater stamp out of
+    the mask with a single boolean slice operation.
+
+    Attributes:
+        template (ndarray): The mask every barrier starts from.
+        stamp (ndarray): The crater carved by a hit.
+        masks (ndarray): The (barrier, row, column) masks, row 0 at the top.
+        versions (ndarray): A counter per barrier, increased on every erosion.
+
+    Methods:
+        reset(count): Restores `count` intact barriers.
+        contains(barriers, dx, dy): Tests points against the masks.
+        contains_point(barrier, dx, dy): Tests a single point, without array calls.
+        erode(barrier, dx, dy): Carves a crater and returns whether anything is left.
+    """
+
+    def __init__(self, template, crater_radius):
+        """
+        Initializes the masks with no barrier.
+
+        Args:
+            template (ndarray): The mask every barrier starts from.
+            crater_radius (int): The radius of the crater carved by a hit.
+        """
+        self.template = template
+        self.stamp = crater(crater_radius)
+        self.masks = np.zeros((0,) + template.shape, dtype=bool)
+        self.versions = np.zeros(0, dtype=np.int64)
+
+    def reset(self, count):
+        """
+        Restores intact barriers.
+
+        Args:
+            count (int): The number of barriers.
+        """
+        self.masks = np.repeat(self.template[None], count, axis=0)
+        self.versions = np.zeros(count, dtype=np.int64)
+
+    def pixels(self, dx, dy):
+        """
+        Converts offsets from barrier centres to mask rows and columns.
+
+        Args:
+            dx (ndarray): Horizontal offsets from the barrier centres.
+            dy (ndarray): Vertical offsets (y up) from the barrier centres.
+
+        Returns:
+            tuple: The (rows, columns) integer arrays, possibly out of bounds.
+        """
+        height, width = self.template.shape
+        rows = np.floor(height / 2 - dy).astype(np.intp)
+        columns = np.floor(width / 2 + dx).astype(np.intp)
+        return rows, columns
+
+    def contains(self, barriers, dx, dy):
+        """
+        Tests points against the masks of their barriers.
+
+        Args:
+            barriers (ndarray): The barrier of each point.
+            dx (ndarray): Horizontal offsets of the points from the barrier centres.
+            dy (ndarray): Vertical offsets of the points from the barrier centres.
+
+        Returns:
+            ndarray: Whether each point lies on a solid pixel.
+        """
+        height, width = self.template.shape
+        rows, columns = self.pixels(dx, dy)
+        inside = (rows >= 0) & (rows < height) & (columns >= 0) & (columns < width)
+        solid = np.zeros(len(barriers), dtype=bool)
+        solid[inside] = self.masks[barriers[inside], rows[inside], columns[inside]]
+        return solid
+
+    def contains_point(self, barrier, dx, dy):
+        """
+        Tests a single point against the mask of its barrier.
+
+        Gives the same answer as `contains` for that point, for callers
+        testing too few points to amortize the array calls.
+
+        Args:
+            barrier (int): The barrier of the point.
+            dx (float): Horizontal offset of the point from the barrier centre.
+            dy (float): Vertical offset of the point from the barrier centre.
+
+        Returns:
+            bool: Whether the point lies on a solid pixel.
+        """
+        height, width = self.template.shape
+        row = math.floor(height / 2 - dy)
+        column = math.floor(width / 2 + dx)
+        return (
+            0 <= row < height
+            and 0 <= column < width
+            and bool(self.masks[barrier, row, column])
+        )
+
+    def erode(self, barrier, dx, dy):
+        """
+        Carves a crater centred on a point.
+
+        Args:
+            barrier (int): The barrier that was hit.
+            dx (float): Horizontal offset of the point from the barrier centre.
+            dy (float): Vertical offset of the point from the barrier centre.
+
+        Returns:
+            bool: Whether any of the barrier is left.
+        """
+        height, width = self.template.shape
+        radius = len(self.stamp) // 2
+        row = math.floor(height / 2 - dy) - radius
+        column = math.floor(width / 2 + dx) - radius
+        top, left = max(row, 0), max(column, 0)
+        bottom = min(row + len(self.stamp), height)
+        right = min(column + len(self.stamp), width)
+        if top < bottom and left < right:
+            stamp = self.stamp[top - row : bottom - row, left - column : right - column]
+            self.masks[barrier, top:bottom, left:right] &= ~stamp
+        self.versions[barrier] += 1
+        return bool(self.masks[barrier].any())
@@ -0,0 +1,326 @@
+"""
+Headless performance benchmarks for Turtle Invaders.
+
+Runs the simulation without a display and writes the results as JSON, so runs
+can be compared over time:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --quick
+
+Measured: ticks per second for growing formations and projectile counts, the
+cost of a collision check, cold and warm frame-cache loading, memory growth
+over a long session, environment steps per second for automated players, and
+the cost and size of save states.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from world import World
+from savestate import save_state, load_state
+from config import TICK_RATE, SCREEN_WIDTH, SCREEN_HEIGHT
+
+FORMATIONS = [(3, 8), (6, 12), (10, 16), (16, 24), (24, 32)]
+PROJECTILE_COUNTS = [0, 16, 64, 256]
+ACTIONS = ["left", "right", "shoot", None]
+GIFS = ["spaceship", "alien", "projectile", "barrier", "background"]
+
+
+def top_up_projectiles(world, target, rng):
+    """
+    Spawns projectiles at random positions until the world holds `target` of them.
+
+    Args:
+        world (World): The world to fill.
+        target (int): The number of projectiles to keep alive.
+        rng (random.Random): The random number generator for positions.
+    """
+    projectiles = world.projectiles
+    while len(projectiles) < target:
+        projectiles.spawn(
+            rng.uniform(-SCREEN_WIDTH / 2, SCREEN_WIDTH / 2),
+            rng.uniform(-SCREEN_HEIGHT / 2, SCREEN_HEIGHT / 2),
+            rng.choice((1, -1)),
+        )
+
+
+def keep_playing(world):
+    """
+    Restarts or advances the world once a game or level ends.
+
+    Args:
+        world (World): The world to keep running.
+    """
+    if world.is_game_over:
+        world.restart()
+    elif world.is_level_complete:
+        world.next_level()
+
+
+def bench_ticks(rows, columns, projectiles, ticks, seed=0):
+    """
+    Measures simulation throughput for one formation size and projectile count.
+
+    Args:
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        projectiles (int): The number of projectiles kept alive.
+        ticks (int): The number of ticks to run.
+        seed (int): The seed for the world and the random player.
+
+    Returns:
+        dict: The parameters and the measured ticks per second.
+    """
+    rng = random.Random(seed)
+    world = World(random.Random(seed), rows, columns)
+    dt = 1 / TICK_RATE
+    elapsed = 0.0
+    for _ in range(ticks):
+        top_up_projectiles(world, projectiles, rng)
+        action = rng.choice(ACTIONS)
+        start = time.perf_counter()
+        world.step(dt, (action,) if action else ())
+        elapsed += time.perf_counter() - start
+        keep_playing(world)
+    return {
+        "rows": rows,
+        "columns": columns,
+        "aliens": rows * columns,
+        "projectiles": projectiles,
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed else None,
+    }
+
+
+def bench_collisions(rows, columns, projectiles, repeats, seed=0):
+    """
+    Measures the cost of a single collision check.
+
+    Args:
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        projectiles (int): The number of projectiles in the world.
+        repeats (int): The number of checks to time.
+        seed (int): The seed for projectile positions.
+
+    Returns:
+        dict: The parameters and the mean and median time per check.
+    """
+    rng = random.Random(seed)
+    world = World(random.Random(seed), rows, columns)
+    timings = []
+    for _ in range(repeats):
+        if world.is_game_over or not len(world.aliens):
+            world.restart()
+        top_up_projectiles(world, projectiles, rng)
+        start = time.perf_counter()
+        world.check_collisions([])
+        timings.append(time.perf_counter() - start)
+    return {
+        "aliens": rows * columns,
+        "projectiles": projectiles,
+        "repeats": repeats,
+        "mean_us": float(np.mean(timings) * 1e6),
+        "median_us": float(np.median(timings) * 1e6),
+    }
+
+
+def bench_assets():
+    """
+    Measures frame extraction with a cold and a warm frame cache.
+
+    Returns:
+        dict: Seconds spent loading every GIF for each case.
+    """
+    from frame_cache import FrameCache
+
+    frames_dir = tempfile.mkdtemp(prefix="invaders_frames_")
+    try:
+        results = {}
+        for case in ("cold", "warm"):
+            cache = FrameCache(frames_dir)
+            start = time.perf_counter()
+            for name in GIFS:
+                cache.frames(os.path.join("assets", f"{name}.gif"), name)
+            cache.save()
+            results[f"{case}_seconds"] = time.perf_counter() - start
+        return results
+    finally:
+        shutil.rmtree(frames_dir, ignore_errors=True)
+
+
+def bench_memory(ticks, seed=0):
+    """
+    Measures memory growth over a long session.
+
+    Args:
+        ticks (int): The number of ticks to run.
+        seed (int): The seed for the world and the random player.
+
+    Returns:
+        dict: Traced memory after warm-up, at the end, and at its peak, in bytes.
+    """
+    rng = random.Random(seed)
+    world = World(random.Random(seed))
+    dt = 1 / TICK_RATE
+    tracemalloc.start()
+    samples = []
+    for tick in range(ticks):
+        action = rng.choice(ACTIONS)
+        world.step(dt, (action,) if action else ())
+        keep_playing(world)
+        if tick % max(ticks // 10, 1) == 0:
+            samples.append(tracemalloc.get_traced_memory()[0])
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ticks": ticks,
+        "start_bytes": samples[0],
+        "end_bytes": current,
+        "peak_bytes": peak,
+        "growth_bytes": current - samples[0],
+        "samples": samples,
+    }
+
+
+def bench_env(num_envs, steps, seed=0):
+    """
+    Measures batched environment stepping with random actions.
+
+    Args:
+        num_envs (int): The number of games stepped in lockstep.
+        steps (int): The number of batched steps to run.
+        seed (int): The seed for the games and the actions.
+
+    Returns:
+        dict: The parameters and the measured environment steps per second.
+    """
+    from env import VectorEnv, InvadersEnv
+
+    actions = np.random.default_rng(seed).integers(
+        InvadersEnv.action_count, size=(steps, num_envs)
+    )
+    envs = VectorEnv(num_envs, seed)
+    envs.reset()
+    start = time.perf_counter()
+    for batch in actions:
+        envs.step(batch)
+    elapsed = time.perf_counter() - start
+    envs.close()
+    return {
+        "envs": num_envs,
+        "steps": steps,
+        "seconds": elapsed,
+        "env_steps_per_second": num_envs * steps / elapsed if elapsed else None,
+    }
+
+
+def bench_savestate(rows, columns, projectiles, repeats, seed=0):
+    """
+    Measures saving and restoring the whole world mid-game.
+
+    Args:
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        projectiles (int): The number of projectiles in the world.
+        repeats (int): The number of saves and restores to time.
+        seed (int): The seed for the game and projectile positions.
+
+    Returns:
+        dict: The parameters, the snapshot size and the median time per save
+            and per restore.
+    """
+    rng = random.Random(seed)
+    world = World(random.Random(seed), rows, columns)
+    for _ in range(TICK_RATE):
+        world.step(1 / TICK_RATE, [rng.choice(ACTIONS)])
+        keep_playing(world)
+    top_up_projectiles(world, projectiles, rng)
+    saves = []
+    loads = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        data = save_state(world)
+        saves.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        load_state(world, data)
+        loads.append(time.perf_counter() - start)
+    return {
+        "aliens": rows * columns,
+        "projectiles": projectiles,
+        "repeats": repeats,
+        "bytes": len(data),
+        "save_median_us": float(np.median(saves) * 1e6),
+        "load_median_us": float(np.median(loads) * 1e6),
+    }
+
+
+def run(quick=False):
+    """
+    Runs every benchmark.
+
+    Args:
+        quick (bool): Whether to use small sizes for a fast smoke run.
+
+    Returns:
+        dict: The results of every benchmark.
+    """
+    ticks = 200 if quick else 2000
+    formations = FORMATIONS[:2] if quick else FORMATIONS
+    projectile_counts = PROJECTILE_COUNTS[:2] if quick else PROJECTILE_COUNTS
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "tick_throughput": [
+            bench_ticks(rows, columns, projectiles, ticks)
+            for rows, columns in formations
+            for projectiles in projectile_counts
+        ],
+        "collisions": [
+            bench_collisions(rows, columns, projectiles, ticks)
+            for rows, columns in formations
+            for projectiles in projectile_counts
+        ],
+        "assets": bench_assets(),
+        "memory": bench_memory(ticks * 5),
+        "env": [bench_env(num_envs, ticks // num_envs * 4) for num_envs in (1, 8)],
+        "savestate": [
+            bench_savestate(rows, columns, projectiles, ticks // 4)
+            for rows, columns in formations
+            for projectiles in projectile_counts
+        ],
+    }
+
+
+def main():
+    """Parses the command line, runs the benchmarks and writes the JSON report."""
+    parser = argparse.ArgumentParser(description="Headless Turtle Invaders benchmarks")
+    parser.add_argument("--output", help="file to write the JSON results to")
+    parser.add_argument("--quick", action="store_true", help="run small sizes only")
+    args = parser.parse_args()
+
+    results = run(args.quick)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import time
+
+
+class FixedTimestep:
+    """
+    A fixed-timestep scheduler that decouples simulation ticks from rendering.
+
+    Real elapsed time is collected in an accumulator and paid out in whole
+    ticks of `dt` seconds, so gameplay speed does not depend on how long a
+    frame took. When the game falls too far behind, at most `max_catch_up`
+    ticks run per frame and the rest of the backlog is dropped, so a stall
+    slows the game down instead of freezing it in a catch-up spiral.
+
+    Attributes:
+        dt (float): The duration of one tick, in seconds.
+        max_catch_up (int): The most ticks run for a single frame.
+        accumulator (float): Elapsed time not yet consumed by ticks.
+        last_time (float): The clock reading of the previous `advance` call.
+        dropped (float): Total time discarded by the catch-up limit.
+
+    Methods:
+        advance(): Returns how many ticks are due since the last call.
+        alpha(): Returns how far the clock is into the next tick.
+        wait(): Sleeps until the next tick is due.
+        reset(): Forgets accumulated time.
+    """
+
+    def __init__(self, tick_rate, max_catch_up=5):
+        """
+        Initializes the scheduler.
+
+        Args:
+            tick_rate (float): The number of ticks per second.
+            max_catch_up (int): The most ticks run for a single frame.
+        """
+        self.dt = 1 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.dropped = 0.0
+        self.reset()
+
+    def reset(self):
+        """Forgets accumulated time, so the next tick is due one `dt` from now."""
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+
+    def advance(self):
+        """
+        Returns how many ticks are due since the last call.
+
+        Returns:
+            int: The number of ticks to run now.
+        """
+        now = time.perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_catch_up:
+            excess = self.accumulator - self.max_catch_up * self.dt
+            self.dropped += excess
+            self.accumulator -= excess
+            ticks = self.max_catch_up
+        self.accumulator -= ticks * self.dt
+        return ticks
+
+    def alpha(self):
+        """
+        Returns how far the clock is into the next tick.
+
+        Returns:
+            float: A fraction between 0 and 1, used for render interpolation.
+        """
+        return min(self.accumulator / self.dt, 1.0)
+
+    def wait(self):
+        """Sleeps until the next tick is due."""
+        remaining = self.dt - self.accumulator - (time.perf_counter() - self.last_time)
+        if remaining > 0:
+            time.sleep(remaining)
@@ -2,12 +2,92 @@
 
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-SHIP_SPEED = 20
+SHIP_SPEED = 8  # distance per nominal tick while a movement key is held
 INITIAL_ALIEN_SPEED = 10  # Adjusted for visible movement
 INITIAL_PROJECTILE_SPEED = 6
 PROJECTILE_SPEED = INITIAL_PROJECTILE_SPEED
 BARRIER_POSITION = [(0, -200), (-200, -200), (200, -200)]
+BARRIER_IMAGE = "assets/barrier.gif"  # its alpha channel is the barrier's hit mask
+MASK_CACHE_DIR = "assets/frames"  # decoded hit masks, so startup skips PIL
+BARRIER_CRATER_RADIUS = 4  # pixels carved out of a barrier by each hit
 ALIEN_ROWS = 3
 ALIEN_COLUMNS = 8
 ALIEN_MOVE_INTERVAL = 1  # seconds
 SHOOT_DELAY = 0.5  # 0.5 second delay between shots
+ALIEN_FIRE_RATE = 2.5  # mean alien shots per second
+ALIEN_SHOT_BATCH = 32  # alien shot times drawn ahead at a time
+LEVEL_SPEEDUP = 1.2  # alien and projectile speed factor applied on each new level
+RENDERER = "turtle"  # "turtle" or "pygame"; main.py --renderer overrides it
+TICK_RATE = 50  # nominal simulation ticks per second
+BATCH_THRESHOLD = 32  # live entities handled one by one before NumPy batches pay off
+NET_PORT = 5000  # UDP port of a two-player host (main.py --host / --join)
+PROJECTILE_POOL_SIZE = 16  # projectile sprites created up front
+PROJECTILE_POOL_LIMIT = 64  # most projectile sprites ever on the canvas
+MAX_CATCH_UP_TICKS = 5  # most simulation ticks run for one rendered frame
+RENDER_INTERPOLATION = False  # extrapolate projectiles between ticks when rendering
+ANIMATION_FRAME_DURATIONS = {  # seconds each animation frame is shown, per sprite kind
+    "spaceship": 0.1,
+    "alien": 0.18,
+    "projectile": 0.2,
+    "barrier": 0.03,
+}
+BACKGROUND_FPS = 10  # background animation frames per second
+ALIEN_MARCH_SPEEDUP = 1.0  # extra march tempo once the formation is nearly wiped out
+PROFILING_ENABLED = False  # record per-phase timings from the start (toggle with 'p')
+PROFILE_CAPACITY = 1024  # frames kept by the profiler's ring buffer
+PROFILE_OUTPUT = "profile"  # basename of the .jsonl and .trace.json written on quit
+SCORE_DATABASE = "scores.db"  # SQLite history of finished runs
+ASSET_LOADER_THREADS = 4  # worker threads decoding GIFs and sounds at startup
+STARTUP_REPORT = "startup.json"  # launch timings written after the first frame
+RANDOM_SEED = None  # seed of the game's random number generator (None picks one)
+REPLAY_OUTPUT = "last_session.replay"  # recording of the inputs, written on quit
+REPLAY_CHECKPOINT_INTERVAL = 500  # ticks between state hashes in a recording
+SAVE_STATE = (
+    "savegame.bin"  # save state written with F5 (and on quit) and loaded with F9
+)
+REWIND_INTERVAL = 10  # ticks between the snapshots kept for rewinding
+REWIND_CAPACITY = 150  # snapshots kept for rewinding (30 s at 50 ticks per second)
+REWIND_STEP = 10  # snapshots dropped by each press of the rewind key (2 s)
+SOUND_CHANNELS = 8  # mixer channels reserved for game sounds
+SOUND_SETTINGS = {  # higher priority sounds may steal channels from lower ones
+    "background_music": {
+        "priority": 10,
+        "max_voices": 1,
+        "min_interval": 0,
+        "loops": -1,
+    },
+    "game_over": {"priority": 5, "max_voices": 1, "min_interval": 0},
+    "alien_hit": {"priority": 3, "max_voices": 3, "min_interval": 0.03},
+    "shoot": {"priority": 2, "max_voices": 2, "min_interval": 0.1},
+    "barrier_hit": {"priority": 1, "max_voices": 2, "min_interval": 0.08},
+    "alien_shoot": {"priority": 1, "max_voices": 2, "min_interval": 0.15},
+}
+QUALITY_GOVERNOR = True  # trade cosmetic work for frame time on slow machines
+QUALITY_FRAME_BUDGET = 0.014  # seconds of work per frame before quality steps down
+ALL_ANIMATIONS = ("spaceship", "alien", "projectile", "barrier")
+QUALITY_LEVELS = (  # best first; the governor steps down one level at a time
+    {
+        "background": True,  # animate the background
+        "animation_stretch": 1,  # factor applied to every animation frame duration
+        "sound_voices": SOUND_CHANNELS,  # most sounds started at once
+        "animated": ALL_ANIMATIONS,  # sprite kinds whose animation is redrawn
+    },
+    {
+        "background": False,
+        "animation_stretch": 1,
+        "sound_voices": SOUND_CHANNELS,
+        "animated": ALL_ANIMATIONS,
+    },
+    {
+        "background": False,
+        "animation_stretch": 2,
+        "sound_voices": 4,
+        "animated": ALL_ANIMATIONS,
+    },
+    {
+        "background": False,
+        "animation_stretch": 3,
+        "sound_voices": 2,
+        "animated": ("alien",),
+    },
+)
@@ -0,0 +1,92 @@
+from functools import partial
+
+KEY_ACTIONS = {"Left": "left", "Right": "right", "space": "shoot"}
+ACTIONS = ("left", "right", "shoot")
+
+
+class InputState:
+    """
+    The held state of the game keys, sampled once per simulation tick.
+
+    Key callbacks only append (action, pressed) events to a queue; no game
+    logic runs inside Tk. Each tick `drain` turns the queued events into the
+    actions to apply: an action is active if its key was held at the start
+    of the tick or pressed at any time during it, so short taps are never
+    lost and OS autorepeat (which only re-sends events for a key that is
+    already held) has no effect on movement or fire rate.
+
+    Attributes:
+        held (dict): Whether the key of each action is currently down.
+        events (list): (action, pressed) events queued since the last drain.
+
+    Methods:
+        bind(screen): Registers the press and release callbacks of every key.
+        press(action): Queues a key press.
+        release(action): Queues a key release.
+        release_all(): Queues a release of every held key.
+        drain(): Returns the actions active during the tick and applies the queue.
+        clear(): Drops the queued events.
+    """
+
+    def __init__(self):
+        """Initializes the state with no key held."""
+        self.held = dict.fromkeys(ACTIONS, False)
+        self.events = []
+
+    def bind(self, screen, key_actions=KEY_ACTIONS):
+        """
+        Registers the press and release callbacks of every key.
+
+        Keys are released when the window loses focus, since the release
+        event would otherwise never arrive.
+
+        Args:
+            screen (Screen): The turtle screen receiving the key events.
+            key_actions (dict): The action of each Tk key name.
+        """
+        for key, action in key_actions.items():
+            screen.onkeypress(partial(self.press, action), key)
+            screen.onkeyrelease(partial(self.release, action), key)
+        screen.getcanvas().bind("<FocusOut>", lambda event: self.release_all(), "+")
+
+    def press(self, action):
+        """
+        Queues a key press.
+
+        Args:
+            action (str): The action of the key.
+        """
+        self.events.append((action, True))
+
+    def release(self, action):
+        """
+        Queues a key release.
+
+        Args:
+            action (str): The action of the key.
+        """
+        self.events.append((action, False))
+
+    def release_all(self):
+        """Queues a release of every held key."""
+        for action in ACTIONS:
+            self.release(action)
+
+    def drain(self):
+        """
+        Returns the actions active during the tick and applies the queued events.
+
+        Returns:
+            list: The active actions, in the order of `ACTIONS`.
+        """
+        events, self.events = self.events, []
+        active = {action for action, held in self.held.items() if held}
+        for action, pressed in events:
+            if pressed:
+                active.add(action)
+            self.held[action] = pressed
+        return [action for action in ACTIONS if action in active]
+
+    def clear(self):
+        """Drops the queued events, keeping the held state."""
+        self.events = []
@@ -0,0 +1,248 @@
+import numpy as np
+from config import BATCH_THRESHOLD
+
+
+class EntityStore:
+    """
+    Structure-of-arrays storage for every entity of one kind.
+
+    Each attribute lives in its own contiguous NumPy column, indexed by a slot
+    number that stays stable for the lifetime of the entity, so movement,
+    culling and hit tests run as batched array operations instead of one
+    Python object at a time. Freed slots are recycled by later spawns.
+
+    Array operations have a fixed cost per call that outweighs the work on a
+    handful of entities, so while no more than `batch_threshold` entities are
+    alive, `move` and `cull` loop over them in plain Python instead, with the
+    same arithmetic and slot order.
+
+    Attributes:
+        x (ndarray): The x-coordinates.
+        y (ndarray): The y-coordinates.
+        direction (ndarray): Direction of movement (1 for right/up, -1 for left/down).
+        alive (ndarray): Whether each slot holds a living entity.
+        frame (ndarray): The animation frame index of each entity.
+        dirty (ndarray): Whether each slot changed since the renderer last synced it.
+        count (int): The number of slots ever used; columns past it are unused.
+        batch_threshold (int): The most living entities handled one at a time.
+
+    Methods:
+        spawn(x, y, direction): Adds an entity and returns its slot.
+        kill(slots): Frees the given slots.
+        assign(slots, x, y, direction): Replaces the living entities.
+        clear(): Frees every slot.
+        alive_slots(): Returns the slots of living entities.
+        move(dx, dy): Moves every living entity along its direction.
+        cull(low, high): Kills entities whose y-coordinate left the given range.
+        take_dirty(): Returns and resets the slots that need re-rendering.
+    """
+
+    def __init__(self, capacity=64, batch_threshold=BATCH_THRESHOLD):
+        """
+        Initializes an empty store.
+
+        Args:
+            capacity (int): The number of slots to pre-allocate.
+            batch_threshold (int): The most living entities handled one at a time.
+        """
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.direction = np.ones(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.frame = np.zeros(capacity, dtype=np.int16)
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self.count = 0
+        self.free_slots = []
+        self.alive_count = 0
+        self.batch_threshold = batch_threshold
+
+    def __len__(self):
+        """
+        Returns the number of living entities.
+
+        Returns:
+            int: The number of living entities.
+        """
+        return self.alive_count
+
+    def grow(self):
+        """Doubles the capacity of every column."""
+        capacity = len(self.x) * 2
+        for name in ("x", "y", "direction", "alive", "frame", "dirty"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def spawn(self, x, y, direction=1):
+        """
+        Adds an entity and returns its slot.
+
+        Args:
+            x (float): The x-coordinate of the entity.
+            y (float): The y-coordinate of the entity.
+            direction (int): Direction of movement.
+
+        Returns:
+            int: The slot of the new entity.
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.count == len(self.x):
+                self.grow()
+            slot = self.count
+            self.count += 1
+        self.x[slot] = x
+        self.y[slot] = y
+        self.direction[slot] = direction
+        self.alive[slot] = True
+        self.frame[slot] = 0
+        self.dirty[slot] = True
+        self.alive_count += 1
+        return slot
+
+    def kill(self, slots):
+        """
+        Frees the given slots.
+
+        Args:
+            slots (iterable): The slots of the entities to remove.
+        """
+        for slot in slots:
+            slot = int(slot)
+            if self.alive[slot]:
+                self.alive[slot] = False
+                self.free_slots.append(slot)
+                self.alive_count -= 1
+
+    def assign(self, slots, x, y, direction):
+        """
+        Makes the given slots the only living entities, with the given values.
+
+        Used to mirror a store whose contents come from elsewhere, such as a
+        network host. Slots whose entity is new or moved are flagged dirty.
+
+        Args:
+            slots (ndarray): The slots of the living entities.
+            x (ndarray): Their x-coordinates.
+            y (ndarray): Their y-coordinates.
+            direction (ndarray): Their directions of movement.
+        """
+        count = int(slots.max()) + 1 if len(slots) else 0
+        while len(self.x) < count:
+            self.grow()
+        self.count = max(self.count, count)
+        alive = np.zeros(len(self.x), dtype=bool)
+        alive[slots] = True
+        changed = alive & ~self.alive
+        self.frame[changed] = 0
+        changed[slots] |= (self.x[slots] != x) | (self.y[slots] != y)
+        self.x[slots] = x
+        self.y[slots] = y
+        self.direction[slots] = direction
+        self.alive[:] = alive
+        self.dirty |= changed
+        self.alive_count = len(slots)
+        self.free_slots = np.flatnonzero(~alive[: self.count]).tolist()[::-1]
+
+    def clear(self):
+        """Frees every slot."""
+        self.alive[:] = False
+        self.dirty[:] = False
+        self.count = 0
+        self.free_slots = []
+        self.alive_count = 0
+
+    def alive_slots(self):
+        """
+        Returns the slots of living entities.
+
+        Returns:
+            ndarray: The slots, in ascending order.
+        """
+        return self.alive[: self.count].nonzero()[0]
+
+    def move(self, dx=0.0, dy=0.0):
+        """
+        Moves every living entity along its direction.
+
+        Args:
+            dx (float): The horizontal distance, multiplied by each direction.
+            dy (float): The vertical distance, multiplied by each direction.
+        """
+        if self.alive_count <= self.batch_threshold:
+            x, y, direction, dirty = self.x, self.y, self.direction, self.dirty
+            for slot in self.alive_slots().tolist():
+                step = direction.item(slot)
+                if dx:
+                    x[slot] = x.item(slot) + step * dx
+                if dy:
+                    y[slot] = y.item(slot) + step * dy
+                dirty[slot] = True
+            return
+        alive = self.alive[: self.count]
+        direction = self.direction[: self.count]
+        if dx:
+            self.x[: self.count] += np.where(alive, direction * dx, 0.0)
+        if dy:
+            self.y[: self.count] += np.where(alive, direction * dy, 0.0)
+        self.dirty[: self.count] |= alive
+
+    def cull(self, low, high):
+        """
+        Kills entities whose y-coordinate left the given range.
+
+        Args:
+            low (float): The lowest y-coordinate still on screen.
+            high (float): The highest y-coordinate still on screen.
+
+        Returns:
+            ndarray: The slots that were removed.
+        """
+        if self.alive_count <= self.batch_threshold:
+            y = self.y
+            gone = [
+                slot
+                for slot in self.alive_slots().tolist()
+                if not low <= y.item(slot) <= high
+            ]
+            self.kill(gone)
+            return np.array(gone, dtype=np.intp)
+        y = self.y[: self.count]
+        gone = np.flatnonzero(self.alive[: self.count] & ((y > high) | (y < low)))
+        self.kill(gone)
+        return gone
+
+    def take_dirty(self):
+        """
+        Returns and resets the living slots that changed since the last call.
+
+        Returns:
+            ndarray: The slots whose sprites need to be moved.
+        """
+        dirty = self.dirty[: self.count]
+        slots = np.flatnonzero(dirty & self.alive[: self.count])
+        dirty[:] = False
+        return slots
+
+
+def hits(store, slots, other, other_slots, radius, other_offset=(0.0, 0.0)):
+    """
+    Returns the candidate pairs that are actually within the given radius.
+
+    Args:
+        store (EntityStore): The store of the first entity of each pair.
+        slots (ndarray): Slots into `store`.
+        other (EntityStore): The store of the second entity of each pair.
+        other_slots (ndarray): Slots into `other`, parallel to `slots`.
+        radius (float): The collision radius.
+        other_offset (tuple): An (x, y) translation applied to the positions in `other`.
+
+    Returns:
+        tuple: The (slots, other_slots) pairs closer than `radius`.
+    """
+    dx = store.x[slots] - (other.x[other_slots] + other_offset[0])
+    dy = store.y[slots] - (other.y[other_slots] + other_offset[1])
+    close = dx * dx + dy * dy < radius * radius
+    return slots[close], other_slots[close]
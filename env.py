@@ -0,0 +1,400 @@
+"""
+Gym-style environments for training and evaluating automated players.
+
+`InvadersEnv` wraps one headless `World` behind `reset()` and `step(action)`.
+`VectorEnv` steps several independent games in lockstep in the current
+process, and `ProcessVectorEnv` spreads them over worker processes so every
+core runs its own batch:
+
+    envs = ProcessVectorEnv(16, seed=0)
+    observations = envs.reset()
+    observations, rewards, dones, infos = envs.step(actions)
+    envs.close()
+"""
+
+import multiprocessing
+import random
+import numpy as np
+from world import World
+from config import (
+    ALIEN_ROWS,
+    ALIEN_COLUMNS,
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    TICK_RATE,
+)
+
+ACTIONS = (
+    (),
+    ("left",),
+    ("right",),
+    ("shoot",),
+    ("left", "shoot"),
+    ("right", "shoot"),
+)
+MAX_OBSERVED_PROJECTILES = 16
+
+
+class InvadersEnv:
+    """
+    One game of Turtle Invaders behind a reset/step interface.
+
+    Observations are flat float32 vectors: the ship position, the formation
+    offset and direction, the alive flag of every alien in formation order,
+    and (x, y, direction) of the projectiles closest to the ship, padded with
+    zeros. Positions are scaled to [-1, 1]. The reward is the score gained
+    during the step, and an episode ends when the game is over; completed
+    levels simply continue with the next one, as in the game.
+
+    Attributes:
+        world (World): The simulated game.
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        frame_skip (int): Ticks an action is repeated for.
+        max_steps (int): Steps after which an episode is cut off, or None.
+        steps (int): Steps taken in the current episode.
+        observation_size (int): The length of an observation vector.
+
+    Methods:
+        reset(seed): Starts a new episode and returns its first observation.
+        step(action): Applies an action and returns (observation, reward, done, info).
+        observe(): Returns the observation of the current state.
+    """
+
+    action_count = len(ACTIONS)
+
+    def __init__(
+        self,
+        seed=None,
+        rows=ALIEN_ROWS,
+        columns=ALIEN_COLUMNS,
+        frame_skip=1,
+        max_steps=None,
+    ):
+        """
+        Initializes the environment.
+
+        Args:
+            seed (int, optional): The seed of the world's random number generator.
+            rows (int): The number of alien rows.
+            columns (int): The number of alien columns.
+            frame_skip (int): Ticks an action is repeated for.
+            max_steps (int, optional): Steps after which an episode is cut off.
+        """
+        self.rows = rows
+        self.columns = columns
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.dt = 1 / TICK_RATE
+        self.world = World(random.Random(seed), rows, columns)
+        self.steps = 0
+        self.observation_size = 5 + rows * columns + 3 * MAX_OBSERVED_PROJECTILES
+        self.observation = np.zeros(self.observation_size, dtype=np.float32)
+        self.features = self.observation[5 + rows * columns :].reshape(-1, 3)
+        self.scale_x = 2 / SCREEN_WIDTH
+        self.scale_y = 2 / SCREEN_HEIGHT
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode.
+
+        Args:
+            seed (int, optional): Reseeds the world's random number generator.
+
+        Returns:
+            ndarray: The first observation.
+        """
+        if seed is not None:
+            self.world.rng.seed(seed)
+        self.world.restart()
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action):
+        """
+        Applies an action for `frame_skip` ticks.
+
+        Args:
+            action (int): An index into `ACTIONS`.
+
+        Returns:
+            tuple: The observation, the reward, whether the episode is over,
+                and a dict with the score, the level and the events.
+        """
+        world = self.world
+        inputs = ACTIONS[action]
+        score = world.score
+        events = []
+        for _ in range(self.frame_skip):
+            tick_events = world.step(self.dt, inputs)
+            events.extend(tick_events)
+            if "level_complete" in tick_events:
+                world.next_level()
+            if world.is_game_over:
+                break
+        self.steps += 1
+        done = world.is_game_over or (
+            self.max_steps is not None and self.steps >= self.max_steps
+        )
+        info = {"score": world.score, "level": world.level, "events": events}
+        return self.observe(), float(world.score - score), done, info
+
+    def observe(self):
+        """
+        Returns the observation of the current state.
+
+        With few projectiles alive, the closest ones are picked in plain
+        Python, which is cheaper than the array calls it replaces and picks
+        the same projectiles in the same order.
+
+        Returns:
+            ndarray: A copy of the observation vector.
+        """
+        world = self.world
+        aliens = world.aliens
+        projectiles = world.projectiles
+        formation = world.formation
+        scale_x, scale_y = self.scale_x, self.scale_y
+        ship_x, ship_y = world.ship.x, world.ship.y
+        observation = self.observation
+        observation[:5] = (
+            ship_x * scale_x,
+            ship_y * scale_y,
+            formation.offset_x * scale_x,
+            formation.offset_y * scale_y,
+            formation.direction,
+        )
+        alien_count = self.rows * self.columns
+        observation[5 : 5 + alien_count] = aliens.alive[:alien_count]
+        features = self.features
+        features[:] = 0.0
+
+        slots = projectiles.alive_slots()
+        if len(slots) <= projectiles.batch_threshold:
+            xs = projectiles.x.tolist()
+            ys = projectiles.y.tolist()
+            directions = projectiles.direction.tolist()
+            closest = sorted(
+                slots.tolist(),
+                key=lambda slot: abs(xs[slot] - ship_x) + abs(ys[slot] - ship_y),
+            )[:MAX_OBSERVED_PROJECTILES]
+            if closest:
+                features[: len(closest)] = [
+                    (xs[slot] * scale_x, ys[slot] * scale_y, directions[slot])
+                    for slot in closest
+                ]
+            return observation.copy()
+        distance = np.abs(projectiles.x[slots] - ship_x) + np.abs(
+            projectiles.y[slots] - ship_y
+        )
+        slots = slots[np.argsort(distance, kind="stable")]
+        slots = slots[:MAX_OBSERVED_PROJECTILES]
+        features[: len(slots), 0] = projectiles.x[slots] * scale_x
+        features[: len(slots), 1] = projectiles.y[slots] * scale_y
+        features[: len(slots), 2] = projectiles.direction[slots]
+        return observation.copy()
+
+
+class VectorEnv:
+    """
+    Several independent games stepped in lockstep in one process.
+
+    Finished games are reset automatically; the observation that ended them
+    is kept in their info under "final_observation".
+
+    Attributes:
+        envs (list): The environments.
+        num_envs (int): The number of environments.
+        observation_size (int): The length of one observation vector.
+
+    Methods:
+        reset(): Resets every game and returns the stacked observations.
+        step(actions): Steps every game with its own action.
+        close(): Releases the environments.
+    """
+
+    def __init__(self, num_envs, seed=None, **env_kwargs):
+        """
+        Creates the environments.
+
+        Args:
+            num_envs (int): The number of games.
+            seed (int, optional): The seed of the first game; game i uses seed + i.
+            **env_kwargs: Arguments passed to every `InvadersEnv`.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.envs = [InvadersEnv(seed + i, **env_kwargs) for i in range(num_envs)]
+        self.num_envs = num_envs
+        self.observation_size = self.envs[0].observation_size
+        self.observations = np.zeros(
+            (num_envs, self.observation_size), dtype=np.float32
+        )
+
+    def reset(self):
+        """
+        Resets every game.
+
+        Returns:
+            ndarray: The observations, one row per game.
+        """
+        for index, env in enumerate(self.envs):
+            self.observations[index] = env.reset()
+        return self.observations.copy()
+
+    def step(self, actions):
+        """
+        Steps every game with its own action.
+
+        Args:
+            actions (sequence): One action index per game.
+
+        Returns:
+            tuple: The observations, rewards and done flags as arrays with one
+                row per game, and a list of info dicts.
+        """
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            observation, rewards[index], dones[index], info = env.step(int(action))
+            if dones[index]:
+                info["final_observation"] = observation
+                observation = env.reset()
+            self.observations[index] = observation
+            infos.append(info)
+        return self.observations.copy(), rewards, dones, infos
+
+    def close(self):
+        """Releases the environments."""
+        self.envs = []
+
+
+def run_worker(connection, num_envs, seed, env_kwargs):
+    """
+    Serves a `VectorEnv` to a `ProcessVectorEnv`; runs in a worker process.
+
+    Args:
+        connection (Connection): The worker's end of the pipe.
+        num_envs (int): The number of games in this worker.
+        seed (int): The seed of the worker's first game.
+        env_kwargs (dict): Arguments passed to every `InvadersEnv`.
+    """
+    envs = VectorEnv(num_envs, seed, **env_kwargs)
+    try:
+        while True:
+            command, payload = connection.recv()
+            if command == "step":
+                connection.send(envs.step(payload))
+            elif command == "reset":
+                connection.send(envs.reset())
+            else:
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        envs.close()
+        connection.close()
+
+
+class ProcessVectorEnv:
+    """
+    Independent games stepped in lockstep across a pool of worker processes.
+
+    The games are split into one `VectorEnv` per worker. Each step sends every
+    worker the actions of its games, lets all workers simulate in parallel and
+    concatenates their results, so the interface matches `VectorEnv`.
+
+    Attributes:
+        num_envs (int): The number of games.
+        observation_size (int): The length of one observation vector.
+        sizes (list): The number of games run by each worker.
+
+    Methods:
+        reset(): Resets every game and returns the stacked observations.
+        step(actions): Steps every game with its own action.
+        close(): Stops the workers.
+    """
+
+    def __init__(self, num_envs, workers=None, seed=None, **env_kwargs):
+        """
+        Starts the workers.
+
+        Args:
+            num_envs (int): The number of games.
+            workers (int, optional): The number of processes; defaults to the CPU count.
+            seed (int, optional): The seed of the first game; game i uses seed + i.
+            **env_kwargs: Arguments passed to every `InvadersEnv`.
+        """
+        if seed is None:
+            seed = random.randrange(2**32)
+        workers = min(workers or multiprocessing.cpu_count(), num_envs)
+        self.num_envs = num_envs
+        self.sizes = [len(part) for part in np.array_split(range(num_envs), workers)]
+        self.observation_size = InvadersEnv(**env_kwargs).observation_size
+        self.connections = []
+        self.processes = []
+        first = 0
+        for size in self.sizes:
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(worker_connection, size, seed + first, env_kwargs),
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+            first += size
+
+    def reset(self):
+        """
+        Resets every game.
+
+        Returns:
+            ndarray: The observations, one row per game.
+        """
+        for connection in self.connections:
+            connection.send(("reset", None))
+        return np.concatenate([connection.recv() for connection in self.connections])
+
+    def step(self, actions):
+        """
+        Steps every game with its own action.
+
+        Args:
+            actions (sequence): One action index per game.
+
+        Returns:
+            tuple: The observations, rewards and done flags as arrays with one
+                row per game, and a list of info dicts.
+        """
+        actions = np.asarray(actions)
+        first = 0
+        for connection, size in zip(self.connections, self.sizes):
+            connection.send(("step", actions[first : first + size]))
+            first += size
+        results = [connection.recv() for connection in self.connections]
+        observations, rewards, dones, infos = zip(*results)
+        return (
+            np.concatenate(observations),
+            np.concatenate(rewards),
+            np.concatenate(dones),
+            [info for worker_infos in infos for info in worker_infos],
+        )
+
+    def close(self):
+        """Stops the workers."""
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except OSError:
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self.connections = []
+        self.processes = []
@@ -0,0 +1,234 @@
+import numpy as np
+
+FORMATION_EDGE = 350
+FORMATION_DROP = 40
+
+
+class AlienFormation:
+    """
+    The alien formation, moved as one block.
+
+    Aliens are stored in their `EntityStore` at formation-local positions; the
+    formation owns the shared offset and direction, so a march step is a
+    single offset update no matter how many aliens survive. Per-column and
+    per-row survivor counts keep the bounding box of the living aliens up to
+    date incrementally as they die, so deciding whether to reverse at a screen
+    edge is O(1). Likewise the lowest living alien of every column and the
+    list of columns that still have one are updated on each kill, so picking
+    an alien that can shoot without hitting its neighbours is an O(1) lookup.
+
+    Attributes:
+        store (EntityStore): The alien store, holding formation-local positions.
+        offset_x (float): The horizontal offset of the formation.
+        offset_y (float): The vertical offset of the formation.
+        direction (int): Current direction of movement (1 for right, -1 for left).
+        column (ndarray): The formation column of each alien slot.
+        row (ndarray): The formation row of each alien slot.
+        column_x (ndarray): The local x-coordinate of each column.
+        row_y (ndarray): The local y-coordinate of each row.
+        column_counts (ndarray): The number of living aliens per column.
+        row_counts (ndarray): The number of living aliens per row.
+        left (int): The leftmost column with a living alien.
+        right (int): The rightmost column with a living alien.
+        bottom (int): The lowest row with a living alien.
+        total (int): The number of aliens the formation started with.
+        slot_grid (ndarray): The slot of the alien at each (row, column).
+        column_bottom (ndarray): The slot of the lowest living alien per column, or -1.
+        shooter_columns (list): The columns that still have a living alien.
+
+    Methods:
+        create(rows, columns): Fills the store with a fresh formation.
+        kill(slots): Removes aliens and shrinks the bounding box.
+        restore(alive, shooter_columns): Sets which aliens of the formation are alive.
+        step(speed): Marches the formation and reverses it at the screen edges.
+        bottom_y(): Returns the world y-coordinate of the lowest living row.
+        move_interval(base_interval): Returns the march interval for the surviving count.
+        shooter(rng): Returns the slot of a random alien at the bottom of its column.
+    """
+
+    def __init__(self, store, march_speedup=0.0):
+        """
+        Initializes an empty formation.
+
+        Args:
+            store (EntityStore): The store to keep the aliens in.
+            march_speedup (float): How much faster the formation marches once
+                only one alien is left (0 keeps a constant pace).
+        """
+        self.store = store
+        self.march_speedup = march_speedup
+        self.create(0, 0)
+
+    def create(self, rows, columns):
+        """
+        Fills the store with a fresh formation.
+
+        Args:
+            rows (int): The number of alien rows.
+            columns (int): The number of alien columns.
+        """
+        store = self.store
+        store.clear()
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.direction = 1
+        self.column_x = np.arange(columns) * 50.0 - 250
+        self.row_y = np.arange(rows) * 30.0 + 150
+        self.column = np.empty(rows * columns, dtype=np.intp)
+        self.row = np.empty(rows * columns, dtype=np.intp)
+        self.slot_grid = np.empty((rows, columns), dtype=np.intp)
+        for row in range(rows):
+            for col in range(columns):
+                slot = store.spawn(self.column_x[col], self.row_y[row])
+                self.column[slot] = col
+                self.row[slot] = row
+                self.slot_grid[row, col] = slot
+        self.column_bottom = (
+            self.slot_grid[0].copy() if rows else np.full(columns, -1, dtype=np.intp)
+        )
+        self.shooter_columns = list(range(columns)) if rows else []
+        self.shooter_index = {col: col for col in self.shooter_columns}
+        self.column_counts = np.full(columns, rows, dtype=np.intp)
+        self.row_counts = np.full(rows, columns, dtype=np.intp)
+        self.left = 0
+        self.right = columns - 1
+        self.bottom = 0
+        self.total = rows * columns
+
+    def kill(self, slots):
+        """
+        Removes aliens and shrinks the bounding box of the survivors.
+
+        Args:
+            slots (iterable): The slots of the aliens to remove.
+        """
+        store = self.store
+        for slot in slots:
+            slot = int(slot)
+            if store.alive[slot]:
+                self.column_counts[self.column[slot]] -= 1
+                self.row_counts[self.row[slot]] -= 1
+                store.kill((slot,))
+                if self.column_bottom[self.column[slot]] == slot:
+                    self.raise_column_bottom(self.column[slot])
+        while self.left <= self.right and not self.column_counts[self.left]:
+            self.left += 1
+        while self.right >= self.left and not self.column_counts[self.right]:
+            self.right -= 1
+        while self.bottom < len(self.row_counts) and not self.row_counts[self.bottom]:
+            self.bottom += 1
+
+    def restore(self, alive, shooter_columns):
+        """
+        Sets which aliens of the current formation are alive.
+
+        Aliens never leave their formation-local positions, so a saved
+        formation of the same size is restored by its alive flags alone; the
+        counts, bounding box and column bottoms are recomputed from them in
+        bulk. Every living alien is flagged dirty.
+
+        Args:
+            alive (ndarray): Whether each slot of the formation is alive.
+            shooter_columns (list): The saved columns that have a living alien,
+                in their saved order so shooters are picked as before.
+        """
+        store = self.store
+        store.alive[: self.total] = alive
+        store.dirty[: self.total] = alive
+        store.alive_count = int(np.count_nonzero(alive))
+        store.free_slots = np.flatnonzero(~alive).tolist()
+        grid = alive[self.slot_grid]
+        self.column_counts = grid.sum(axis=0)
+        self.row_counts = grid.sum(axis=1)
+        columns = np.flatnonzero(self.column_counts)
+        rows = np.flatnonzero(self.row_counts)
+        self.left = int(columns[0]) if len(columns) else len(self.column_counts)
+        self.right = int(columns[-1]) if len(columns) else len(self.column_counts) - 1
+        self.bottom = int(rows[0]) if len(rows) else len(self.row_counts)
+        lowest = self.slot_grid[grid.argmax(axis=0), np.arange(grid.shape[1])]
+        self.column_bottom = np.where(grid.any(axis=0), lowest, -1)
+        self.shooter_columns = list(shooter_columns)
+        self.shooter_index = {
+            col: index for index, col in enumerate(self.shooter_columns)
+        }
+
+    def raise_column_bottom(self, col):
+        """
+        Moves the bottom of a column up to its next living alien.
+
+        A column whose last alien died is swap-removed from `shooter_columns`.
+
+        Args:
+            col (int): The column whose bottom alien died.
+        """
+        column_slots = self.slot_grid[:, col]
+        row = self.row[self.column_bottom[col]] + 1
+        while row < len(column_slots) and not self.store.alive[column_slots[row]]:
+            row += 1
+        if row < len(column_slots):
+            self.column_bottom[col] = column_slots[row]
+            return
+        self.column_bottom[col] = -1
+        index = self.shooter_index.pop(col)
+        last = self.shooter_columns.pop()
+        if last != col:
+            self.shooter_columns[index] = last
+            self.shooter_index[last] = index
+
+    def shooter(self, rng):
+        """
+        Returns the slot of a random alien at the bottom of its column.
+
+        Args:
+            rng (random.Random): The random number generator to pick with.
+
+        Returns:
+            int: The slot of the shooter, or None if no alien is left.
+        """
+        if not self.shooter_columns:
+            return None
+        col = self.shooter_columns[rng.randrange(len(self.shooter_columns))]
+        return int(self.column_bottom[col])
+
+    def step(self, speed):
+        """
+        Marches the formation and reverses it once it crosses a screen edge.
+
+        Args:
+            speed (float): The horizontal distance to move.
+        """
+        if not len(self.store):
+            return
+        self.offset_x += self.direction * speed
+        if (
+            self.column_x[self.right] + self.offset_x > FORMATION_EDGE
+            or self.column_x[self.left] + self.offset_x < -FORMATION_EDGE
+        ):
+            self.direction *= -1
+            self.offset_y -= FORMATION_DROP
+
+    def bottom_y(self):
+        """
+        Returns the world y-coordinate of the lowest living row.
+
+        Returns:
+            float: The y-coordinate, or infinity if no alien is left.
+        """
+        if not len(self.store):
+            return float("inf")
+        return self.row_y[self.bottom] + self.offset_y
+
+    def move_interval(self, base_interval):
+        """
+        Returns the march interval for the number of surviving aliens.
+
+        Args:
+            base_interval (float): The interval of a full formation, in seconds.
+
+        Returns:
+            float: The interval, shrinking as the formation thins.
+        """
+        if not self.total:
+            return base_interval
+        killed = 1 - len(self.store) / self.total
+        return base_interval / (1 + self.march_speedup * killed)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+
+
+class FrameCache:
+    """
+    A persistent cache of the frames extracted from the animated GIF assets.
+
+    Extracted frames are written to `frames_dir` together with a manifest that
+    records, for each asset, the SHA-256 of the source GIF and the frame files
+    produced from it. As long as an asset's hash matches and its frames are
+    still on disk, it is neither decoded nor written again; when a GIF changes,
+    only that asset is re-extracted. Different assets may be loaded from
+    several threads at once; PIL is only imported when a GIF is extracted.
+
+    Attributes:
+        frames_dir (str): The directory holding the extracted frames and the manifest.
+        manifest_path (str): The path of the manifest file.
+        manifest (dict): Entries with "hash" and "frames" keyed by name prefix.
+        hits (int): Assets served from the cache.
+        misses (int): Assets that had to be extracted.
+
+    Methods:
+        frames(gif_path, name_prefix): Returns the frame paths of a GIF, extracting them if needed.
+        save(): Writes the manifest if it changed.
+    """
+
+    def __init__(self, frames_dir):
+        """
+        Initializes the cache and loads its manifest.
+
+        Args:
+            frames_dir (str): The directory holding the extracted frames and the manifest.
+        """
+        self.frames_dir = frames_dir
+        self.manifest_path = os.path.join(frames_dir, "manifest.json")
+        self.manifest = self.load_manifest()
+        self.changed = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def load_manifest(self):
+        """
+        Loads the manifest from disk.
+
+        Returns:
+            dict: The manifest, or an empty one if it is missing or unreadable.
+        """
+        try:
+            with open(self.manifest_path, "r") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def file_hash(self, path):
+        """
+        Returns the SHA-256 digest of a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            str: The hexadecimal digest.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def frames(self, gif_path, name_prefix):
+        """
+        Returns the frame paths of a GIF, extracting them if the cache is stale.
+
+        Args:
+            gif_path (str): The path to the GIF file.
+            name_prefix (str): The prefix for the frame image filenames.
+
+        Returns:
+            list: A list of file paths to the extracted frames.
+        """
+        source_hash = self.file_hash(gif_path)
+        with self.lock:
+            entry = self.manifest.get(name_prefix)
+        if (
+            entry
+            and entry.get("hash") == source_hash
+            and entry.get("frames")
+            and all(os.path.exists(path) for path in entry["frames"])
+        ):
+            with self.lock:
+                self.hits += 1
+            return entry["frames"]
+
+        frames = self.extract(gif_path, name_prefix)
+        stale = set(entry.get("frames", ())) - set(frames) if entry else set()
+        for path in stale:
+            if os.path.exists(path):
+                os.remove(path)
+        with self.lock:
+            self.misses += 1
+            self.manifest[name_prefix] = {"hash": source_hash, "frames": frames}
+            self.changed = True
+        return frames
+
+    def extract(self, gif_path, name_prefix):
+        """
+        Extracts frames from a GIF and saves them as separate images.
+
+        Args:
+            gif_path (str): The path to the GIF file.
+            name_prefix (str): The prefix for the frame image filenames.
+
+        Returns:
+            list: A list of file paths to the extracted frames.
+        """
+        from PIL import Image
+
+        os.makedirs(self.frames_dir, exist_ok=True)
+        frames = []
+        with Image.open(gif_path) as img:
+            for frame in range(img.n_frames):
+                img.seek(frame)
+                frame_image = img.copy().convert("RGBA")
+                frame_path = os.path.join(
+                    self.frames_dir, f"{name_prefix}_frame_{frame}.gif"
+                )
+                frame_image.save(frame_path)
+                frames.append(frame_path)
+        return frames
+
+    def save(self):
+        """Writes the manifest atomically if it changed."""
+        if not self.changed:
+            return
+        os.makedirs(self.frames_dir, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.manifest, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+        self.changed = False
@@ -1,85 +1,226 @@
-from spaceship import Spaceship
-from alien import Alien
-from barrier import Barrier
-from scoreboard import Scoreboard
-from projectile import Projectile
+from score_store import ScoreStore
+from projectile_pool import ProjectilePool
 from sound_manager import SoundManager
-from PIL import Image
+from world import World
+from frame_cache import FrameCache
 from _tkinter import TclError
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import numpy as np
+import random
 import time
 import os
 import sys
+from clock import FixedTimestep
+from animation import AnimationScheduler
+from profiler import Profiler, StartupTimer
+from controls import InputState
+from replay import InputRecorder
+from quality import QualityGovernor
+from savestate import RewindBuffer, save_state, load_state
 from config import (
-    SCREEN_HEIGHT,
-    ALIEN_ROWS,
-    ALIEN_COLUMNS,
-    BARRIER_POSITION,
-    ALIEN_MOVE_INTERVAL,
-    INITIAL_ALIEN_SPEED,
-    INITIAL_PROJECTILE_SPEED,
+    TICK_RATE,
+    MAX_CATCH_UP_TICKS,
+    RENDER_INTERPOLATION,
+    ANIMATION_FRAME_DURATIONS,
+    BACKGROUND_FPS,
+    PROFILING_ENABLED,
+    PROFILE_CAPACITY,
+    PROFILE_OUTPUT,
+    SCORE_DATABASE,
+    PROJECTILE_POOL_SIZE,
+    PROJECTILE_POOL_LIMIT,
+    ASSET_LOADER_THREADS,
+    STARTUP_REPORT,
+    RANDOM_SEED,
+    REPLAY_OUTPUT,
+    QUALITY_GOVERNOR,
+    QUALITY_FRAME_BUDGET,
+    QUALITY_LEVELS,
+    SAVE_STATE,
+    REWIND_INTERVAL,
+    REWIND_CAPACITY,
+    REWIND_STEP,
+)
+
+logger = logging.getLogger(__name__)
+
+SPRITE_ASSETS = ("spaceship", "alien", "projectile", "barrier", "background")
+SOUNDS = (
+    ("shoot", "assets/sounds/shoot.wav", 0.5),
+    ("alien_hit", "assets/sounds/alien_hit.wav", 0.5),
+    ("barrier_hit", "assets/sounds/barrier_hit.wav", 0.5),
+    ("alien_shoot", "assets/sounds/alien_shoot.wav", 0.5),
+    ("game_over", "assets/sounds/game_over.wav", 0.5),
+    ("ship_destroyed", "assets/sounds/game_over.wav", 0.5),
+    ("background_music", "assets/sounds/background_music.wav", 0.3),
 )
-import pygame
 
 
 class Game:
     """
-    The main game class that handles the overall game logic.
+    The main game class that renders the world and wires it to the player.
+
+    The game rules live in `World`; this class only feeds it keyboard input,
+    reacts to the events it reports and syncs the sprites from it. All
+    drawing goes through a renderer (`TurtleRenderer` or `PygameRenderer`).
 
     Attributes:
-        screen (Screen): The turtle screen where the game is displayed.
+        renderer (TurtleRenderer): The backend that draws the game.
+        seed (int): The seed of the random number generator driving the world.
+        rng (random.Random): The random number generator driving the world.
+        recorder (InputRecorder): The recording of the session's inputs, or None.
+        link (HostLink): The network link of a two-player game (a `ClientLink`
+            on the joining side), or None for a single player.
         sound_manager (SoundManager): The manager for game sounds.
-        alien_speed (float): The initial speed of the aliens.
-        projectile_speed (float): The initial speed of the projectiles.
-        scoreboard (Scoreboard): The game scoreboard.
-        last_alien_move_time (float): The last time the aliens moved.
+        world (World): The headless simulation of the game; on the joining
+            side of a two-player game, a mirror of the host's.
+        spaceships (list): The sprite of each player's spaceship.
+        spare_aliens (list): Hidden alien sprites waiting to be reused.
+        barriers (list): The sprite of each barrier slot, created once and
+            placed again for every level.
+        scores (ScoreStore): The history of finished runs.
+        scoreboard (Scoreboard): The game scoreboard, created by the renderer.
+        controls (InputState): The held keys, sampled once per tick.
+        projectile_pool (ProjectilePool): Reusable projectile sprites.
+        clock (FixedTimestep): The scheduler that paces simulation ticks.
+        animations (AnimationScheduler): The time-based sprite animations.
+        background (BackgroundAnimator): The animated background.
+        profiler (Profiler): Per-phase timings of the game loop.
+        startup (StartupTimer): Launch timings, until the first frame is shown.
+        governor (QualityGovernor): Lowers the quality when frames run over
+            budget, or None when disabled.
+        quality (dict): The settings of the current quality level.
+        rewind (RewindBuffer): Recent snapshots of the world to rewind to, or
+            None in a two-player game.
+        state (str): "playing", "game_over" or "quit".
         can_restart (bool): Flag to indicate if the game can be restarted.
     """
 
-    def __init__(self, screen):
+    def __init__(
+        self, renderer, startup=None, seed=RANDOM_SEED, link=None, resume=False
+    ):
         """
-        Initializes the game with the given screen.
+        Initializes the game with the given renderer.
+
+        The GIFs and sounds are decoded on a thread pool while the main thread
+        builds the world and the scoreboard; only registering the decoded
+        frames with Tk has to stay on the main thread.
 
         Args:
-            screen (Screen): The turtle screen where the game is displayed.
-        """
-        self.screen = screen
-        self.sound_manager = SoundManager()
-        self.alien_speed = INITIAL_ALIEN_SPEED
-        self.projectile_speed = INITIAL_PROJECTILE_SPEED
-        self.scoreboard = Scoreboard()  # Initialize scoreboard once
-        self.last_alien_move_time = time.time()
-        self.load_assets()
+            renderer (TurtleRenderer): The backend that draws the game.
+            startup (StartupTimer, optional): Launch timings to continue.
+            seed (int, optional): The seed of the world's random number
+                generator; None picks one, which the recording keeps.
+            link (HostLink, optional): The network link of a two-player game.
+            resume (bool, optional): Whether to continue from the save state.
+        """
+        self.renderer = renderer
+        self.link = link
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed)
+        self.recorder = (
+            InputRecorder(self.seed, TICK_RATE)
+            if REPLAY_OUTPUT and link is None
+            else None
+        )
+        self.startup = startup or StartupTimer()
+        with ThreadPoolExecutor(ASSET_LOADER_THREADS) as executor:
+            frame_jobs = self.start_loading_frames(executor)
+            sound_jobs = self.start_loading_sounds(executor)
+            self.world = World(self.rng, players=1 if link is None else 2)
+            self.animated_stores = {
+                "alien": self.world.aliens,
+                "projectile": self.world.projectiles,
+                "barrier": self.world.barriers,
+            }
+            self.scores = ScoreStore(
+                SCORE_DATABASE, legacy_high_score_path="high_score.txt"
+            )
+            self.scoreboard = self.renderer.create_scoreboard(
+                self.scores.high_score()
+            )  # Initialize scoreboard once
+            self.run_started = time.time()
+            self.run_recorded = False
+            self.controls = InputState()
+            self.clock = FixedTimestep(TICK_RATE, MAX_CATCH_UP_TICKS)
+            self.profiler = Profiler(PROFILE_CAPACITY, PROFILING_ENABLED)
+            self.governor = (
+                QualityGovernor(QUALITY_LEVELS, QUALITY_FRAME_BUDGET)
+                if QUALITY_GOVERNOR
+                else None
+            )
+            self.quality = QUALITY_LEVELS[0]
+            if self.profiler.enabled:
+                self.world.profiler = self.profiler
+            self.state = "playing"
+            self.startup.mark("setup")
+            self.load_assets(frame_jobs)
+            self.load_sounds(sound_jobs)
+        self.animations = AnimationScheduler()
+        for kind, duration in ANIMATION_FRAME_DURATIONS.items():
+            self.animations.add(kind, len(getattr(self, f"{kind}_frames")), duration)
+        self.projectile_pool = ProjectilePool(
+            self.renderer,
+            self.projectile_frames,
+            PROJECTILE_POOL_SIZE,
+            PROJECTILE_POOL_LIMIT,
+        )
+        self.spare_aliens = []
+        self.barriers = []
+        self.rewind = (
+            RewindBuffer(REWIND_CAPACITY, REWIND_INTERVAL) if link is None else None
+        )
         self.reset_game()
-        self.load_sounds()
+        self.bind_keys()
         self.play_background_music()
         self.can_restart = False
+        if resume:
+            self.load_game()
+        self.startup.mark("setup")
 
-    def load_assets(self):
-        """Loads all game assets including frames for animations."""
-        self.spaceship_frames = self.extract_frames("assets/spaceship.gif", "spaceship")
-        self.alien_frames = self.extract_frames("assets/alien.gif", "alien")
-        self.projectile_frames = self.extract_frames(
-            "assets/projectile.gif", "projectile"
-        )
-        self.barrier_frames = self.extract_frames("assets/barrier.gif", "barrier")
-        self.background_frames = self.extract_frames(
-            "assets/background.gif", "background"
-        )
+    def start_loading_frames(self, executor):
+        """
+        Starts extracting the frames of every GIF on the thread pool.
+
+        Args:
+            executor (ThreadPoolExecutor): The pool to decode on.
+
+        Returns:
+            dict: The pending frame lists, keyed by asset name.
+        """
+        self.frame_cache = FrameCache(os.path.join("assets", "frames"))
+        return {
+            name: executor.submit(self.extract_frames, f"assets/{name}.gif", name)
+            for name in SPRITE_ASSETS
+        }
 
-        for frame in (
+    def load_assets(self, frame_jobs):
+        """
+        Waits for the decoded frames and registers them with the renderer.
+
+        Args:
+            frame_jobs (dict): The pending frame lists from `start_loading_frames`.
+        """
+        for name, job in frame_jobs.items():
+            setattr(self, f"{name}_frames", job.result())
+        self.frame_cache.save()
+        self.startup.mark("decode")
+
+        self.renderer.register_frames(
             self.spaceship_frames
             + self.alien_frames
             + self.projectile_frames
             + self.barrier_frames
-            + self.background_frames
-        ):
-            self.screen.register_shape(frame)
-
-        self.screen.bgpic(self.background_frames[0])  # Set the initial background frame
+        )
+        self.background = self.renderer.create_background(
+            self.background_frames, BACKGROUND_FPS
+        )
+        self.startup.mark("register")
 
     def extract_frames(self, gif_path, name_prefix):
         """
-        Extracts frames from a GIF and saves them as separate images.
+        Returns the frames of a GIF, extracting them only if the cached copy is stale.
 
         Args:
             gif_path (str): The path to the GIF file.
@@ -88,241 +229,625 @@ class Game:
         Returns:
             list: A list of file paths to the extracted frames.
         """
-        frames_dir = os.path.join("assets", "frames")
-        os.makedirs(frames_dir, exist_ok=True)
-        frames = []
-        with Image.open(gif_path) as img:
-            for frame in range(img.n_frames):
-                img.seek(frame)
-                frame_image = img.copy().convert("RGBA")
-                frame_path = os.path.join(
-                    frames_dir, f"{name_prefix}_frame_{frame}.gif"
-                )
-                frame_image.save(frame_path)
-                frames.append(frame_path)
-        return frames
-
-    def load_sounds(self):
-        """Loads all game sounds."""
-        self.sound_manager.load_sound("shoot", "assets/sounds/shoot.wav")
-        self.sound_manager.load_sound("alien_hit", "assets/sounds/alien_hit.wav")
-        self.sound_manager.load_sound("barrier_hit", "assets/sounds/barrier_hit.wav")
-        self.sound_manager.load_sound("alien_shoot", "assets/sounds/alien_shoot.wav")
-        self.sound_manager.load_sound("game_over", "assets/sounds/game_over.wav")
-        self.sound_manager.load_sound(
-            "background_music", "assets/sounds/background_music.wav", volume=0.3
-        )
+        return self.frame_cache.frames(gif_path, name_prefix)
+
+    def start_loading_sounds(self, executor):
+        """
+        Starts the mixer and decodes every sound on the thread pool.
+
+        The sound manager, and with it pygame, is created by the first job;
+        the decoding jobs are queued after it, so waiting on it cannot stall
+        the pool.
+
+        Args:
+            executor (ThreadPoolExecutor): The pool to decode on.
+
+        Returns:
+            tuple: The pending sound manager and the pending decoding jobs.
+        """
+        manager = executor.submit(SoundManager)
+        jobs = [
+            executor.submit(self.decode_sound, manager, name, path, volume)
+            for name, path, volume in SOUNDS
+        ]
+        return manager, jobs
+
+    def decode_sound(self, manager, name, sound_path, volume):
+        """
+        Loads one sound into the sound manager once it exists; runs on the pool.
+
+        Args:
+            manager (Future): The pending sound manager.
+            name (str): The name of the sound.
+            sound_path (str): The path to the sound file.
+            volume (float): The volume level of the sound.
+        """
+        manager.result().load_sound(name, sound_path, volume)
+
+    def load_sounds(self, sound_jobs):
+        """
+        Waits for the sound manager and every sound to be loaded.
+
+        Args:
+            sound_jobs (tuple): The pending jobs from `start_loading_sounds`.
+        """
+        manager, jobs = sound_jobs
+        self.sound_manager = manager.result()
+        for job in jobs:
+            job.result()
+        self.startup.mark("decode")
 
     def play_background_music(self):
         """Plays the background music for the game."""
         self.sound_manager.play_sound("background_music")
 
     def reset_game(self):
-        """Resets the game state for a new game or level."""
-        self.is_game_over = False
-        self.is_level_complete = False
+        """Creates the sprites for the current state of the world."""
         self.scoreboard.reset_position()
-        self.spaceship = Spaceship(
-            self.spaceship_frames, self.projectile_frames, self.sound_manager
-        )
-        self.aliens = self.create_aliens()
-        self.barriers = self.create_barriers()
-        self.spaceship.projectiles = []
-        self.alien_projectiles = []
+        self.spaceships = [
+            self.renderer.create_sprite(
+                "spaceship", self.spaceship_frames, (ship.x, ship.y)
+            )
+            for ship in self.world.ships
+        ]
+        self.aliens = {}
+        self.formation_offset = None
+        self.place_barriers()
+        self.barrier_versions = self.world.barrier_masks.versions.copy()
+        self.projectiles = {}
+        self.sync_sprites()
+        for spaceship in self.spaceships:
+            self.show_current_frame("spaceship", spaceship)
+        for barrier in self.barriers:
+            self.show_current_frame("barrier", barrier)
+        self.controls.clear()
 
-        self.screen.listen()
-        self.screen.onkey(self.spaceship.move_left, "Left")
-        self.screen.onkey(self.spaceship.move_right, "Right")
-        self.screen.onkey(self.spaceship.shoot, "space")
-        self.screen.onkey(self.quit_game, "q")  # Add keypress for quitting the game
+    def bind_keys(self):
+        """
+        Registers the key bindings once for the whole session.
 
-    def create_aliens(self):
+        Save states and rewinding are only offered to a single player, since
+        they would desynchronize a two-player game.
         """
-        Creates and positions the aliens on the screen.
+        commands = {
+            "q": self.quit_game,  # Add keypress for quitting the game
+            "p": self.toggle_profiling,
+            "r": self.restart,
+        }
+        if self.link is None:
+            commands.update(
+                {
+                    "F5": self.save_game,
+                    "F9": self.load_game,
+                    "BackSpace": self.rewind_game,
+                }
+            )
+        self.renderer.bind_keys(self.controls, commands)
 
-        Returns:
-            list: A list of Alien objects.
+    def create_alien(self, slot):
         """
-        aliens = []
-        for row in range(ALIEN_ROWS):
-            for col in range(ALIEN_COLUMNS):
-                alien = Alien(self.alien_speed, self.alien_frames)
-                alien.goto(col * 50 - 250, row * 30 + 150)
-                aliens.append(alien)
-        return aliens
+        Places a sprite for an alien of the world, reusing a spare one if there is any.
+
+        Args:
+            slot (int): The slot of the alien in the world's alien store.
 
-    def create_barriers(self):
+        Returns:
+            Alien: The new alien sprite.
+        """
+        aliens = self.world.aliens
+        formation = self.world.formation
+        position = (
+            aliens.x[slot] + formation.offset_x,
+            aliens.y[slot] + formation.offset_y,
+        )
+        if self.spare_aliens:
+            alien = self.spare_aliens.pop()
+            alien.goto(position)
+            alien.showturtle()
+        else:
+            alien = self.renderer.create_sprite("alien", self.alien_frames, position)
+        self.show_current_frame("alien", alien, slot)
+        return alien
+
+    def create_projectile(self, slot):
         """
-        Creates and positions the barriers on the screen.
+        Takes a sprite from the pool for a projectile of the world.
+
+        Args:
+            slot (int): The slot of the projectile in the world's projectile store.
 
         Returns:
-            list: A list of Barrier objects.
+            Projectile: The sprite, or None if the pool is exhausted.
         """
-        return [Barrier(pos, self.barrier_frames) for pos in BARRIER_POSITION]
+        projectiles = self.world.projectiles
+        projectile = self.projectile_pool.acquire(
+            projectiles.x[slot], projectiles.y[slot], int(projectiles.direction[slot])
+        )
+        if projectile is not None:
+            self.show_current_frame("projectile", projectile, slot)
+        return projectile
+
+    def place_barriers(self):
+        """
+        Shows an intact barrier sprite on every barrier of the world.
+
+        The sprites of earlier levels are reused, so their eroded shapes are
+        replaced rather than piling up; a sprite is only created for a slot
+        that never had one.
+        """
+        barriers = self.world.barriers
+        for slot in barriers.alive_slots().tolist():
+            position = (barriers.x[slot], barriers.y[slot])
+            if slot < len(self.barriers):
+                barrier = self.barriers[slot]
+                barrier.set_mask(None)
+                barrier.goto(position)
+                barrier.showturtle()
+            else:
+                self.barriers.append(
+                    self.renderer.create_sprite(
+                        "barrier", self.barrier_frames, position
+                    )
+                )
 
     def run(self):
-        """Main game loop."""
+        """
+        Main game loop.
+
+        The world advances in fixed ticks of 1 / TICK_RATE seconds, however long
+        a frame takes to render. Level completion, game over and restart only
+        change `state`, so the loop keeps running until the player quits
+        instead of re-entering itself.
+        """
+        self.clock.reset()
         try:
-            while not self.is_game_over and not self.is_level_complete:
-                self.screen.update()
-                time.sleep(0.02)  # Update the screen every 20ms
-                current_time = time.time()
-                if current_time - self.last_alien_move_time >= ALIEN_MOVE_INTERVAL:
-                    self.move_aliens()
-                    self.last_alien_move_time = current_time
-                self.move_projectiles()
-                self.check_collisions()
-                self.alien_shoot()
-                self.update_animations()
-                self.update_background()
-                if not self.aliens:
-                    self.is_level_complete = True
-                    self.level_complete()
+            while self.state != "quit":
+                frame_start = time.perf_counter()
+                if self.world.profiler is not None:
+                    self.world.profiler.begin_frame()
+                self.renderer.poll()
+                # read after polling, since the profiling key is handled there
+                profiler = self.world.profiler
+                if profiler is not None:
+                    profiler.mark("poll")
+                ticks = self.clock.advance()
+                for _ in range(ticks):
+                    self.tick()
+                self.render()
+                self.renderer.present()
+                if self.startup is not None:
+                    self.finish_startup()
+                if profiler is not None:
+                    profiler.mark("screen_update")
+                    profiler.end_frame(
+                        ticks=ticks,
+                        aliens=len(self.world.aliens),
+                        projectiles=len(self.world.projectiles),
+                        quality=self.governor.level if self.governor else 0,
+                    )
+                if self.governor is not None and self.governor.update(
+                    time.perf_counter() - frame_start
+                ):
+                    self.apply_quality(self.governor.settings())
+                self.clock.wait()
         except TclError:
             sys.exit(1)
+        self.shutdown()
 
-    def move_aliens(self):
-        """Moves all aliens on the screen."""
-        for alien in self.aliens:
-            alien.move()
-
-    def move_projectiles(self):
-        """Moves all projectiles on the screen and removes them if they go out of bounds."""
-        for projectile in self.spaceship.projectiles:
-            projectile.move()
-            if projectile.ycor() > SCREEN_HEIGHT / 2:
-                projectile.hideturtle()
-                self.spaceship.projectiles.remove(projectile)
-
-        for projectile in self.alien_projectiles:
-            projectile.move()
-            if projectile.ycor() < -SCREEN_HEIGHT / 2:
-                projectile.hideturtle()
-                self.alien_projectiles.remove(projectile)
-
-    def check_collisions(self):
-        """Checks for and handles collisions between projectiles, aliens, barriers, and the spaceship."""
-        for projectile in self.spaceship.projectiles:
-            for alien in self.aliens:
-                if projectile.distance(alien) < 20:
-                    alien.hideturtle()
-                    self.aliens.remove(alien)
-                    projectile.hideturtle()
-                    self.spaceship.projectiles.remove(projectile)
-                    self.scoreboard.increase_score()
-                    self.sound_manager.play_sound("alien_hit")
-                    break
-
-            for barrier in self.barriers:
-                if projectile.distance(barrier) < 20:
-                    projectile.hideturtle()
-                    self.spaceship.projectiles.remove(projectile)
-                    self.sound_manager.play_sound("barrier_hit")
-                    break
-
-        for projectile in self.alien_projectiles:
-            if projectile.distance(self.spaceship) < 20:
-                self.is_game_over = True
-                self.game_over()
-                return
-
-            for barrier in self.barriers:
-                if projectile.distance(barrier) < 20:
-                    projectile.hideturtle()
-                    self.alien_projectiles.remove(projectile)
-                    self.sound_manager.play_sound("barrier_hit")
-                    break
-
-            for player_projectile in self.spaceship.projectiles:
-                if projectile.distance(player_projectile) < 20:
-                    projectile.hideturtle()
-                    self.alien_projectiles.remove(projectile)
-                    player_projectile.hideturtle()
-                    self.spaceship.projectiles.remove(player_projectile)
-                    break
-
-        for alien in self.aliens:
-            if alien.ycor() <= self.spaceship.ycor() + 20:
-                self.is_game_over = True
+    def finish_startup(self):
+        """Records the first frame and reports how long startup took."""
+        self.startup.mark("first_frame")
+        logger.info(self.startup.summary())
+        if STARTUP_REPORT:
+            self.startup.export_json(STARTUP_REPORT)
+        self.startup = None
+
+    def tick(self):
+        """
+        Advances the world by one fixed tick with the keys held during it.
+
+        In a two-player game the link advances the world instead, and keeps
+        running after a game over so both sides stay in sync.
+        """
+        inputs = self.controls.drain()
+        if self.link is not None:
+            if self.state != "playing":
+                inputs = ()
+            self.handle_events(self.link.step(self.world, self.clock.dt, inputs))
+            self.scoreboard.score = self.world.score
+            return
+        if self.state != "playing":
+            return
+        self.handle_events(self.world.step(self.clock.dt, inputs))
+        if self.recorder is not None:
+            self.recorder.record_tick(inputs, self.world)
+        if self.state == "playing":
+            self.rewind.record(self.world)
+        if self.world.profiler is not None:
+            self.world.profiler.mark("handle_events")
+
+    def render(self):
+        """Brings every sprite and the background up to date with the world."""
+        profiler = self.world.profiler
+        alpha = self.clock.alpha() if RENDER_INTERPOLATION else 0.0
+        self.sync_sprites(alpha)
+        if profiler is not None:
+            profiler.mark("sync_sprites")
+        self.update_animations()
+        if profiler is not None:
+            profiler.mark("update_animations")
+        self.update_background()
+        if profiler is not None:
+            profiler.mark("update_background")
+        self.scoreboard.refresh()
+        if profiler is not None:
+            profiler.mark("scoreboard")
+
+    def apply_quality(self, settings):
+        """
+        Switches to the settings of a quality level.
+
+        Args:
+            settings (dict): The settings of the level (see `QUALITY_LEVELS`).
+        """
+        self.quality = settings
+        self.animations.stretch = settings["animation_stretch"]
+        self.sound_manager.voice_limit = min(
+            settings["sound_voices"], len(self.sound_manager.channels)
+        )
+
+    def toggle_profiling(self):
+        """
+        Switches the per-phase profiler on or off.
+
+        The key is handled while polling for input, so switching on starts
+        the current frame's row right away; otherwise the phases still to
+        run would be charged to the last frame recorded before.
+        """
+        if self.profiler.toggle():
+            self.profiler.begin_frame()
+            self.world.profiler = self.profiler
+        else:
+            self.world.profiler = None
+
+    def handle_events(self, events):
+        """
+        Plays sounds and updates the scoreboard for the events of a tick.
+
+        Args:
+            events (list): The event names reported by `World.step`.
+        """
+        for event in events:
+            if event == "alien_hit":
+                self.scoreboard.increase_score()
+            if event == "game_over":
                 self.game_over()
+            elif event == "level_complete":
+                self.level_complete()
+            elif event == "resync":
+                self.resync()
+            else:
+                self.sound_manager.play_sound(event)
+
+    def sync_sprites(self, alpha=0.0):
+        """
+        Moves, creates and hides sprites to match the world.
 
-    def alien_shoot(self):
-        """Handles the shooting logic for the aliens."""
-        from random import choice, randint
-
-        if (
-            self.aliens and randint(1, 100) <= 5
-        ):  # 5% chance per frame for any alien to shoot
-            shooter = choice(self.aliens)
-            projectile = Projectile(
-                shooter.xcor(),
-                shooter.ycor(),
-                direction=-1,
-                frames=self.projectile_frames,
-            )
-            self.alien_projectiles.append(projectile)
-            self.sound_manager.play_sound("alien_shoot")
+        Args:
+            alpha (float): How far the clock is into the next tick; projectiles
+                are drawn that far ahead along their path.
+        """
+        for spaceship, ship in zip(self.spaceships, self.world.ships):
+            if not ship.alive:
+                spaceship.hideturtle()
+            elif spaceship.pos() != (ship.x, ship.y):
+                spaceship.goto(ship.x, ship.y)
+        formation = self.world.formation
+        offset = (formation.offset_x, formation.offset_y)
+        self.sync_store(
+            self.world.aliens,
+            self.aliens,
+            self.create_alien,
+            self.retire_alien,
+            offset=offset,
+            move_all=offset != self.formation_offset,
+        )
+        self.formation_offset = offset
+        lead = self.world.projectile_speed * TICK_RATE * self.clock.dt * alpha
+        self.sync_store(
+            self.world.projectiles,
+            self.projectiles,
+            self.create_projectile,
+            self.projectile_pool.release,
+            lead=lead,
+            move_all=bool(lead),
+        )
+        self.sync_barriers()
+
+    def sync_barriers(self):
+        """Redraws the barriers whose mask changed and hides the destroyed ones."""
+        barriers = self.world.barriers
+        masks = self.world.barrier_masks
+        changed = np.flatnonzero(masks.versions != self.barrier_versions)
+        for slot in changed.tolist():
+            if barriers.alive[slot]:
+                self.barriers[slot].set_mask(
+                    masks.masks[slot].copy(), (slot, int(masks.versions[slot]))
+                )
+                self.barriers[slot].showturtle()
+            else:
+                self.barriers[slot].hideturtle()
+        self.barrier_versions = masks.versions.copy()
+
+    def sync_store(
+        self,
+        store,
+        sprites,
+        create,
+        remove,
+        offset=(0.0, 0.0),
+        lead=0.0,
+        move_all=False,
+    ):
+        """
+        Syncs the sprites of one entity store, touching only the slots that changed.
+
+        Args:
+            store (EntityStore): The world store to mirror.
+            sprites (dict): The sprites keyed by slot, updated in place.
+            create (callable): Creates the sprite for a slot that has none yet.
+            remove (callable): Disposes of the sprite of a slot that died.
+            offset (tuple): An (x, y) translation from store to screen positions.
+            lead (float): Distance to draw each entity ahead along its direction.
+            move_all (bool): Whether to move every sprite, not only the dirty ones.
+        """
+        alive = store.alive
+        for slot in [slot for slot in sprites if not alive[slot]]:
+            remove(sprites.pop(slot))
+        x, y = store.x, store.y
+        dx, dy = offset
+        for slot in store.take_dirty().tolist():
+            sprite = sprites.get(slot)
+            if sprite is None:
+                sprite = create(slot)
+                if sprite is not None:
+                    sprites[slot] = sprite
+            elif not move_all:
+                sprite.goto(x[slot] + dx, y[slot] + dy)
+        if move_all:
+            direction = store.direction
+            for slot, sprite in sprites.items():
+                sprite.goto(x[slot] + dx, y[slot] + dy + direction[slot] * lead)
 
     def game_over(self):
         """Handles the game over logic."""
+        self.record_run()
         self.scoreboard.show_game_over()
         self.sound_manager.play_sound("game_over")
         self.can_restart = True
-        self.screen.onkey(self.restart, "r")
-        self.screen.listen()
+        self.state = "game_over"
 
     def level_complete(self):
         """Handles the logic for completing a level."""
         self.hide_objects()
-        self.alien_speed *= 1.2
-        self.projectile_speed *= 1.2
-        self.scoreboard.save_high_score()
+        self.world.next_level()
+        self.scoreboard.update_high_score()
         self.reset_game()
-        self.run()
+
+    def resync(self):
+        """Rebuilds the sprites after the host started another level or game."""
+        self.hide_objects()
+        if self.state == "game_over":
+            self.run_started = time.time()
+            self.run_recorded = False
+        self.can_restart = False
+        self.reset_game()
+        self.state = "playing"
 
     def restart(self):
-        """Restarts the game if allowed."""
-        if self.can_restart:
+        """Restarts the game if allowed; only the host restarts a two-player game."""
+        if self.can_restart and (self.link is None or self.link.authoritative):
             self.hide_objects()
+            self.can_restart = False
             self.scoreboard.reset_score()
-            self.alien_speed = INITIAL_ALIEN_SPEED
-            self.projectile_speed = INITIAL_PROJECTILE_SPEED
+            if self.recorder is not None:
+                self.recorder.record("restart")
+            self.world.restart()
+            self.run_started = time.time()
+            self.run_recorded = False
             self.reset_game()
-            self.run()
+            self.state = "playing"
+
+    def save_game(self):
+        """
+        Writes a save state of the world, unless the game is over.
+
+        Returns:
+            bool: Whether the save state was written.
+        """
+        if self.world.is_game_over:
+            return False
+        data = save_state(self.world)
+        with open(SAVE_STATE, "wb") as file:
+            file.write(data)
+        logger.info("Saved the game to %s (%d bytes)", SAVE_STATE, len(data))
+        return True
+
+    def load_game(self):
+        """Continues from the save state, if there is a usable one."""
+        try:
+            with open(SAVE_STATE, "rb") as file:
+                data = file.read()
+        except OSError as error:
+            logger.warning("Could not load %s: %s", SAVE_STATE, error)
+            return
+        backup = save_state(self.world)
+        try:
+            self.restore(data)
+        except ValueError as error:
+            load_state(self.world, backup)
+            logger.warning("Could not load %s: %s", SAVE_STATE, error)
+            return
+        self.rewind.clear()
+        logger.info("Loaded the game from %s", SAVE_STATE)
+
+    def rewind_game(self):
+        """Goes back `REWIND_STEP` snapshots, or to the oldest one kept."""
+        data = self.rewind.rewind(REWIND_STEP)
+        if data is not None:
+            self.restore(data)
+
+    def restore(self, data):
+        """
+        Puts the world back in a saved state and brings the sprites in line.
+
+        No sprite is created for the restore: aliens keep their slots, so
+        surviving ones are only moved and the others come from the spare
+        aliens; projectiles go back to their pool and are placed again on the
+        next sync; the spaceships and barriers are moved, redrawn and shown in
+        place. A recording cannot replay a restore, so the recording stops.
+        Restoring after a game over continues the run, which is recorded again
+        once it ends.
+
+        Args:
+            data (bytes): A snapshot made by `save_state`.
+
+        Raises:
+            ValueError: If the snapshot does not fit this game.
+        """
+        load_state(self.world, data)
+        if self.recorder is not None:
+            logger.info("Stopped recording the session: a save state was loaded")
+            self.recorder = None
+        for projectile in self.projectiles.values():
+            self.projectile_pool.release(projectile)
+        self.projectiles.clear()
+        self.formation_offset = None
+        for spaceship, ship in zip(self.spaceships, self.world.ships):
+            if ship.alive:
+                spaceship.goto(ship.x, ship.y)
+                spaceship.showturtle()
+        self.sync_sprites()
+        self.scoreboard.score = self.world.score
+        self.scoreboard.reset_position()
+        if self.state == "game_over":
+            self.run_recorded = False
+        self.can_restart = False
+        self.controls.clear()
+        self.state = "playing"
 
     def quit_game(self):
-        """Quits the game and saves the high score."""
-        self.scoreboard.save_high_score()
-        self.screen.bye()
-        pygame.quit()
+        """Asks the game loop to stop at the end of the current frame."""
+        self.state = "quit"
+
+    def record_run(self):
+        """Queues the current run for saving, once."""
+        if not self.run_recorded:
+            self.scores.record_run(
+                self.world.score, self.world.level, time.time() - self.run_started
+            )
+            self.run_recorded = True
+
+    def shutdown(self):
+        """
+        Saves the run, profile and recording, logs the quality governor's and
+        the link's statistics, then closes the link, window and mixer.
+
+        A single-player game quit before it was over is kept in the save state
+        and not recorded yet: the run is recorded once, when it really ends,
+        even if that is after a `--resume`.
+        """
+        saved = self.link is None and self.save_game()
+        if not saved:
+            self.record_run()
+        self.scores.close()
+        if self.recorder is not None:
+            self.recorder.save(REPLAY_OUTPUT, self.world)
+        if self.profiler.frames:
+            self.profiler.export_jsonl(f"{PROFILE_OUTPUT}.jsonl")
+            self.profiler.export_chrome_trace(f"{PROFILE_OUTPUT}.trace.json")
+        if self.governor is not None:
+            logger.info("Quality governor: %s", self.governor.status())
+        if self.link is not None:
+            logger.info("Network statistics: %s", self.link.stats())
+            self.link.close()
+        self.renderer.close()
+        self.sound_manager.close()
+
+    def retire_alien(self, sprite):
+        """
+        Hides the sprite of an alien that died and keeps it for reuse.
+
+        Args:
+            sprite (Alien): The sprite to hide.
+        """
+        sprite.hideturtle()
+        self.spare_aliens.append(sprite)
 
     def hide_objects(self):
         """Hides all objects on the screen."""
-        self.spaceship.hideturtle()
-        for alien in self.aliens:
-            alien.hideturtle()
+        for spaceship in self.spaceships:
+            spaceship.hideturtle()
+        for alien in self.aliens.values():
+            self.retire_alien(alien)
         for barrier in self.barriers:
             barrier.hideturtle()
-        for projectile in self.spaceship.projectiles:
-            projectile.hideturtle()
-        for projectile in self.alien_projectiles:
-            projectile.hideturtle()
-        self.spaceship.projectiles.clear()
-        self.alien_projectiles.clear()
+        for projectile in self.projectiles.values():
+            self.projectile_pool.release(projectile)
+        self.aliens.clear()
+        self.projectiles.clear()
 
     def update_animations(self):
-        """Updates the animations for all objects."""
-        self.spaceship.update_animation()
-        for alien in self.aliens:
-            alien.update_animation()
-        for projectile in self.spaceship.projectiles:
-            projectile.update_animation()
-        for projectile in self.alien_projectiles:
-            projectile.update_animation()
-        for barrier in self.barriers:
-            barrier.update_animation()
+        """
+        Queues a frame change for the sprites of every kind whose frame moved and applies them.
+
+        Kinds the current quality level does not animate keep their frame.
+        """
+        animated = self.quality["animated"]
+        for kind in self.animations.advance(time.perf_counter()):
+            if kind not in animated:
+                continue
+            frame_index = self.animations.frame(kind)
+            store = self.animated_stores.get(kind)
+            if store is not None:
+                store.frame[: store.count] = frame_index
+            for sprite in self.animated_sprites(kind):
+                self.animations.queue(sprite, frame_index)
+        self.animations.flush()
+
+    def show_current_frame(self, kind, sprite, slot=None):
+        """
+        Queues the frame its kind currently shows for a newly placed sprite.
+
+        Args:
+            kind (str): The sprite kind.
+            sprite (Turtle): The sprite.
+            slot (int, optional): The sprite's slot in the world store of its kind.
+        """
+        frame_index = self.animations.frame(kind)
+        if slot is not None:
+            self.animated_stores[kind].frame[slot] = frame_index
+        self.animations.queue(sprite, frame_index)
+
+    def animated_sprites(self, kind):
+        """
+        Returns the sprites of a kind.
+
+        Args:
+            kind (str): "spaceship", "alien", "projectile" or "barrier".
+
+        Returns:
+            iterable: The sprites currently on screen for that kind.
+        """
+        if kind == "spaceship":
+            return self.spaceships
+        if kind == "alien":
+            return self.aliens.values()
+        if kind == "projectile":
+            return self.projectiles.values()
+        return self.barriers
 
     def update_background(self):
-        """Updates the background animation."""
-        frame_index = int(time.time() * 10) % len(self.background_frames)
-        self.screen.bgpic(self.background_frames[frame_index])
+        """Updates the background animation, unless the quality level froze it."""
+        if self.quality["background"]:
+            self.background.update(time.perf_counter())
@@ -1,32 +1,105 @@
-from turtle import Screen
-from game import Game
+import argparse
+import time
+from config import RENDERER, NET_PORT
 
 
-def main():
+def create_renderer(name):
     """
-    The main function to initialize and start the Turtle Invaders game.
+    Opens the game window with the chosen rendering backend.
+
+    Args:
+        name (str): "turtle" or "pygame".
+
+    Returns:
+        TurtleRenderer: The renderer (a `PygameRenderer` for "pygame").
     """
+    if name == "pygame":
+        from pygame_renderer import PygameRenderer
+
+        return PygameRenderer("Turtle Invaders")
+
+    from turtle import Screen
+    from renderer import TurtleRenderer
+
     # Set up the screen
     screen = Screen()
     screen.setup(width=800, height=600)
     screen.bgcolor("black")
     screen.title("Turtle Invaders")
     screen.tracer(0)
+    return TurtleRenderer(screen)
 
-    # Create the game instance
-    game = Game(screen)
 
-    # Set up key bindings
-    screen.listen()
-    screen.onkey(game.spaceship.move_left, "Left")
-    screen.onkey(game.spaceship.move_right, "Right")
-    screen.onkey(game.spaceship.shoot, "space")
+def create_link(args):
+    """
+    Opens the network link of a two-player game.
 
-    # Run the game
-    game.run()
+    Args:
+        args (Namespace): The parsed command line.
+
+    Returns:
+        HostLink: The link (a `ClientLink` with --join), or None for one player.
+    """
+    if args.host is None and args.join is None:
+        return None
+    from netplay import HostLink, ClientLink
 
-    # Keep the window open
-    screen.mainloop()
+    if args.host is not None:
+        return HostLink(args.host)
+    host, _, port = args.join.partition(":")
+    return ClientLink(host, int(port) if port else NET_PORT)
+
+
+def main():
+    """
+    The main function to initialize and start the Turtle Invaders game.
+    """
+    parser = argparse.ArgumentParser(description="Turtle Invaders")
+    parser.add_argument(
+        "--renderer",
+        choices=("turtle", "pygame"),
+        default=RENDERER,
+        help="the rendering backend (default: %(default)s)",
+    )
+    players = parser.add_mutually_exclusive_group()
+    players.add_argument(
+        "--host",
+        type=int,
+        nargs="?",
+        const=NET_PORT,
+        metavar="PORT",
+        help="host a two-player game on a UDP port (default: %(const)s)",
+    )
+    players.add_argument(
+        "--join",
+        metavar="HOST[:PORT]",
+        help="join a two-player game hosted on another machine",
+    )
+    players.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the single-player game kept in the save state",
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    # Imported here so the startup report includes the time the imports take
+    from game import Game
+    from profiler import StartupTimer
+
+    startup = StartupTimer(started)
+    startup.mark("import")
+
+    # Create the game instance (it also sets up the key bindings)
+    game = Game(
+        create_renderer(args.renderer),
+        startup,
+        link=create_link(args),
+        resume=args.resume,
+    )
+
+    # Run the game until the player quits
+    game.run()
 
 
 if __name__ == "__main__":
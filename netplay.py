@@ -0,0 +1,900 @@
+"""
+Two-player co-op over UDP for Turtle Invaders.
+
+The host runs the only simulation of the game. Each tick it sends the client
+a snapshot of what is needed to draw the world. A snapshot is a delta against
+the last snapshot the client acknowledged:
+- positions are fixed-point integers
+- alien and barrier state are bit fields
+- only the projectile fields that changed are sent
+
+The client sends its held keys every tick, along with the previous few in
+case a packet is lost. It moves its own ship immediately. When a snapshot
+arrives, it puts the ship back where the host says it is and replays the
+inputs the host has not applied yet.
+
+    python main.py --host            # host on NET_PORT (config.py)
+    python main.py --join 192.168.1.20:5000
+
+Running this module plays a host and a client against each other over
+loopback sockets without a display. It reports the bandwidth, the round-trip
+input latency and the prediction corrections:
+
+    python netplay.py --ticks 3000 --loss 0.05
+"""
+
+import argparse
+import collections
+import json
+import random
+import socket
+import struct
+import threading
+import time
+import numpy as np
+from world import World
+from config import TICK_RATE, NET_PORT
+
+MAGIC = b"TINV"
+SNAPSHOT = 1
+INPUT = 2
+# magic, type, tick, baseline tick (0 for none), last input applied, its send time
+SNAPSHOT_HEADER = struct.Struct("<4sBIIId")
+# magic, type, input sequence, last snapshot received, send time, number of inputs
+INPUT_HEADER = struct.Struct("<4sBIIdB")
+# score, level, resets, flags, formation direction and offset, speeds
+SCALARS = struct.Struct("<iHIBbiiff")
+EVENTS = (
+    "shoot",
+    "alien_hit",
+    "barrier_hit",
+    "alien_shoot",
+    "ship_destroyed",
+    "game_over",
+    "level_complete",
+)
+ACTION_BITS = {"left": 1, "right": 2, "shoot": 4}
+POSITION_SCALE = 4  # fixed-point steps per world unit
+HISTORY = 64  # snapshots kept on both sides as possible delta baselines
+INPUT_REDUNDANCY = 4  # inputs repeated in every input packet
+INPUT_BACKLOG = 3  # queued inputs the host tolerates before skipping ahead
+INPUT_JITTER = 1  # queued inputs kept to absorb jitter once the queue settles
+INPUT_DRAIN_TICKS = 30  # ticks the queue may stay deeper than that before draining
+STATS_WINDOW = 1000  # samples kept for the bandwidth and latency statistics
+MAX_PACKET = 65507
+
+
+class NetState:
+    """
+    The part of the world a client needs to draw it, in fixed-point form.
+
+    Attributes:
+        scalars (tuple): The values packed with `SCALARS`.
+        ships (ndarray): The x-coordinate of each ship, in fixed point.
+        aliens (ndarray): The alive flag of each alien slot.
+        projectiles (ndarray): One (x, y, direction) int16 row per projectile
+            slot; direction 0 marks a free slot.
+        barriers (ndarray): The occupancy bitmask of each barrier.
+    """
+
+    __slots__ = ("scalars", "ships", "aliens", "projectiles", "barriers")
+
+    def __init__(self, scalars, ships, aliens, projectiles, barriers):
+        """
+        Initializes the state from its fields.
+
+        Args:
+            scalars (tuple): The values packed with `SCALARS`.
+            ships (ndarray): The x-coordinate of each ship, in fixed point.
+            aliens (ndarray): The alive flag of each alien slot.
+            projectiles (ndarray): One (x, y, direction) row per projectile slot.
+            barriers (ndarray): The occupancy bitmask of each barrier.
+        """
+        self.scalars = scalars
+        self.ships = ships
+        self.aliens = aliens
+        self.projectiles = projectiles
+        self.barriers = barriers
+
+
+def fixed(values):
+    """
+    Converts world coordinates to fixed point.
+
+    Args:
+        values (ndarray): The coordinates.
+
+    Returns:
+        ndarray: The int16 fixed-point values.
+    """
+    return np.round(np.asarray(values) * POSITION_SCALE).astype(np.int16)
+
+
+def capture(world):
+    """
+    Takes the networked state of a world.
+
+    Args:
+        world (World): The host's world.
+
+    Returns:
+        NetState: The state.
+    """
+    flags = int(world.is_game_over) | int(world.is_level_complete) << 1
+    for player, ship in enumerate(world.ships):
+        flags |= int(ship.alive) << (2 + player)
+    formation = world.formation
+    scalars = (
+        world.score,
+        world.level,
+        world.resets,
+        flags,
+        formation.direction,
+        round(formation.offset_x * POSITION_SCALE),
+        round(formation.offset_y * POSITION_SCALE),
+        world.alien_speed,
+        world.projectile_speed,
+    )
+    store = world.projectiles
+    rows = np.zeros((store.count, 3), dtype=np.int16)
+    live = store.alive_slots()
+    rows[live, 0] = fixed(store.x[live])
+    rows[live, 1] = fixed(store.y[live])
+    rows[live, 2] = store.direction[live]
+    return NetState(
+        scalars,
+        fixed([ship.x for ship in world.ships]),
+        world.aliens.alive[: world.rows * world.columns].copy(),
+        rows,
+        world.barrier_masks.masks.copy(),
+    )
+
+
+def blank_state(world):
+    """
+    Returns the empty baseline that full snapshots are encoded against.
+
+    Args:
+        world (World): A world with the dimensions of the game.
+
+    Returns:
+        NetState: A state with no alien, projectile or barrier pixel.
+    """
+    return NetState(
+        None,
+        np.zeros(world.players, dtype=np.int16),
+        np.zeros(world.rows * world.columns, dtype=bool),
+        np.zeros((0, 3), dtype=np.int16),
+        np.zeros_like(world.barrier_masks.masks),
+    )
+
+
+def pad_rows(rows, count):
+    """
+    Truncates or zero-pads projectile rows to a number of slots.
+
+    Args:
+        rows (ndarray): The (slot, 3) projectile rows.
+        count (int): The number of slots wanted.
+
+    Returns:
+        ndarray: The (count, 3) rows.
+    """
+    if len(rows) >= count:
+        return rows[:count]
+    padded = np.zeros((count, 3), dtype=rows.dtype)
+    padded[: len(rows)] = rows
+    return padded
+
+
+def encode_state(state, base):
+    """
+    Encodes a state as a delta against a baseline.
+
+    Args:
+        state (NetState): The state to send.
+        base (NetState): The state the receiver already has.
+
+    Returns:
+        bytes: The encoded delta.
+    """
+    parts = [SCALARS.pack(*state.scalars), state.ships.tobytes()]
+    parts.append(np.packbits(state.aliens ^ base.aliens).tobytes())
+    rows = state.projectiles
+    base_rows = pad_rows(base.projectiles, len(rows))
+    parts.append(struct.pack("<H", len(rows)))
+    for column, dtype in ((0, np.int16), (1, np.int16), (2, np.int8)):
+        changed = rows[:, column] != base_rows[:, column]
+        parts.append(np.packbits(changed).tobytes())
+        parts.append(rows[changed, column].astype(dtype).tobytes())
+    changed = (state.barriers != base.barriers).any(axis=(1, 2))
+    parts.append(np.packbits(changed).tobytes())
+    for index in np.flatnonzero(changed):
+        parts.append(np.packbits(state.barriers[index]).tobytes())
+    return b"".join(parts)
+
+
+def decode_state(data, offset, base):
+    """
+    Decodes a delta produced by `encode_state`.
+
+    Args:
+        data (bytes): The packet.
+        offset (int): Where the encoded delta starts in the packet.
+        base (NetState): The baseline the delta was encoded against.
+
+    Returns:
+        NetState: The decoded state.
+    """
+    scalars = SCALARS.unpack_from(data, offset)
+    offset += SCALARS.size
+    ships = np.frombuffer(data, np.int16, len(base.ships), offset).copy()
+    offset += ships.nbytes
+    size = (len(base.aliens) + 7) // 8
+    flips = np.unpackbits(np.frombuffer(data, np.uint8, size, offset))
+    aliens = base.aliens ^ flips[: len(base.aliens)].astype(bool)
+    offset += size
+    (count,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    rows = pad_rows(base.projectiles, count).copy()
+    for column, dtype in ((0, np.int16), (1, np.int16), (2, np.int8)):
+        size = (count + 7) // 8
+        bits = np.unpackbits(np.frombuffer(data, np.uint8, size, offset))
+        changed = bits[:count].astype(bool)
+        offset += size
+        values = np.frombuffer(data, dtype, int(changed.sum()), offset)
+        rows[changed, column] = values
+        offset += values.nbytes
+    barriers = base.barriers.copy()
+    size = (len(barriers) + 7) // 8
+    changed = np.unpackbits(np.frombuffer(data, np.uint8, size, offset))
+    offset += size
+    shape = barriers.shape[1:]
+    size = (shape[0] * shape[1] + 7) // 8
+    for index in np.flatnonzero(changed[: len(barriers)]).tolist():
+        bits = np.unpackbits(np.frombuffer(data, np.uint8, size, offset))
+        barriers[index] = bits[: shape[0] * shape[1]].reshape(shape).astype(bool)
+        offset += size
+    return NetState(scalars, ships, aliens, rows, barriers)
+
+
+def apply_state(world, state):
+    """
+    Makes a client's mirror world show a state received from the host.
+
+    The game over is reported from the state rather than from the events of
+    the snapshot, which are only sent once and may be lost.
+
+    Args:
+        world (World): The client's world, which is never stepped.
+        state (NetState): The decoded state.
+
+    Returns:
+        list: "resync" if the host started another level or game, and
+            "game_over" if the game has just ended.
+    """
+    score, level, resets, flags, direction, offset_x, offset_y, alien, shot = (
+        state.scalars
+    )
+    events = []
+    if resets != world.resets:
+        world.level = level
+        world.reset_level()
+        world.resets = resets
+        events.append("resync")
+    world.score = score
+    world.level = level
+    if flags & 1 and not world.is_game_over:
+        events.append("game_over")
+    world.is_game_over = bool(flags & 1)
+    world.is_level_complete = bool(flags & 2)
+    world.alien_speed = alien
+    world.projectile_speed = shot
+    formation = world.formation
+    formation.direction = direction
+    formation.offset_x = offset_x / POSITION_SCALE
+    formation.offset_y = offset_y / POSITION_SCALE
+    count = len(state.aliens)
+    formation.kill(np.flatnonzero(world.aliens.alive[:count] & ~state.aliens))
+    for player, ship in enumerate(world.ships):
+        ship.x = state.ships[player] / POSITION_SCALE
+        ship.alive = bool(flags >> (2 + player) & 1)
+    rows = state.projectiles
+    live = np.flatnonzero(rows[:, 2])
+    world.projectiles.assign(
+        live,
+        rows[live, 0] / POSITION_SCALE,
+        rows[live, 1] / POSITION_SCALE,
+        rows[live, 2],
+    )
+    masks = world.barrier_masks
+    changed = np.flatnonzero((masks.masks != state.barriers).any(axis=(1, 2)))
+    for index in changed.tolist():
+        masks.masks[index] = state.barriers[index]
+        masks.versions[index] += 1
+        if not state.barriers[index].any():
+            world.barriers.kill((index,))
+    return events
+
+
+def percentiles(samples, scale=1.0):
+    """
+    Summarizes samples.
+
+    Args:
+        samples (iterable): The samples.
+        scale (float): A factor applied to every summary value.
+
+    Returns:
+        dict: The mean, p50, p95 and max, or an empty dict without samples.
+    """
+    values = np.fromiter(samples, dtype=float)
+    if not len(values):
+        return {}
+    p50, p95 = np.percentile(values, (50, 95)) * scale
+    return {
+        "mean": float(values.mean() * scale),
+        "p50": float(p50),
+        "p95": float(p95),
+        "max": float(values.max() * scale),
+    }
+
+
+def open_socket(address, port):
+    """
+    Opens a non-blocking UDP socket.
+
+    Args:
+        address (str): The local address to bind.
+        port (int): The local port to bind; 0 picks a free one.
+
+    Returns:
+        socket.socket: The socket.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind((address, port))
+    sock.setblocking(False)
+    return sock
+
+
+class HostLink:
+    """
+    The authoritative end of a networked game.
+
+    `step` replaces `World.step` for the host: it applies the client's queued
+    input as the second player, steps the world and sends the client the
+    resulting snapshot. Until a client has sent something, the second ship
+    stays still and no snapshot is sent. The first client to send an input
+    owns the session; input packets from any other address are ignored.
+
+    Attributes:
+        socket (socket.socket): The UDP socket.
+        peer (tuple): The client's address, or None before it connects.
+        tick (int): The number of snapshots taken.
+        sent (OrderedDict): Recent snapshots keyed by tick, as delta baselines.
+        acked (int): The newest tick the client acknowledged.
+        inputs (dict): Received (actions, send time) keyed by input sequence.
+        next_input (int): The sequence of the next input to apply.
+        held (tuple): The movement keys of the last applied input.
+        input_ack (int): The sequence of the last applied input.
+        echo (float): The client's send time of the last applied input.
+        snapshot_sizes (deque): The size of recent snapshots, in bytes.
+        full_sizes (deque): What the same snapshots would take without deltas.
+
+    Methods:
+        step(world, dt, inputs): Steps the world with both players' inputs.
+        stats(): Returns bandwidth statistics.
+        close(): Closes the socket.
+    """
+
+    authoritative = True
+
+    def __init__(self, port=NET_PORT, address="0.0.0.0", sock=None):
+        """
+        Opens the host's socket.
+
+        Args:
+            port (int): The UDP port to listen on.
+            address (str): The local address to bind.
+            sock (socket.socket, optional): A socket to use instead.
+        """
+        self.socket = sock or open_socket(address, port)
+        self.peer = None
+        self.tick = 0
+        self.sent = collections.OrderedDict()
+        self.acked = 0
+        self.inputs = {}
+        self.next_input = None
+        self.held = ()
+        self.deep_ticks = 0
+        self.input_ack = 0
+        self.echo = 0.0
+        self.blank = None
+        self.snapshot_sizes = collections.deque(maxlen=STATS_WINDOW)
+        self.full_sizes = collections.deque(maxlen=STATS_WINDOW)
+
+    def step(self, world, dt, inputs):
+        """
+        Steps the world with both players' inputs and sends the snapshot.
+
+        Args:
+            world (World): The two-player world.
+            dt (float): The simulated time to advance, in seconds.
+            inputs (iterable): The host player's actions.
+
+        Returns:
+            list: The events of the step.
+        """
+        self.receive()
+        events = world.step(dt, inputs, self.partner_inputs())
+        self.send_snapshot(world, events)
+        return events
+
+    def receive(self):
+        """Reads every pending input packet."""
+        while True:
+            try:
+                data, address = self.socket.recvfrom(MAX_PACKET)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if len(data) < INPUT_HEADER.size:
+                continue
+            magic, kind, seq, ack, sent, count = INPUT_HEADER.unpack_from(data)
+            if magic != MAGIC or kind != INPUT:
+                continue
+            if self.peer is None:
+                self.peer = address
+            elif address != self.peer:
+                continue
+            if ack in self.sent:
+                self.acked = max(self.acked, ack)
+            first = seq - count + 1
+            if self.next_input is None:
+                self.next_input = first
+            for index, bits in enumerate(data[INPUT_HEADER.size :][:count]):
+                if first + index >= self.next_input:
+                    actions = tuple(
+                        action for action, bit in ACTION_BITS.items() if bits & bit
+                    )
+                    self.inputs.setdefault(first + index, (actions, sent))
+
+    def partner_inputs(self):
+        """
+        Takes the client's input for this tick.
+
+        A late input repeats the held movement keys; lost inputs are skipped
+        and a backlog longer than `INPUT_BACKLOG` is dropped at once. A queue
+        that stays deeper than `INPUT_JITTER` for `INPUT_DRAIN_TICKS` ticks is
+        drained by taking two inputs a tick, keeping the shots of the skipped
+        one, so the queue only absorbs jitter instead of adding latency for
+        the rest of the game.
+
+        Returns:
+            tuple: The second player's actions.
+        """
+        pending = self.inputs
+        if self.next_input not in pending:
+            later = [seq for seq in pending if seq > self.next_input]
+            if not later:
+                return self.held
+            self.next_input = min(later)
+        newest = max(pending)
+        if newest - self.next_input > INPUT_BACKLOG:
+            self.next_input = min(
+                seq for seq in pending if seq >= newest - INPUT_BACKLOG
+            )
+        for seq in [seq for seq in pending if seq < self.next_input]:
+            del pending[seq]
+        if newest - self.next_input > INPUT_JITTER:
+            self.deep_ticks += 1
+        else:
+            self.deep_ticks = 0
+        skipped = ()
+        if self.deep_ticks > INPUT_DRAIN_TICKS and self.next_input + 1 in pending:
+            skipped, _ = pending.pop(self.next_input)
+            self.next_input += 1
+        actions, self.echo = pending.pop(self.next_input)
+        if "shoot" in skipped and "shoot" not in actions:
+            actions += ("shoot",)
+        self.input_ack = self.next_input
+        self.next_input += 1
+        self.held = tuple(action for action in actions if action != "shoot")
+        return actions
+
+    def send_snapshot(self, world, events):
+        """
+        Records the state of the world and sends it to the client.
+
+        Args:
+            world (World): The two-player world.
+            events (list): The events of the tick.
+        """
+        self.tick += 1
+        state = capture(world)
+        self.sent[self.tick] = state
+        while len(self.sent) > HISTORY:
+            self.sent.popitem(last=False)
+        if self.peer is None:
+            return
+        if self.blank is None:
+            self.blank = blank_state(world)
+        base_tick = self.acked if self.acked in self.sent else 0
+        base = self.sent[base_tick] if base_tick else self.blank
+        codes = bytes(EVENTS.index(event) for event in events if event in EVENTS)
+        delta = encode_state(state, base)
+        packet = b"".join(
+            (
+                SNAPSHOT_HEADER.pack(
+                    MAGIC, SNAPSHOT, self.tick, base_tick, self.input_ack, self.echo
+                ),
+                struct.pack("<B", len(codes)),
+                codes,
+                delta,
+            )
+        )
+        self.socket.sendto(packet, self.peer)
+        self.snapshot_sizes.append(len(packet))
+        full = (
+            len(delta) if base is self.blank else len(encode_state(state, self.blank))
+        )
+        self.full_sizes.append(len(packet) - len(delta) + full)
+
+    def stats(self):
+        """
+        Returns bandwidth statistics.
+
+        Returns:
+            dict: Snapshot sizes in bytes, with and without deltas.
+        """
+        return {
+            "snapshot_bytes": percentiles(self.snapshot_sizes),
+            "full_snapshot_bytes": percentiles(self.full_sizes),
+            "bytes_per_second": (
+                float(np.mean(self.snapshot_sizes)) * TICK_RATE
+                if self.snapshot_sizes
+                else 0.0
+            ),
+        }
+
+    def close(self):
+        """Closes the socket."""
+        self.socket.close()
+
+
+class ClientLink:
+    """
+    The predicting end of a networked game.
+
+    `step` replaces `World.step` for the client: it sends the held keys,
+    moves the client's ship right away, and applies the newest snapshot to
+    the mirror world, replaying the inputs the host has not applied yet.
+    Packets from any other address, and snapshots that do not decode, are
+    dropped like lost ones.
+
+    Attributes:
+        socket (socket.socket): The UDP socket.
+        host (tuple): The host's resolved (IP address, port).
+        player (int): The index of the client's ship.
+        seq (int): The sequence of the last input sent.
+        recent (deque): The action bits of the last inputs sent.
+        pending (deque): The (sequence, actions) not yet applied by the host.
+        received (OrderedDict): Recent snapshots keyed by tick, as delta baselines.
+        latest (int): The newest snapshot tick received.
+        snapshots (int): The number of snapshots received.
+        input_ack (int): The sequence of the last input the host applied.
+        latencies (deque): Round trips from sending an input to seeing it applied.
+        corrections (deque): How far each snapshot moved the predicted ship.
+        snapshot_sizes (deque): The size of received snapshots, in bytes.
+        input_sizes (deque): The size of sent input packets, in bytes.
+
+    Methods:
+        step(world, dt, inputs): Sends the inputs and syncs the mirror world.
+        stats(): Returns latency and bandwidth statistics.
+        close(): Closes the socket.
+    """
+
+    authoritative = False
+
+    def __init__(self, host, port=NET_PORT, player=1, sock=None):
+        """
+        Opens the client's socket.
+
+        Args:
+            host (str): The host's address.
+            port (int): The host's UDP port.
+            player (int): The index of the client's ship.
+            sock (socket.socket, optional): A socket to use instead.
+        """
+        self.socket = sock or open_socket("0.0.0.0", 0)
+        self.host = (socket.gethostbyname(host), port)
+        self.player = player
+        self.seq = 0
+        self.recent = collections.deque(maxlen=INPUT_REDUNDANCY)
+        self.pending = collections.deque()
+        self.received = collections.OrderedDict()
+        self.latest = 0
+        self.snapshots = 0
+        self.input_ack = 0
+        self.blank = None
+        self.latencies = collections.deque(maxlen=STATS_WINDOW)
+        self.corrections = collections.deque(maxlen=STATS_WINDOW)
+        self.snapshot_sizes = collections.deque(maxlen=STATS_WINDOW)
+        self.input_sizes = collections.deque(maxlen=STATS_WINDOW)
+
+    def step(self, world, dt, inputs):
+        """
+        Sends the inputs, predicts the client's ship and applies new snapshots.
+
+        Args:
+            world (World): The client's mirror of the two-player world.
+            dt (float): The duration of a tick, in seconds.
+            inputs (iterable): The client player's actions.
+
+        Returns:
+            list: The events of the snapshots received, plus "resync" when
+                the host started another level or game.
+        """
+        inputs = tuple(inputs)
+        self.seq += 1
+        self.send_input(inputs)
+        self.pending.append((self.seq, inputs))
+        if self.blank is None:
+            self.blank = blank_state(world)
+        self.predict(world, inputs, dt)
+        events, state = self.receive()
+        if state is None:
+            return events
+        ship = world.ships[self.player]
+        predicted = ship.x
+        events.extend(apply_state(world, state))
+        while self.pending and self.pending[0][0] <= self.input_ack:
+            self.pending.popleft()
+        for _, actions in self.pending:
+            self.predict(world, actions, dt)
+        self.corrections.append(abs(ship.x - predicted))
+        return events
+
+    def send_input(self, inputs):
+        """
+        Sends the latest inputs, repeating the previous few.
+
+        Args:
+            inputs (tuple): The actions of this tick.
+        """
+        self.recent.append(sum(ACTION_BITS[action] for action in set(inputs)))
+        packet = INPUT_HEADER.pack(
+            MAGIC,
+            INPUT,
+            self.seq,
+            self.latest,
+            time.perf_counter(),
+            len(self.recent),
+        ) + bytes(self.recent)
+        self.socket.sendto(packet, self.host)
+        self.input_sizes.append(len(packet))
+
+    def receive(self):
+        """
+        Reads every pending snapshot packet.
+
+        Returns:
+            tuple: The events of the snapshots read, and the newest state or None.
+        """
+        events = []
+        newest = None
+        while True:
+            try:
+                data, address = self.socket.recvfrom(MAX_PACKET)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if address != self.host or len(data) < SNAPSHOT_HEADER.size + 1:
+                continue
+            magic, kind, tick, base_tick, ack, echo = SNAPSHOT_HEADER.unpack_from(data)
+            if magic != MAGIC or kind != SNAPSHOT or tick <= self.latest:
+                continue
+            if base_tick and base_tick not in self.received:
+                continue
+            offset = SNAPSHOT_HEADER.size
+            count = data[offset]
+            codes = data[offset + 1 : offset + 1 + count]
+            base = self.received[base_tick] if base_tick else self.blank
+            try:
+                state = decode_state(data, offset + 1 + count, base)
+                # apply_state reports the game over, so a lost packet cannot hide it
+                tick_events = [
+                    EVENTS[code] for code in codes if EVENTS[code] != "game_over"
+                ]
+            except (struct.error, ValueError, IndexError):
+                continue  # truncated or corrupt
+            self.received[tick] = state
+            while len(self.received) > HISTORY:
+                self.received.popitem(last=False)
+            self.latest = tick
+            self.snapshots += 1
+            self.snapshot_sizes.append(len(data))
+            if ack > self.input_ack:
+                self.input_ack = ack
+                self.latencies.append(time.perf_counter() - echo)
+            events.extend(tick_events)
+            newest = state
+        return events, newest
+
+    def predict(self, world, actions, dt):
+        """
+        Moves the client's ship as the host will once it applies the actions.
+
+        Args:
+            world (World): The client's mirror world.
+            actions (tuple): The actions of one tick; shots are left to the host.
+            dt (float): The duration of a tick, in seconds.
+        """
+        for action in actions:
+            if action != "shoot":
+                world.apply_input(action, dt, [], self.player)
+
+    def stats(self):
+        """
+        Returns latency and bandwidth statistics.
+
+        Returns:
+            dict: Round trips in milliseconds, corrections in world units,
+                and packet sizes in bytes.
+        """
+        return {
+            "round_trip_ms": percentiles(self.latencies, 1000),
+            "prediction_correction": percentiles(self.corrections),
+            "snapshot_bytes": percentiles(self.snapshot_sizes),
+            "input_bytes": percentiles(self.input_sizes),
+            "snapshots_received": self.snapshots,
+        }
+
+    def close(self):
+        """Closes the socket."""
+        self.socket.close()
+
+
+class LossySocket:
+    """
+    A socket wrapper that drops a share of outgoing packets, for the harness.
+
+    Attributes:
+        socket (socket.socket): The wrapped socket.
+        loss (float): The probability of dropping each packet.
+        rng (random.Random): Decides which packets are dropped.
+        dropped (int): The number of packets dropped.
+    """
+
+    def __init__(self, sock, loss, rng):
+        """
+        Wraps a socket.
+
+        Args:
+            sock (socket.socket): The socket to wrap.
+            loss (float): The probability of dropping each packet.
+            rng (random.Random): Decides which packets are dropped.
+        """
+        self.socket = sock
+        self.loss = loss
+        self.rng = rng
+        self.dropped = 0
+
+    def sendto(self, data, address):
+        """
+        Sends a packet unless it is dropped.
+
+        Args:
+            data (bytes): The packet.
+            address (tuple): The destination.
+        """
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        self.socket.sendto(data, address)
+
+    def recvfrom(self, size):
+        """
+        Reads a packet.
+
+        Args:
+            size (int): The largest packet to read.
+
+        Returns:
+            tuple: The packet and the sender's address.
+        """
+        return self.socket.recvfrom(size)
+
+    def close(self):
+        """Closes the socket."""
+        self.socket.close()
+
+
+def paced(ticks, tick, stop):
+    """
+    Calls `tick` at TICK_RATE until `ticks` calls were made or `stop` is set.
+
+    Args:
+        ticks (int): The number of calls.
+        tick (callable): Called with the index of each tick.
+        stop (threading.Event): Ends the loop early when set.
+    """
+    dt = 1 / TICK_RATE
+    start = time.perf_counter()
+    for index in range(ticks):
+        if stop.is_set():
+            return
+        tick(index)
+        delay = start + (index + 1) * dt - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def loopback(ticks, loss=0.0, seed=0):
+    """
+    Plays a host and a client against each other over loopback sockets.
+
+    Both players sweep across the screen while firing; the host restarts the
+    game whenever it is lost and moves on whenever a level is cleared.
+
+    Args:
+        ticks (int): The number of ticks each side runs.
+        loss (float): The share of packets dropped in each direction.
+        seed (int): The seed of the host's world and of the packet loss.
+
+    Returns:
+        dict: The host's and the client's statistics.
+    """
+    host_socket = LossySocket(open_socket("127.0.0.1", 0), loss, random.Random(seed))
+    host = HostLink(sock=host_socket)
+    port = host_socket.socket.getsockname()[1]
+    client_socket = LossySocket(
+        open_socket("127.0.0.1", 0), loss, random.Random(seed + 1)
+    )
+    client = ClientLink("127.0.0.1", port, sock=client_socket)
+    host_world = World(random.Random(seed), players=2)
+    client_world = World(random.Random(seed), players=2)
+    dt = 1 / TICK_RATE
+    stop = threading.Event()
+
+    def policy(index, offset):
+        return ("left" if (index + offset) // TICK_RATE % 2 else "right", "shoot")
+
+    def host_tick(index):
+        events = host.step(host_world, dt, policy(index, 0))
+        if "level_complete" in events:
+            host_world.next_level()
+        elif host_world.is_game_over:
+            host_world.restart()
+
+    def client_tick(index):
+        client.step(client_world, dt, policy(index, TICK_RATE // 2))
+
+    thread = threading.Thread(target=paced, args=(ticks, host_tick, stop))
+    thread.start()
+    try:
+        paced(ticks, client_tick, stop)
+    finally:
+        stop.set()
+        thread.join()
+    host.close()
+    client.close()
+    return {
+        "ticks": ticks,
+        "loss": loss,
+        "host": host.stats(),
+        "client": client.stats(),
+        "packets_dropped": host_socket.dropped + client_socket.dropped,
+    }
+
+
+def main():
+    """Runs the loopback harness and prints its report as JSON."""
+    parser = argparse.ArgumentParser(description="Turtle Invaders netplay harness")
+    parser.add_argument("--ticks", type=int, default=1500)
+    parser.add_argument("--loss", type=float, default=0.0, help="packet loss rate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(loopback(args.ticks, args.loss, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
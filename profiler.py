@@ -0,0 +1,292 @@
+import json
+import time
+import numpy as np
+
+PHASES = (
+    "poll",
+    "inputs",
+    "move_aliens",
+    "move_projectiles",
+    "check_collisions",
+    "alien_shoot",
+    "handle_events",
+    "sync_sprites",
+    "update_animations",
+    "update_background",
+    "scoreboard",
+    "screen_update",
+)
+COUNTS = ("ticks", "aliens", "projectiles", "quality")
+STARTUP_PHASES = ("import", "setup", "decode", "register", "first_frame")
+
+
+class Profiler:
+    """
+    Low-overhead per-phase timing of the game loop, kept in a fixed-size ring buffer.
+
+    Each rendered frame is one row: the time spent in every phase (summed over
+    the ticks run for that frame) and a few entity counts. Code marks the end
+    of a phase with `mark`, which charges the time since the previous mark to
+    that phase, so instrumentation costs one clock read per phase. Callers
+    hold a reference only while profiling is enabled, so a disabled profiler
+    costs nothing.
+
+    Attributes:
+        enabled (bool): Whether frames are being recorded.
+        capacity (int): The number of frames kept.
+        durations (ndarray): Seconds per phase, one row per frame.
+        counts (ndarray): Entity counts, one row per frame.
+        starts (ndarray): The clock reading at the start of each frame.
+        frames (int): The total number of frames recorded.
+        open (bool): Whether a frame was begun and not yet ended.
+
+    Methods:
+        toggle(): Switches recording on or off.
+        begin_frame(): Starts a new row.
+        mark(phase): Charges the time since the previous mark to a phase.
+        end_frame(**counts): Stores entity counts for the current row.
+        report(): Returns p50/p95/p99 per phase, in milliseconds.
+        export_jsonl(path): Writes one JSON object per recorded frame.
+        export_chrome_trace(path): Writes the recorded frames in Chrome trace format.
+    """
+
+    def __init__(self, capacity=1024, enabled=False):
+        """
+        Initializes an empty profiler.
+
+        Args:
+            capacity (int): The number of frames kept in the ring buffer.
+            enabled (bool): Whether to start recording right away.
+        """
+        self.enabled = enabled
+        self.capacity = capacity
+        self.phase_index = {phase: index for index, phase in enumerate(PHASES)}
+        self.durations = np.zeros((capacity, len(PHASES)))
+        self.counts = np.zeros((capacity, len(COUNTS)), dtype=np.int64)
+        self.starts = np.zeros(capacity)
+        self.frames = 0
+        self.open = False
+        self.row = self.durations[0]
+        self.last = time.perf_counter()
+
+    def toggle(self):
+        """
+        Switches recording on or off.
+
+        Switching off in the middle of a frame drops that frame, so no
+        partial row ends up in the report.
+
+        Returns:
+            bool: Whether the profiler is now enabled.
+        """
+        self.enabled = not self.enabled
+        if not self.enabled and self.open:
+            self.frames -= 1
+            self.open = False
+        return self.enabled
+
+    def begin_frame(self):
+        """Starts a new row in the ring buffer."""
+        slot = self.frames % self.capacity
+        self.row = self.durations[slot]
+        self.row[:] = 0.0
+        self.counts[slot] = 0
+        self.last = self.starts[slot] = time.perf_counter()
+        self.frames += 1
+        self.open = True
+
+    def mark(self, phase):
+        """
+        Charges the time since the previous mark to a phase.
+
+        Args:
+            phase (str): One of `PHASES`.
+        """
+        now = time.perf_counter()
+        self.row[self.phase_index[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self, **counts):
+        """
+        Stores entity counts for the current row.
+
+        Args:
+            **counts (int): Values for the names in `COUNTS`.
+        """
+        row = self.counts[(self.frames - 1) % self.capacity]
+        for index, name in enumerate(COUNTS):
+            row[index] = counts.get(name, 0)
+        self.open = False
+
+    def recorded(self):
+        """
+        Returns the indices of the recorded rows, oldest first.
+
+        Returns:
+            ndarray: Row indices into the ring buffer.
+        """
+        if self.frames <= self.capacity:
+            return np.arange(self.frames)
+        start = self.frames % self.capacity
+        return (np.arange(self.capacity) + start) % self.capacity
+
+    def report(self):
+        """
+        Returns p50/p95/p99 per phase, in milliseconds.
+
+        Returns:
+            dict: Percentiles keyed by phase, plus the total frame time.
+        """
+        rows = self.recorded()
+        if not len(rows):
+            return {}
+        durations = self.durations[rows] * 1000
+        columns = {phase: durations[:, i] for i, phase in enumerate(PHASES)}
+        columns["frame"] = durations.sum(axis=1)
+        return {
+            name: {
+                f"p{q}": float(value)
+                for q, value in zip((50, 95, 99), np.percentile(column, (50, 95, 99)))
+            }
+            for name, column in columns.items()
+        }
+
+    def export_jsonl(self, path):
+        """
+        Writes one JSON object per recorded frame.
+
+        Args:
+            path (str): The file to write.
+        """
+        first = self.frames - len(self.recorded())
+        with open(path, "w") as file:
+            for number, row in enumerate(self.recorded(), start=first):
+                record = {
+                    "frame": number,
+                    "start": float(self.starts[row]),
+                    "phases_ms": {
+                        phase: float(self.durations[row, i] * 1000)
+                        for i, phase in enumerate(PHASES)
+                    },
+                    "counts": {
+                        name: int(self.counts[row, i]) for i, name in enumerate(COUNTS)
+                    },
+                }
+                file.write(json.dumps(record) + "\n")
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the recorded frames in Chrome trace format (chrome://tracing, Perfetto).
+
+        Phases are laid out back to back from the start of their frame, since
+        their time is summed over the ticks of that frame.
+
+        Args:
+            path (str): The file to write.
+        """
+        events = []
+        for row in self.recorded():
+            timestamp = self.starts[row] * 1e6
+            for i, phase in enumerate(PHASES):
+                duration = self.durations[row, i] * 1e6
+                if duration:
+                    events.append(
+                        {
+                            "name": phase,
+                            "ph": "X",
+                            "ts": timestamp,
+                            "dur": duration,
+                            "pid": 1,
+                            "tid": 1,
+                        }
+                    )
+                    timestamp += duration
+            events.append(
+                {
+                    "name": "counts",
+                    "ph": "C",
+                    "ts": self.starts[row] * 1e6,
+                    "pid": 1,
+                    "args": {
+                        name: int(self.counts[row, i]) for i, name in enumerate(COUNTS)
+                    },
+                }
+            )
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+class StartupTimer:
+    """
+    Wall-clock breakdown of the time from launch to the first rendered frame.
+
+    Like `Profiler.mark`, each mark charges the time since the previous one
+    to a phase, so a phase marked more than once accumulates. Asset decoding
+    runs on worker threads while the main thread sets up the window, so
+    "decode" is only the time the main thread still had to wait for it.
+
+    Attributes:
+        start (float): The clock reading at launch.
+        phases (dict): Seconds spent in each phase of `STARTUP_PHASES`.
+
+    Methods:
+        mark(phase): Charges the time since the previous mark to a phase.
+        report(): Returns the milliseconds spent in each phase and in total.
+        summary(): Returns the report as one line of text.
+        export_json(path): Writes the report as JSON.
+    """
+
+    def __init__(self, start=None):
+        """
+        Starts timing.
+
+        Args:
+            start (float, optional): The `time.perf_counter()` reading at launch,
+                if it was taken before this module could be imported.
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = dict.fromkeys(STARTUP_PHASES, 0.0)
+
+    def mark(self, phase):
+        """
+        Charges the time since the previous mark to a phase.
+
+        Args:
+            phase (str): One of `STARTUP_PHASES`.
+        """
+        now = time.perf_counter()
+        self.phases[phase] += now - self.last
+        self.last = now
+
+    def report(self):
+        """
+        Returns the milliseconds spent in each phase and in total.
+
+        Returns:
+            dict: Milliseconds keyed by phase, plus "total" up to the last mark.
+        """
+        report = {phase: seconds * 1000 for phase, seconds in self.phases.items()}
+        report["total"] = (self.last - self.start) * 1000
+        return report
+
+    def summary(self):
+        """
+        Returns the report as one line of text.
+
+        Returns:
+            str: The time of every phase, in milliseconds.
+        """
+        return "startup: " + ", ".join(
+            f"{phase} {ms:.1f} ms" for phase, ms in self.report().items()
+        )
+
+    def export_json(self, path):
+        """
+        Writes the report as JSON.
+
+        Args:
+            path (str): The file to write.
+        """
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=2)
@@ -1,10 +1,9 @@
 from turtle import Turtle
-from config import PROJECTILE_SPEED
 
 
 class Projectile(Turtle):
     """
-    A class to represent a projectile in the game.
+    A class to represent a projectile sprite in the game.
 
     Attributes:
         frames (list): List of image frames for projectile animation.
@@ -12,8 +11,8 @@ class Projectile(Turtle):
         direction (int): Direction of the projectile's movement (1 for up, -1 for down).
 
     Methods:
-        move(): Moves the projectile in the current direction.
-        update_animation(): Updates the projectile's animation frame.
+        launch(x, y, direction): Shows the projectile at a new position and direction.
+        set_frame(frame_index): Shows the given animation frame.
     """
 
     def __init__(self, x, y, direction=1, frames=[]):
@@ -37,16 +36,28 @@ class Projectile(Turtle):
         self.setheading(90 if direction == 1 else 270)
         self.direction = direction
 
-    def move(self):
+    def launch(self, x, y, direction=1):
         """
-        Moves the projectile forward in the current direction.
+        Shows the projectile at a new position and direction.
+
+        Args:
+            x (float): The x-coordinate of the projectile.
+            y (float): The y-coordinate of the projectile.
+            direction (int): Direction of the projectile's movement (1 for up, -1 for down).
         """
-        self.forward(PROJECTILE_SPEED)
+        self.goto(x, y)
+        if direction != self.direction:
+            self.setheading(90 if direction == 1 else 270)
+            self.direction = direction
+        self.showturtle()
 
-    def update_animation(self):
+    def set_frame(self, frame_index):
         """
-        Updates the projectile's animation frame.
+        Shows the given animation frame if it is not already displayed.
+
+        Args:
+            frame_index (int): Index of the frame to display.
         """
-        if self.frames:
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
-            self.shape(self.frames[self.frame_index])
+        if self.frames and frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.shape(self.frames[frame_index])
@@ -0,0 +1,110 @@
+class ProjectilePool:
+    """
+    A bounded pool of reusable projectile sprites.
+
+    Every projectile sprite owns a canvas item (or a place in the pygame
+    renderer's sprite group), so instead of creating a new sprite per shot and
+    only hiding it afterwards, the pool pre-allocates hidden sprites, hands
+    them out repositioned and takes them back when their projectile is gone.
+    The pool never holds more than `limit` sprites, so the number of canvas
+    items stays flat over a play session.
+
+    Attributes:
+        renderer (TurtleRenderer): The renderer creating the sprites.
+        frames (list): List of image frames for projectile animation.
+        limit (int): The maximum number of sprites the pool will ever create.
+        free (list): Hidden sprites ready to be handed out.
+        in_use (int): The number of sprites currently handed out.
+        hits (int): Acquisitions served by a pre-existing sprite.
+        misses (int): Acquisitions that had to create a sprite or found the pool exhausted.
+        peak (int): The highest number of sprites handed out at once.
+
+    Methods:
+        acquire(x, y, direction): Returns a visible sprite at the given position.
+        release(projectile): Hides a sprite and returns it to the pool.
+        stats(): Returns the pool counters.
+    """
+
+    def __init__(self, renderer, frames, size, limit):
+        """
+        Initializes the pool with pre-allocated hidden sprites.
+
+        Args:
+            renderer (TurtleRenderer): The renderer creating the sprites.
+            frames (list): List of image frames for projectile animation.
+            size (int): The number of sprites to create up front.
+            limit (int): The maximum number of sprites the pool will ever create.
+        """
+        self.renderer = renderer
+        self.frames = frames
+        self.limit = max(size, limit)
+        self.free = [self.create() for _ in range(size)]
+        self.created = size
+        self.in_use = 0
+        self.hits = 0
+        self.misses = 0
+        self.peak = 0
+
+    def create(self):
+        """
+        Creates a hidden projectile sprite.
+
+        Returns:
+            Projectile: The new sprite.
+        """
+        projectile = self.renderer.create_sprite("projectile", self.frames)
+        projectile.hideturtle()
+        return projectile
+
+    def acquire(self, x, y, direction=1):
+        """
+        Returns a visible sprite at the given position.
+
+        Args:
+            x (float): The x-coordinate of the projectile.
+            y (float): The y-coordinate of the projectile.
+            direction (int): Direction of the projectile's movement (1 for up, -1 for down).
+
+        Returns:
+            Projectile: The sprite, or None if the pool is exhausted.
+        """
+        if self.free:
+            projectile = self.free.pop()
+            self.hits += 1
+        elif self.created < self.limit:
+            projectile = self.create()
+            self.created += 1
+            self.misses += 1
+        else:
+            self.misses += 1
+            return None
+        projectile.launch(x, y, direction)
+        self.in_use += 1
+        self.peak = max(self.peak, self.in_use)
+        return projectile
+
+    def release(self, projectile):
+        """
+        Hides a sprite and returns it to the pool.
+
+        Args:
+            projectile (Projectile): A sprite previously handed out by `acquire`.
+        """
+        projectile.hideturtle()
+        self.free.append(projectile)
+        self.in_use -= 1
+
+    def stats(self):
+        """
+        Returns the pool counters.
+
+        Returns:
+            dict: The hits, misses, peak usage, sprites in use and sprites created.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "peak": self.peak,
+            "in_use": self.in_use,
+            "created": self.created,
+        }
@@ -0,0 +1,499 @@
+import pygame
+from controls import KEY_ACTIONS
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+FONT_NAME = "arial"
+FONT_SIZE = 24
+TITLE_FONT_SIZE = 36
+WHITE = (255, 255, 255)
+SPRITE_LAYER = 0
+TEXT_LAYER = 1
+
+
+def to_screen(x, y):
+    """
+    Converts turtle coordinates (origin at the centre, y up) to window pixels.
+
+    Args:
+        x (float): The turtle x-coordinate.
+        y (float): The turtle y-coordinate.
+
+    Returns:
+        tuple: The (x, y) pixel position in the window.
+    """
+    return (round(SCREEN_WIDTH / 2 + x), round(SCREEN_HEIGHT / 2 - y))
+
+
+class PygameSprite(pygame.sprite.DirtySprite):
+    """
+    A sprite drawn from pre-converted surfaces, with the turtle methods the game uses.
+
+    Every change only flags the sprite as dirty; the renderer's group then
+    repaints just the rectangles that changed when the frame is presented.
+
+    Attributes:
+        frames (list): The converted surfaces of the animation frames.
+        frame_index (int): Index of the frame being displayed.
+        x (float): The turtle x-coordinate of the sprite.
+        y (float): The turtle y-coordinate of the sprite.
+        mask (ndarray): The eroded occupancy bitmask, or None while intact.
+        eroded (dict): The frames eroded to the current mask, keyed by index.
+
+    Methods:
+        goto(x, y): Moves the sprite.
+        pos(): Returns the turtle position of the sprite.
+        set_frame(frame_index): Shows the given animation frame.
+        set_mask(mask, key): Shows the sprite eroded to a bitmask, or intact.
+        launch(x, y, direction): Shows the sprite at a new position.
+        hideturtle(): Hides the sprite.
+        showturtle(): Shows the sprite.
+    """
+
+    def __init__(self, frames, position, group):
+        """
+        Initializes the sprite and adds it to the renderer's group.
+
+        Args:
+            frames (list): The converted surfaces of the animation frames.
+            position (tuple): The initial (x, y) turtle position.
+            group (LayeredDirty): The group drawing the sprite.
+        """
+        super().__init__()
+        self.frames = frames
+        self.frame_index = 0
+        self.mask = None
+        self.eroded = {}
+        self.image = frames[0]
+        self.rect = self.image.get_rect()
+        self.goto(position)
+        group.add(self, layer=SPRITE_LAYER)
+
+    def goto(self, x, y=None):
+        """
+        Moves the sprite.
+
+        Args:
+            x (float or tuple): The x-coordinate, or an (x, y) position.
+            y (float, optional): The y-coordinate.
+        """
+        if y is None:
+            x, y = x
+        self.x, self.y = x, y
+        self.rect.center = to_screen(x, y)
+        self.dirty = 1
+
+    def pos(self):
+        """
+        Returns the turtle position of the sprite.
+
+        Returns:
+            tuple: The (x, y) position.
+        """
+        return (self.x, self.y)
+
+    def set_frame(self, frame_index):
+        """
+        Shows the given animation frame if it is not already displayed.
+
+        Args:
+            frame_index (int): Index of the frame to display.
+        """
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.image = self.frame(frame_index)
+            self.dirty = 1
+
+    def set_mask(self, mask, key=None):
+        """
+        Shows the sprite eroded to a bitmask, or intact again.
+
+        Args:
+            mask (ndarray): The sprite's occupancy bitmask, the size of a frame,
+                or None to show the intact frames.
+            key (tuple, optional): The (slot, version) of the mask; unused,
+                since eroded surfaces are not registered anywhere.
+        """
+        self.mask = mask
+        self.eroded = {}
+        self.image = self.frame(self.frame_index)
+        self.dirty = 1
+
+    def frame(self, frame_index):
+        """
+        Returns the surface of a frame, eroding it the first time it is needed.
+
+        Args:
+            frame_index (int): Index of the frame.
+
+        Returns:
+            Surface: The surface to draw.
+        """
+        if self.mask is None:
+            return self.frames[frame_index]
+        image = self.eroded.get(frame_index)
+        if image is None:
+            image = self.frames[frame_index].copy()
+            alpha = pygame.surfarray.pixels_alpha(image)
+            alpha[~self.mask.T] = 0
+            del alpha  # unlocks the surface
+            self.eroded[frame_index] = image
+        return image
+
+    def launch(self, x, y, direction=1):
+        """
+        Shows the sprite at a new position; image sprites are not rotated.
+
+        Args:
+            x (float): The x-coordinate of the sprite.
+            y (float): The y-coordinate of the sprite.
+            direction (int): Direction of movement (1 for up, -1 for down).
+        """
+        self.goto(x, y)
+        self.showturtle()
+
+    def hideturtle(self):
+        """Hides the sprite."""
+        self.visible = 0
+
+    def showturtle(self):
+        """Shows the sprite."""
+        self.visible = 1
+
+
+class TextSprite(pygame.sprite.DirtySprite):
+    """
+    A line of text, re-rendered only when it changes.
+
+    Attributes:
+        font (Font): The font of the text.
+        text (str): The text currently rendered.
+        anchor (str): The rect attribute placed at the position ("bottomleft", ...).
+        position (tuple): The window pixel position of the anchor.
+
+    Methods:
+        set_text(text): Changes the text.
+    """
+
+    def __init__(self, font, text, anchor, position, group):
+        """
+        Renders the text and adds it to the renderer's group.
+
+        Args:
+            font (Font): The font of the text.
+            text (str): The text to show.
+            anchor (str): The rect attribute placed at the position.
+            position (tuple): The (x, y) turtle position of the anchor.
+            group (LayeredDirty): The group drawing the text.
+        """
+        super().__init__()
+        self.font = font
+        self.anchor = anchor
+        self.position = to_screen(*position)
+        self.text = None
+        self.set_text(text)
+        group.add(self, layer=TEXT_LAYER)
+
+    def set_text(self, text):
+        """
+        Changes the text, rendering it only if it differs.
+
+        Args:
+            text (str): The text to show.
+        """
+        if text == self.text:
+            return
+        self.text = text
+        self.image = self.font.render(text, True, WHITE)
+        self.rect = self.image.get_rect(**{self.anchor: self.position})
+        self.dirty = 1
+
+
+class PygameScoreboard:
+    """
+    The scoreboard of the pygame renderer, with the interface of `Scoreboard`.
+
+    Attributes:
+        score (int): The current score of the player.
+        high_score (int): The highest score achieved by the player.
+        score_text (TextSprite): The current score.
+        high_score_text (TextSprite): The high score.
+        messages (list): The game over message lines.
+
+    Methods:
+        refresh(): Redraws the numbers whose displayed value is out of date.
+        increase_score(): Increases the current score by a fixed amount.
+        reset_score(): Resets the current score and updates the high score if needed.
+        update_high_score(): Raises the high score to the current score if it is higher.
+        show_game_over(): Displays the game over message.
+        reset_position(): Removes the game over message.
+    """
+
+    def __init__(self, high_score, group):
+        """
+        Creates the labels and values.
+
+        Args:
+            high_score (int): The best score recorded so far.
+            group (LayeredDirty): The group drawing the text.
+        """
+        self.score = 0
+        self.high_score = high_score
+        font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
+        title_font = pygame.font.SysFont(FONT_NAME, TITLE_FONT_SIZE)
+        TextSprite(font, "Score:", "bottomright", (-130, 260), group)
+        TextSprite(font, "High Score:", "bottomright", (120, 260), group)
+        self.score_text = TextSprite(font, "0", "bottomleft", (-120, 260), group)
+        self.high_score_text = TextSprite(font, "", "bottomleft", (130, 260), group)
+        self.messages = [
+            TextSprite(title_font, "GAME OVER", "midbottom", (0, 0), group),
+            TextSprite(
+                font,
+                "Press 'R' to Restart or 'Q' to Quit",
+                "midbottom",
+                (0, -40),
+                group,
+            ),
+        ]
+        self.reset_position()
+        self.refresh()
+
+    def refresh(self):
+        """Redraws the numbers whose value changed; called once per frame."""
+        self.score_text.set_text(str(self.score))
+        self.high_score_text.set_text(str(self.high_score))
+
+    def increase_score(self):
+        """Increases the current score by a fixed amount."""
+        self.score += 10
+
+    def reset_score(self):
+        """Resets the current score, keeping it as the high score if it is higher."""
+        self.update_high_score()
+        self.score = 0
+
+    def update_high_score(self):
+        """Raises the high score to the current score if it is higher."""
+        if self.score > self.high_score:
+            self.high_score = self.score
+
+    def show_game_over(self):
+        """Displays the game over message on the screen."""
+        for message in self.messages:
+            message.visible = 1
+
+    def reset_position(self):
+        """Removes the game over message, if it is shown."""
+        for message in self.messages:
+            message.visible = 0
+
+
+class PygameBackground:
+    """
+    The animated background of the pygame renderer.
+
+    Each frame is converted once into a window-sized surface. The renderer
+    only repaints the whole window on the renders where the frame changes.
+
+    Attributes:
+        renderer (PygameRenderer): The renderer drawing the background.
+        images (list): The window-sized background frames.
+        fps (float): Background frames per second.
+        frame_index (int): Index of the frame being displayed.
+
+    Methods:
+        update(now): Shows the frame due at the given time if it changed.
+    """
+
+    def __init__(self, renderer, frames, fps):
+        """
+        Converts the frames and shows the first one.
+
+        Args:
+            renderer (PygameRenderer): The renderer drawing the background.
+            frames (list): File paths of the background frames.
+            fps (float): Background frames per second; 0 keeps the first frame.
+        """
+        self.renderer = renderer
+        self.images = []
+        for frame in frames:
+            image = pygame.Surface(renderer.window.get_size()).convert()
+            image.fill((0, 0, 0))
+            picture = pygame.image.load(frame).convert()
+            image.blit(picture, picture.get_rect(center=image.get_rect().center))
+            self.images.append(image)
+        self.fps = fps
+        self.frame_index = 0
+        renderer.set_background(self.images[0])
+
+    def update(self, now):
+        """
+        Shows the frame due at the given time if it differs from the current one.
+
+        Args:
+            now (float): The current time, in seconds.
+        """
+        if self.fps <= 0 or len(self.images) < 2:
+            return
+        frame_index = int(now * self.fps) % len(self.images)
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.renderer.set_background(self.images[frame_index])
+
+
+class PygameRenderer:
+    """
+    Draws the game with pygame, repainting only the rectangles that changed.
+
+    Frames are loaded and converted to the window's pixel format once. Every
+    sprite lives in one `LayeredDirty` group, so presenting a frame blits only
+    the sprites that moved, changed frame or were hidden, restores the
+    background behind them, and pushes just those rectangles to the display.
+    Key events are read from the pygame event queue in `poll`.
+
+    Attributes:
+        window (Surface): The display surface.
+        sprites (LayeredDirty): Every sprite and text item.
+        surfaces (dict): The converted frame surfaces, keyed by file path.
+        controls (InputState): Receives the press and release of the game keys.
+        key_actions (dict): The game action of each pygame key code.
+        commands (dict): The callbacks of each pygame key code.
+
+    Methods:
+        register_frames(frames): Loads and converts frame images.
+        create_sprite(kind, frames, position): Returns a new sprite of a kind.
+        create_scoreboard(high_score): Returns the scoreboard.
+        create_background(frames, fps): Returns the background animator.
+        set_background(image): Shows a new background surface.
+        bind_keys(controls, commands): Routes key presses to the game.
+        poll(): Processes pending window events.
+        present(): Shows the frame that was just drawn.
+        close(): Closes the window.
+    """
+
+    def __init__(self, title="Turtle Invaders"):
+        """
+        Opens the window.
+
+        Args:
+            title (str): The window caption.
+        """
+        pygame.display.init()
+        pygame.font.init()
+        self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption(title)
+        self.window.fill((0, 0, 0))
+        pygame.display.flip()
+        self.sprites = pygame.sprite.LayeredDirty()
+        self.surfaces = {}
+        self.controls = None
+        self.key_actions = {}
+        self.commands = {}
+
+    def register_frames(self, frames):
+        """
+        Loads frame images and converts them to the window's pixel format.
+
+        Args:
+            frames (list): File paths of the frames.
+        """
+        for frame in frames:
+            if frame not in self.surfaces:
+                self.surfaces[frame] = pygame.image.load(frame).convert_alpha()
+
+    def create_sprite(self, kind, frames, position=(0, 0)):
+        """
+        Returns a new sprite of a kind.
+
+        Args:
+            kind (str): "spaceship", "alien", "projectile" or "barrier".
+            frames (list): File paths of the sprite's animation frames.
+            position (tuple): The initial (x, y) position of the sprite.
+
+        Returns:
+            PygameSprite: The sprite.
+        """
+        self.register_frames(frames)
+        surfaces = [self.surfaces[frame] for frame in frames]
+        return PygameSprite(surfaces, position, self.sprites)
+
+    def create_scoreboard(self, high_score):
+        """
+        Returns the scoreboard.
+
+        Args:
+            high_score (int): The best score recorded so far.
+
+        Returns:
+            PygameScoreboard: The scoreboard.
+        """
+        return PygameScoreboard(high_score, self.sprites)
+
+    def create_background(self, frames, fps):
+        """
+        Returns the background animator.
+
+        Args:
+            frames (list): File paths of the background frames.
+            fps (float): Background frames per second.
+
+        Returns:
+            PygameBackground: The animator.
+        """
+        return PygameBackground(self, frames, fps)
+
+    def set_background(self, image):
+        """
+        Shows a new background surface, repainting the whole window once.
+
+        Args:
+            image (Surface): A window-sized surface.
+        """
+        self.sprites.clear(self.window, image)
+        self.sprites.repaint_rect(self.window.get_rect())
+
+    def bind_keys(self, controls, commands):
+        """
+        Routes key presses to the game.
+
+        Args:
+            controls (InputState): Receives the press and release of the game keys.
+            commands (dict): Callbacks keyed by the Tk name of the key triggering them.
+        """
+        self.controls = controls
+        self.key_actions = {
+            pygame.key.key_code(key.lower()): action
+            for key, action in KEY_ACTIONS.items()
+        }
+        self.commands = {
+            pygame.key.key_code(key.lower()): command
+            for key, command in commands.items()
+        }
+
+    def poll(self):
+        """
+        Processes pending window events.
+
+        Closing the window runs the command bound to "q".
+        """
+        for event in pygame.event.get():
+            if event.type == pygame.KEYDOWN:
+                if event.key in self.key_actions:
+                    self.controls.press(self.key_actions[event.key])
+                elif event.key in self.commands:
+                    self.commands[event.key]()
+            elif event.type == pygame.KEYUP:
+                if event.key in self.key_actions:
+                    self.controls.release(self.key_actions[event.key])
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                if self.controls is not None:
+                    self.controls.release_all()
+            elif event.type == pygame.QUIT and pygame.K_q in self.commands:
+                self.commands[pygame.K_q]()
+
+    def present(self):
+        """Draws the sprites that changed and updates only their rectangles."""
+        pygame.display.update(self.sprites.draw(self.window))
+
+    def close(self):
+        """Closes the window."""
+        pygame.display.quit()
@@ -0,0 +1,157 @@
+import collections
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QualityGovernor:
+    """
+    Trades cosmetic work for frame time when the machine cannot keep up.
+
+    The game reports how long each frame took to simulate and draw, sleep
+    excluded. The governor smooths that cost and compares it with a budget:
+    when the smoothed cost stays over budget for `down_frames` frames it steps
+    down to the next, cheaper quality level, and when it stays under
+    `headroom` times the budget for `up_frames` frames it steps back up. The
+    upgrade window is much longer than the downgrade one, so a level that
+    could not be afforded is not retried at once.
+
+    Levels are dicts of settings (see `QUALITY_LEVELS` in config.py) that the
+    game applies; level 0 is the full quality.
+
+    Attributes:
+        levels (tuple): The settings of each quality level, best first.
+        budget (float): The target cost of a frame, in seconds.
+        headroom (float): The fraction of the budget below which quality may rise.
+        down_frames (int): Frames over budget before stepping down.
+        up_frames (int): Frames with headroom before stepping up.
+        smoothing (float): The weight of the newest frame in the smoothed cost.
+        level (int): The index of the current level.
+        cost (float): The smoothed frame cost, in seconds.
+        pressure (int): Consecutive frames over budget.
+        slack (int): Consecutive frames with headroom.
+        frames (int): The number of frames reported.
+        decisions (deque): The most recent level changes, oldest first.
+
+    Methods:
+        update(cost): Records the cost of a frame and returns whether the level changed.
+        settings(): Returns the settings of the current level.
+        status(): Returns the current level, cost and budget.
+    """
+
+    def __init__(
+        self,
+        levels,
+        budget,
+        headroom=0.6,
+        down_frames=30,
+        up_frames=250,
+        smoothing=0.1,
+        history=32,
+    ):
+        """
+        Initializes the governor at the full quality.
+
+        Args:
+            levels (tuple): The settings of each quality level, best first.
+            budget (float): The target cost of a frame, in seconds.
+            headroom (float): The fraction of the budget below which quality may rise.
+            down_frames (int): Frames over budget before stepping down.
+            up_frames (int): Frames with headroom before stepping up.
+            smoothing (float): The weight of the newest frame in the smoothed cost.
+            history (int): The number of level changes kept in `decisions`.
+        """
+        self.levels = levels
+        self.budget = budget
+        self.headroom = headroom
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.smoothing = smoothing
+        self.level = 0
+        self.cost = 0.0
+        self.pressure = 0
+        self.slack = 0
+        self.frames = 0
+        self.decisions = collections.deque(maxlen=history)
+
+    def update(self, cost):
+        """
+        Records the cost of a frame and changes level if needed.
+
+        Args:
+            cost (float): Seconds spent simulating and drawing the frame.
+
+        Returns:
+            bool: Whether the level changed.
+        """
+        self.frames += 1
+        self.cost += self.smoothing * (cost - self.cost)
+        if self.cost > self.budget:
+            self.pressure += 1
+            self.slack = 0
+        elif self.cost < self.budget * self.headroom:
+            self.slack += 1
+            self.pressure = 0
+        else:
+            self.pressure = self.slack = 0
+
+        if self.pressure >= self.down_frames and self.level < len(self.levels) - 1:
+            self.change_level(self.level + 1, "over budget")
+            return True
+        if self.slack >= self.up_frames and self.level > 0:
+            self.change_level(self.level - 1, "headroom")
+            return True
+        return False
+
+    def change_level(self, level, reason):
+        """
+        Moves to another level and records the decision.
+
+        Args:
+            level (int): The index of the new level.
+            reason (str): Why the level changed.
+        """
+        self.decisions.append(
+            {
+                "frame": self.frames,
+                "from": self.level,
+                "to": level,
+                "reason": reason,
+                "cost_ms": self.cost * 1000,
+            }
+        )
+        logger.info(
+            "Quality level %d -> %d (%s, %.1f ms per frame)",
+            self.level,
+            level,
+            reason,
+            self.cost * 1000,
+        )
+        self.level = level
+        self.pressure = self.slack = 0
+
+    def settings(self):
+        """
+        Returns the settings of the current level.
+
+        Returns:
+            dict: The settings the game should apply.
+        """
+        return self.levels[self.level]
+
+    def status(self):
+        """
+        Returns the current level, cost and budget.
+
+        Returns:
+            dict: The level, its settings, the smoothed cost and budget in
+                milliseconds, and the recent level changes.
+        """
+        return {
+            "level": self.level,
+            "levels": len(self.levels),
+            "settings": self.settings(),
+            "cost_ms": self.cost * 1000,
+            "budget_ms": self.budget * 1000,
+            "decisions": list(self.decisions),
+        }
@@ -0,0 +1,123 @@
+from spaceship import Spaceship
+from alien import Alien
+from barrier import Barrier
+from projectile import Projectile
+from scoreboard import Scoreboard
+from background import BackgroundAnimator
+
+
+class TurtleRenderer:
+    """
+    Draws the game with turtle and Tk.
+
+    `Game` only draws through a renderer: it asks it for sprites, the
+    scoreboard and the background, and calls `poll` and `present` once per
+    frame. Sprites returned by any renderer answer the turtle methods the
+    game uses (`goto`, `pos`, `hideturtle`, `showturtle`, `set_frame` and, for
+    projectiles, `launch`; for barriers, `set_mask`), so this renderer
+    simply hands out the turtle sprite classes. See `PygameRenderer` for the
+    alternative backend.
+
+    Attributes:
+        screen (Screen): The turtle screen where the game is displayed.
+
+    Methods:
+        register_frames(frames): Prepares frame images for use as sprite shapes.
+        create_sprite(kind, frames, position): Returns a new sprite of a kind.
+        create_scoreboard(high_score): Returns the scoreboard.
+        create_background(frames, fps): Returns the background animator.
+        bind_keys(controls, commands): Routes key presses to the game.
+        poll(): Processes pending window events.
+        present(): Shows the frame that was just drawn.
+        close(): Closes the window.
+    """
+
+    def __init__(self, screen):
+        """
+        Initializes the renderer for a configured screen.
+
+        Args:
+            screen (Screen): The turtle screen where the game is displayed.
+        """
+        self.screen = screen
+
+    def register_frames(self, frames):
+        """
+        Registers frame images as turtle shapes.
+
+        Args:
+            frames (list): File paths of the frames.
+        """
+        for frame in frames:
+            self.screen.register_shape(frame)
+
+    def create_sprite(self, kind, frames, position=(0, 0)):
+        """
+        Returns a new sprite of a kind.
+
+        Args:
+            kind (str): "spaceship", "alien", "projectile" or "barrier".
+            frames (list): File paths of the sprite's animation frames.
+            position (tuple): The initial (x, y) position of the sprite.
+
+        Returns:
+            Turtle: The sprite.
+        """
+        if kind == "spaceship":
+            return Spaceship(frames, position)
+        if kind == "alien":
+            alien = Alien(frames)
+            alien.goto(position)
+            return alien
+        if kind == "projectile":
+            return Projectile(*position, frames=frames)
+        return Barrier(position, frames)
+
+    def create_scoreboard(self, high_score):
+        """
+        Returns the scoreboard.
+
+        Args:
+            high_score (int): The best score recorded so far.
+
+        Returns:
+            Scoreboard: The scoreboard.
+        """
+        return Scoreboard(high_score)
+
+    def create_background(self, frames, fps):
+        """
+        Returns the background animator.
+
+        Args:
+            frames (list): File paths of the background frames.
+            fps (float): Background frames per second.
+
+        Returns:
+            BackgroundAnimator: The animator.
+        """
+        return BackgroundAnimator(self.screen, frames, fps)
+
+    def bind_keys(self, controls, commands):
+        """
+        Routes key presses to the game.
+
+        Args:
+            controls (InputState): Receives the press and release of the game keys.
+            commands (dict): Callbacks keyed by the Tk name of the key triggering them.
+        """
+        controls.bind(self.screen)
+        for key, command in commands.items():
+            self.screen.onkey(command, key)
+        self.screen.listen()
+
+    def poll(self):
+        """Does nothing: Tk dispatches key events while the screen updates."""
+
+    def present(self):
+        """Redraws the canvas."""
+        self.screen.update()
+
+    def close(self):
+        """Closes the window."""
+        self.screen.bye()
@@ -0,0 +1,220 @@
+"""
+Recording and headless replay of Turtle Invaders sessions.
+
+The game records the seed of its random number generator and every player
+action with the index of the simulation tick it was applied on, plus a
+state hash every few hundred ticks and the final score. Because the world
+only depends on the seed and those actions, a recording can be re-run
+without a display as fast as the CPU allows and checked against the hashes:
+
+    python replay.py last_session.replay
+    python replay.py last_session.replay --output replay.json
+
+The exit status is 1 if the replay diverged from the recording.
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+import time
+from world import World
+from config import TICK_RATE, REPLAY_CHECKPOINT_INTERVAL
+
+MAGIC = b"TIRP"
+VERSION = 5  # bumped whenever the simulation rules change
+HEADER = struct.Struct("<4sBHQ")  # magic, version, tick rate, seed
+RECORD = struct.Struct("<IB")  # tick index, record code
+SCORE = struct.Struct("<q")
+DIGEST_SIZE = 16  # bytes of the state hash kept per checkpoint
+ACTIONS = ("left", "right", "shoot", "restart")
+CHECKPOINT = len(ACTIONS)  # followed by a digest
+END = CHECKPOINT + 1  # followed by the final score and a digest
+
+
+def digest(world):
+    """
+    Returns the truncated state hash stored in recordings.
+
+    Args:
+        world (World): The world to hash.
+
+    Returns:
+        bytes: The first `DIGEST_SIZE` bytes of the state hash.
+    """
+    return bytes.fromhex(world.state_hash())[:DIGEST_SIZE]
+
+
+class InputRecorder:
+    """
+    Records the actions of a session, indexed by simulation tick.
+
+    Each action is a 5-byte record; a checkpoint adds the state hash every
+    `checkpoint_interval` ticks so a diverging replay can be located.
+
+    Attributes:
+        seed (int): The seed of the session's random number generator.
+        tick_rate (int): Simulation ticks per second.
+        checkpoint_interval (int): Ticks between two state hashes.
+        tick (int): The index of the next simulation tick.
+        data (bytearray): The encoded recording so far.
+
+    Methods:
+        record(action): Records an action applied before the next tick.
+        record_tick(inputs, world): Records the actions of a finished tick.
+        save(path, world): Writes the recording with the final score and hash.
+    """
+
+    def __init__(
+        self, seed, tick_rate=TICK_RATE, checkpoint_interval=REPLAY_CHECKPOINT_INTERVAL
+    ):
+        """
+        Starts an empty recording.
+
+        Args:
+            seed (int): The seed of the session's random number generator.
+            tick_rate (int): Simulation ticks per second.
+            checkpoint_interval (int): Ticks between two state hashes.
+        """
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.checkpoint_interval = checkpoint_interval
+        self.tick = 0
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, tick_rate, seed))
+
+    def record(self, action):
+        """
+        Records an action applied before the next tick.
+
+        Args:
+            action (str): One of `ACTIONS`.
+        """
+        self.data += RECORD.pack(self.tick, ACTIONS.index(action))
+
+    def record_tick(self, inputs, world):
+        """
+        Records the actions of the tick that just ran.
+
+        Args:
+            inputs (list): The actions applied on the tick.
+            world (World): The world after the tick and its events were handled.
+        """
+        for action in inputs:
+            self.record(action)
+        self.tick += 1
+        if self.tick % self.checkpoint_interval == 0:
+            self.data += RECORD.pack(self.tick, CHECKPOINT) + digest(world)
+
+    def save(self, path, world):
+        """
+        Writes the recording, ending with the final score and state hash.
+
+        Args:
+            path (str): The file to write.
+            world (World): The world at the end of the session.
+        """
+        data = self.data + RECORD.pack(self.tick, END)
+        data += SCORE.pack(world.score) + digest(world)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+
+def read_records(data):
+    """
+    Decodes the records of a recording.
+
+    Args:
+        data (bytes): The recording, without its header.
+
+    Yields:
+        tuple: (tick, code, payload) for every record.
+    """
+    offset = 0
+    while offset < len(data):
+        tick, code = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        size = {CHECKPOINT: DIGEST_SIZE, END: SCORE.size + DIGEST_SIZE}.get(code, 0)
+        yield tick, code, data[offset : offset + size]
+        offset += size
+
+
+def replay(path):
+    """
+    Re-runs a recorded session headless and checks it against the recording.
+
+    Args:
+        path (str): The recording to replay.
+
+    Returns:
+        dict: Tick counts, speed, scores and the ticks whose hash did not match.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, tick_rate, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} recording")
+
+    world = World(random.Random(seed))
+    dt = 1 / tick_rate
+    ticks = 0
+    pending = []
+    mismatches = []
+    checkpoints = 0
+    expected_score = None
+    start = time.perf_counter()
+    for tick, code, payload in read_records(data[HEADER.size :]):
+        while ticks < tick:
+            if "level_complete" in world.step(dt, pending):
+                world.next_level()
+            pending = []
+            ticks += 1
+        if code < CHECKPOINT:
+            if ACTIONS[code] == "restart":
+                world.restart()
+            else:
+                pending.append(ACTIONS[code])
+        elif code == CHECKPOINT:
+            checkpoints += 1
+            if digest(world) != payload:
+                mismatches.append(tick)
+        elif code == END:
+            (expected_score,) = SCORE.unpack_from(payload)
+            if digest(world) != payload[SCORE.size :]:
+                mismatches.append(tick)
+    elapsed = time.perf_counter() - start
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed else None,
+        "checkpoints": checkpoints,
+        "score": world.score,
+        "expected_score": expected_score,
+        "mismatched_ticks": mismatches,
+        "ok": not mismatches and world.score == expected_score,
+    }
+
+
+def main():
+    """Parses the command line, replays the recording and reports the result."""
+    parser = argparse.ArgumentParser(description="Replay a Turtle Invaders session")
+    parser.add_argument("recording", help="the .replay file to re-run")
+    parser.add_argument("--output", help="file to write the JSON result to")
+    args = parser.parse_args()
+
+    result = replay(args.recording)
+    report = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
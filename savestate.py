@@ -0,0 +1,336 @@
+import collections
+import struct
+import numpy as np
+
+MAGIC = b"TISV"
+VERSION = 2  # bumped whenever the layout or the simulation rules change
+# magic, version, alien rows, alien columns, players, barriers
+HEADER = struct.Struct("<4sBHHBB")
+# score, level, resets, game over, level complete, formation direction, time,
+# alien move timer, alien speed, projectile speed, formation offset,
+# next alien shot, number of scheduled shot times
+SCALARS = struct.Struct("<qHI??b6dHH")
+SHIP = struct.Struct("<?3d")  # alive, x, y, last shot time
+STORE = struct.Struct("<HH")  # slots used, free slots
+SHOOTERS = struct.Struct("<H")  # columns that still have a shooter
+RNG = struct.Struct("<?d")  # whether a Gaussian is cached, and its value
+RNG_WORDS = 625  # the Mersenne Twister state words plus the position
+
+
+class Reader:
+    """
+    Reads consecutive fields from a snapshot.
+
+    Attributes:
+        data (bytes): The snapshot.
+        offset (int): The position of the next field.
+
+    Methods:
+        unpack(layout): Reads a struct.
+        array(dtype, count): Reads an array.
+        bits(count): Reads packed booleans.
+    """
+
+    def __init__(self, data):
+        """
+        Starts reading at the beginning of a snapshot.
+
+        Args:
+            data (bytes): The snapshot.
+        """
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, layout):
+        """
+        Reads a struct.
+
+        Args:
+            layout (struct.Struct): The layout of the fields.
+
+        Returns:
+            tuple: The values.
+
+        Raises:
+            ValueError: If the snapshot ends before the struct.
+        """
+        try:
+            values = layout.unpack_from(self.data, self.offset)
+        except struct.error as error:
+            raise ValueError(f"truncated save state: {error}") from error
+        self.offset += layout.size
+        return values
+
+    def array(self, dtype, count):
+        """
+        Reads an array.
+
+        Args:
+            dtype (type): The NumPy type of the items.
+            count (int): The number of items.
+
+        Returns:
+            ndarray: A read-only view into the snapshot.
+        """
+        values = np.frombuffer(self.data, dtype, count, self.offset)
+        self.offset += values.nbytes
+        return values
+
+    def bits(self, count):
+        """
+        Reads packed booleans.
+
+        Args:
+            count (int): The number of booleans.
+
+        Returns:
+            ndarray: The booleans.
+        """
+        packed = self.array(np.uint8, (count + 7) // 8)
+        return np.unpackbits(packed, count=count).astype(bool)
+
+
+def pack_store(store):
+    """
+    Packs the live columns and the free list of an entity store.
+
+    Args:
+        store (EntityStore): The store.
+
+    Returns:
+        bytes: The packed store.
+    """
+    count = store.count
+    return b"".join(
+        (
+            STORE.pack(count, len(store.free_slots)),
+            np.packbits(store.alive[:count]).tobytes(),
+            store.x[:count].tobytes(),
+            store.y[:count].tobytes(),
+            store.direction[:count].tobytes(),
+            np.array(store.free_slots, dtype=np.uint16).tobytes(),
+        )
+    )
+
+
+def unpack_store(reader, store):
+    """
+    Restores an entity store packed by `pack_store`.
+
+    Every living entity is flagged dirty so the renderer redraws it.
+
+    Args:
+        reader (Reader): The snapshot being read.
+        store (EntityStore): The store to overwrite.
+    """
+    count, free = reader.unpack(STORE)
+    alive = reader.bits(count)
+    while len(store.x) < count:
+        store.grow()
+    store.alive[:] = False
+    store.alive[:count] = alive
+    store.x[:count] = reader.array(np.float64, count)
+    store.y[:count] = reader.array(np.float64, count)
+    store.direction[:count] = reader.array(np.int8, count)
+    store.free_slots = reader.array(np.uint16, free).tolist()
+    store.count = count
+    store.alive_count = int(alive.sum())
+    store.frame[:] = 0
+    store.dirty[:] = False
+    store.dirty[:count] = alive
+
+
+def save_state(world):
+    """
+    Packs the whole simulation state of a world into a compact snapshot.
+
+    Restoring the snapshot into a world with the same dimensions and
+    balancing parameters continues the game exactly, random numbers included.
+
+    Args:
+        world (World): The world to save.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    formation = world.formation
+    masks = world.barrier_masks.masks
+    _, words, gauss = world.rng.getstate()
+    times = world.alien_shot_times
+    parts = [
+        HEADER.pack(
+            MAGIC, VERSION, world.rows, world.columns, world.players, len(masks)
+        ),
+        SCALARS.pack(
+            world.score,
+            world.level,
+            world.resets,
+            world.is_game_over,
+            world.is_level_complete,
+            formation.direction,
+            world.time,
+            world.alien_move_timer,
+            world.alien_speed,
+            world.projectile_speed,
+            formation.offset_x,
+            formation.offset_y,
+            world.next_alien_shot,
+            len(times),
+        ),
+        np.array(times, dtype=np.float64).tobytes(),
+    ]
+    for ship, last_shot_time in zip(world.ships, world.last_shot_times):
+        parts.append(SHIP.pack(ship.alive, ship.x, ship.y, last_shot_time))
+    parts.append(np.packbits(world.aliens.alive[: formation.total]).tobytes())
+    parts.append(SHOOTERS.pack(len(formation.shooter_columns)))
+    parts.append(np.array(formation.shooter_columns, dtype=np.uint16).tobytes())
+    parts.append(pack_store(world.projectiles))
+    parts.append(np.packbits(world.barriers.alive[: len(masks)]).tobytes())
+    parts.append(np.packbits(masks).tobytes())
+    parts.append(np.array(words, dtype=np.uint32).tobytes())
+    parts.append(RNG.pack(gauss is not None, gauss or 0.0))
+    return b"".join(parts)
+
+
+def load_state(world, data):
+    """
+    Restores a snapshot made by `save_state`.
+
+    The formation and barriers keep their slots and positions, and only
+    their alive flags, masks and offsets are overwritten, so the sprites of
+    surviving aliens and barriers can be reused.
+
+    Args:
+        world (World): The world to overwrite.
+        data (bytes): The snapshot.
+
+    Raises:
+        ValueError: If the snapshot is not in this format or does not fit the world.
+    """
+    reader = Reader(data)
+    magic, version, rows, columns, players, barriers = reader.unpack(HEADER)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} save state")
+    masks = world.barrier_masks
+    if (rows, columns, players, barriers) != (
+        world.rows,
+        world.columns,
+        world.players,
+        len(masks.masks),
+    ):
+        raise ValueError("the save state was made for another game setup")
+    (
+        world.score,
+        world.level,
+        world.resets,
+        world.is_game_over,
+        world.is_level_complete,
+        direction,
+        world.time,
+        world.alien_move_timer,
+        world.alien_speed,
+        world.projectile_speed,
+        offset_x,
+        offset_y,
+        world.next_alien_shot,
+        scheduled,
+    ) = reader.unpack(SCALARS)
+    world.alien_shot_times = reader.array(np.float64, scheduled).tolist()
+    world.last_shot_times = []
+    for ship in world.ships:
+        ship.alive, ship.x, ship.y, last_shot_time = reader.unpack(SHIP)
+        world.last_shot_times.append(last_shot_time)
+
+    formation = world.formation
+    alive = reader.bits(formation.total)
+    (shooters,) = reader.unpack(SHOOTERS)
+    formation.restore(alive, reader.array(np.uint16, shooters).tolist())
+    formation.direction = direction
+    formation.offset_x = offset_x
+    formation.offset_y = offset_y
+
+    unpack_store(reader, world.projectiles)
+    alive = reader.bits(barriers)
+    world.barriers.alive[:barriers] = alive
+    world.barriers.free_slots = np.flatnonzero(~alive).tolist()
+    world.barriers.alive_count = int(alive.sum())
+    masks.masks = reader.bits(masks.masks.size).reshape(masks.masks.shape)
+    masks.versions += 1
+    words = reader.array(np.uint32, RNG_WORDS).tolist()
+    has_gauss, gauss = reader.unpack(RNG)
+    world.rng.setstate((3, tuple(words), gauss if has_gauss else None))
+
+
+class RewindBuffer:
+    """
+    A ring of recent snapshots for instant rewind.
+
+    `record` is called once per tick and keeps a snapshot every `interval`
+    ticks; the oldest snapshots are dropped once `capacity` are kept.
+
+    Attributes:
+        interval (int): Ticks between two snapshots.
+        snapshots (deque): The snapshots, oldest first.
+        ticks (int): Ticks recorded since the last snapshot.
+
+    Methods:
+        record(world): Counts a tick and takes a snapshot when one is due.
+        rewind(count): Drops the newest snapshots and returns the one before them.
+        clear(): Forgets every snapshot.
+    """
+
+    def __init__(self, capacity, interval):
+        """
+        Initializes an empty ring.
+
+        Args:
+            capacity (int): The most snapshots kept.
+            interval (int): Ticks between two snapshots.
+        """
+        self.interval = interval
+        self.snapshots = collections.deque(maxlen=capacity)
+        self.ticks = 0
+
+    def __len__(self):
+        """
+        Returns the number of snapshots kept.
+
+        Returns:
+            int: The number of snapshots.
+        """
+        return len(self.snapshots)
+
+    def record(self, world):
+        """
+        Counts a tick and takes a snapshot when one is due.
+
+        Args:
+            world (World): The world after the tick.
+        """
+        self.ticks += 1
+        if self.ticks >= self.interval:
+            self.ticks = 0
+            self.snapshots.append(save_state(world))
+
+    def rewind(self, count):
+        """
+        Drops up to `count` of the newest snapshots and returns the newest left.
+
+        The oldest snapshot is never dropped, so rewinding again and again
+        stops at the start of the ring.
+
+        Args:
+            count (int): The number of snapshots to go back.
+
+        Returns:
+            bytes: The snapshot to restore, or None if the ring is empty.
+        """
+        for _ in range(min(count, len(self.snapshots) - 1)):
+            self.snapshots.pop()
+        self.ticks = 0
+        return self.snapshots[-1] if self.snapshots else None
+
+    def clear(self):
+        """Forgets every snapshot."""
+        self.snapshots.clear()
+        self.ticks = 0
@@ -0,0 +1,193 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    duration REAL,
+    finished_at REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreStore:
+    """
+    A SQLite history of every finished run, written off the game thread.
+
+    `record_run` only puts the run on a queue; a background thread owns the
+    writing connection and inserts each run in its own transaction, so a crash
+    never leaves a half-written record and saving never blocks a frame. Reads
+    use a separate connection and are served by indexes on score and day.
+
+    Attributes:
+        path (str): The path of the SQLite database.
+        pending (Queue): Runs waiting to be written.
+        writer (Thread): The background thread writing the runs.
+
+    Methods:
+        record_run(score, level, duration): Queues a finished run for saving.
+        high_score(): Returns the best score ever recorded.
+        top(limit): Returns the best runs.
+        top_for_day(day, limit): Returns the best runs of a day.
+        flush(): Waits until every queued run is written.
+        close(): Writes the remaining runs and closes the store.
+    """
+
+    def __init__(self, path, legacy_high_score_path=None):
+        """
+        Opens (or creates) the store and starts the writer thread.
+
+        Args:
+            path (str): The path of the SQLite database.
+            legacy_high_score_path (str, optional): A high_score.txt file to
+                import as a run the first time the store is created.
+        """
+        self.path = path
+        self.reader = self.connect()
+        self.reader.executescript(SCHEMA)
+        self.import_legacy_high_score(legacy_high_score_path)
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_runs, daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        """
+        Opens a connection to the database.
+
+        Returns:
+            sqlite3.Connection: The connection, in WAL mode so reads never wait on writes.
+        """
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def import_legacy_high_score(self, legacy_path):
+        """
+        Imports the value of an old high_score.txt into an empty store.
+
+        Args:
+            legacy_path (str): The path of the legacy file, or None.
+        """
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        if self.reader.execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            return
+        try:
+            with open(legacy_path, "r") as file:
+                score = int(file.read())
+        except (OSError, ValueError):
+            return
+        with self.reader:
+            self.insert(self.reader, (score, None, None, time.time()))
+
+    def insert(self, connection, run):
+        """
+        Inserts a run.
+
+        Args:
+            connection (sqlite3.Connection): The connection to write with.
+            run (tuple): The (score, level, duration, finished_at) of the run.
+        """
+        score, level, duration, finished_at = run
+        day = time.strftime("%Y-%m-%d", time.localtime(finished_at))
+        connection.execute(
+            "INSERT INTO runs (score, level, duration, finished_at, day)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (score, level, duration, finished_at, day),
+        )
+
+    def write_runs(self):
+        """
+        Writes queued runs until `close` is called; runs on the writer thread.
+
+        A run that fails to insert is logged and dropped, so a locked or full
+        database never stops the thread from saving the runs after it.
+        """
+        connection = self.connect()
+        while True:
+            run = self.pending.get()
+            try:
+                if run is None:
+                    break
+                with connection:
+                    self.insert(connection, run)
+            except sqlite3.Error as error:
+                logger.warning("Could not save the run %s: %s", run, error)
+            finally:
+                self.pending.task_done()
+        connection.close()
+
+    def record_run(self, score, level, duration):
+        """
+        Queues a finished run for saving without blocking.
+
+        Args:
+            score (int): The final score.
+            level (int): The level reached.
+            duration (float): How long the run lasted, in seconds.
+        """
+        self.pending.put((score, level, duration, time.time()))
+
+    def high_score(self):
+        """
+        Returns the best score ever recorded.
+
+        Returns:
+            int: The best score, or 0 if no run was recorded.
+        """
+        row = self.reader.execute("SELECT MAX(score) FROM runs").fetchone()
+        return row[0] or 0
+
+    def top(self, limit=10):
+        """
+        Returns the best runs.
+
+        Args:
+            limit (int): The number of runs to return.
+
+        Returns:
+            list: (score, level, duration, finished_at) tuples, best first.
+        """
+        return self.reader.execute(
+            "SELECT score, level, duration, finished_at FROM runs"
+            " ORDER BY score DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def top_for_day(self, day, limit=10):
+        """
+        Returns the best runs of a day.
+
+        Args:
+            day (str): The local date, as "YYYY-MM-DD".
+            limit (int): The number of runs to return.
+
+        Returns:
+            list: (score, level, duration, finished_at) tuples, best first.
+        """
+        return self.reader.execute(
+            "SELECT score, level, duration, finished_at FROM runs"
+            " WHERE day = ? ORDER BY score DESC LIMIT ?",
+            (day, limit),
+        ).fetchall()
+
+    def flush(self):
+        """Waits until every queued run is written."""
+        self.pending.join()
+
+    def close(self):
+        """Writes the remaining runs and closes the store."""
+        self.pending.put(None)
+        self.writer.join()
+        self.reader.close()
@@ -1,106 +1,139 @@
 from turtle import Turtle
-import os
+
+FONT = ("Arial", 24, "normal")
 
 
 class Scoreboard(Turtle):
     """
     A class to represent the scoreboard in the game.
 
+    The static labels are written once by the scoreboard itself, while each
+    number and the game over message are separate text items owned by their
+    own writer turtles. Score changes only update the values; `refresh` redraws
+    a number at most once per frame, and only if the displayed value differs.
+
     Attributes:
         score (int): The current score of the player.
         high_score (int): The highest score achieved by the player.
         initial_position (tuple): The initial position of the scoreboard on the screen.
+        score_text (Turtle): The writer of the current score.
+        high_score_text (Turtle): The writer of the high score.
+        message (Turtle): The writer of the game over message.
+        displayed (dict): The values currently drawn, keyed by writer.
+        game_over_shown (bool): Whether the game over message is on screen.
 
     Methods:
-        update_scoreboard(): Updates the scoreboard display with the current score and high score.
+        refresh(): Redraws the numbers whose displayed value is out of date.
         increase_score(): Increases the current score by a fixed amount.
         reset_score(): Resets the current score and updates the high score if needed.
-        save_high_score(): Saves the high score to a file.
-        load_high_score(): Loads the high score from a file.
+        update_high_score(): Raises the high score to the current score if it is higher.
         show_game_over(): Displays the game over message.
-        reset_position(): Resets the scoreboard to its initial position.
+        reset_position(): Removes the game over message.
     """
 
-    def __init__(self):
+    def __init__(self, high_score=0):
         """
-        Initializes the scoreboard with default values and loads the high score.
+        Initializes the scoreboard with default values.
+
+        Args:
+            high_score (int): The best score recorded so far.
         """
         super().__init__()
         self.score = 0
-        self.high_score = self.load_high_score()
+        self.high_score = high_score
         self.color("white")
         self.penup()
         self.hideturtle()
         self.initial_position = (0, 260)
-        self.goto(self.initial_position)
-        self.update_scoreboard()
+        x, y = self.initial_position
+        self.goto(x - 130, y)
+        self.write("Score:", align="right", font=FONT)
+        self.goto(x + 120, y)
+        self.write("High Score:", align="right", font=FONT)
+        self.score_text = self.create_writer((x - 120, y))
+        self.high_score_text = self.create_writer((x + 130, y))
+        self.message = self.create_writer((0, 0))
+        self.displayed = {}
+        self.game_over_shown = False
+        self.refresh()
 
-    def update_scoreboard(self):
+    def create_writer(self, position):
         """
-        Updates the scoreboard display with the current score and high score.
+        Creates a hidden turtle that owns one text item.
+
+        Args:
+            position (tuple): The (x, y) position of the text.
+
+        Returns:
+            Turtle: The writer turtle.
+        """
+        writer = Turtle()
+        writer.color("white")
+        writer.penup()
+        writer.hideturtle()
+        writer.goto(position)
+        return writer
+
+    def draw_value(self, writer, value):
         """
-        self.clear()
-        self.write(
-            f"Score: {self.score}  High Score: {self.high_score}",
-            align="center",
-            font=("Arial", 24, "normal"),
-        )
+        Redraws a number if it differs from the one displayed.
+
+        Args:
+            writer (Turtle): The writer owning the number's text item.
+            value (int): The value to display.
+        """
+        if self.displayed.get(writer) != value:
+            writer.clear()
+            writer.write(str(value), align="left", font=FONT)
+            self.displayed[writer] = value
+
+    def refresh(self):
+        """
+        Redraws the numbers whose displayed value is out of date; called once per frame.
+        """
+        self.draw_value(self.score_text, self.score)
+        self.draw_value(self.high_score_text, self.high_score)
 
     def increase_score(self):
         """
-        Increases the current score by a fixed amount and updates the scoreboard.
+        Increases the current score by a fixed amount; it is drawn on the next refresh.
         """
         self.score += 10
-        self.update_scoreboard()
 
     def reset_score(self):
         """
         Resets the current score and updates the high score if the current score is higher.
         """
-        if self.score > self.high_score:
-            self.high_score = self.score
-            self.save_high_score()
+        self.update_high_score()
         self.score = 0
-        self.update_scoreboard()
 
-    def save_high_score(self):
+    def update_high_score(self):
         """
-        Saves the high score to a file if the current score is higher.
+        Raises the high score to the current score if it is higher.
         """
         if self.score > self.high_score:
             self.high_score = self.score
-            with open("high_score.txt", "w") as file:
-                file.write(str(self.high_score))
-
-    def load_high_score(self):
-        """
-        Loads the high score from a file.
-
-        Returns:
-            int: The high score loaded from the file, or 0 if the file does not exist.
-        """
-        if os.path.exists("high_score.txt"):
-            with open("high_score.txt", "r") as file:
-                return int(file.read())
-        return 0
 
     def show_game_over(self):
         """
         Displays the game over message on the screen.
         """
-        self.goto(0, 0)
-        self.write("GAME OVER", align="center", font=("Arial", 36, "normal"))
-        self.goto(0, -40)
-        self.write(
+        if self.game_over_shown:
+            return
+        self.message.goto(0, 0)
+        self.message.write("GAME OVER", align="center", font=("Arial", 36, "normal"))
+        self.message.goto(0, -40)
+        self.message.write(
             "Press 'R' to Restart or 'Q' to Quit",
             align="center",
-            font=("Arial", 24, "normal"),
+            font=FONT,
         )
+        self.game_over_shown = True
 
     def reset_position(self):
         """
-        Resets the scoreboard to its initial position and updates the display.
+        Removes the game over message, if it is shown.
         """
-        self.clear()
-        self.goto(self.initial_position)
-        self.update_scoreboard()
+        if self.game_over_shown:
+            self.message.clear()
+            self.game_over_shown = False
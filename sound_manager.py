@@ -1,40 +1,98 @@
-import pygame
+import logging
+import time
+from config import SOUND_CHANNELS, SOUND_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTINGS = {"priority": 1, "max_voices": 2, "min_interval": 0.05, "loops": 0}
+
+
+class NullSound:
+    """
+    A silent stand-in for `pygame.mixer.Sound`, used when no audio device is available.
+    """
+
+    def set_volume(self, volume):
+        """
+        Ignores the volume.
+
+        Parameters:
+        - volume (float): The volume level of the sound.
+        """
 
 
 class SoundManager:
     """
     A class that manages sound effects for a game.
 
+    Sounds play on a pool of reserved mixer channels. Each sound has a priority,
+    a maximum number of simultaneous voices and a minimum re-trigger interval
+    (see `SOUND_SETTINGS` in config.py), so heavy firing cannot exhaust the
+    mixer: extra triggers are dropped, a sound over its voice limit restarts
+    its oldest voice, and when every channel is busy the lowest-priority voice
+    is stolen. If the mixer cannot be initialized, the manager falls back to a
+    silent null backend so the game still runs without audio.
+
+    pygame is imported by the constructor rather than at module level, so the
+    manager can be created and its sounds decoded on a worker thread while the
+    window is being set up.
+
     Attributes:
     - sounds (dict): A dictionary that stores the loaded sound effects.
+    - settings (dict): The playback settings of each loaded sound.
+    - channels (list): The reserved mixer channels (empty with the null backend).
+    - voice_limit (int): How many of the channels new sounds may start on.
+    - voices (list): The (name, priority, start time) playing on each channel, or None.
+    - last_played (dict): The time each sound was last triggered.
+    - warned (set): The names already reported as not loaded.
+    - headless (bool): Whether the silent null backend is in use.
 
     Methods:
     - __init__(): Initializes the SoundManager object.
     - load_sound(name, sound_path, volume=0.5): Loads a sound file and stores it in the sound manager.
-    - play_sound(name): Plays the sound with the given name.
+    - play_sound(name): Plays the sound with the given name, within its voice limits.
+    - close(): Shuts the mixer down.
     """
 
-    def __init__(self):
+    def __init__(self, channels=SOUND_CHANNELS):
         """
         Initializes the SoundManager object.
 
-        This method initializes the SoundManager object by initializing the mixer module
-        with the specified frequency, size, channels, and buffer. It also initializes
-        an empty dictionary to store the sounds.
+        This method initializes the mixer module with the specified frequency,
+        size, channels, and buffer, and reserves a pool of channels for the game.
+        If the mixer cannot be initialized, the silent null backend is used.
 
         Parameters:
-            None
+        - channels (int): The number of mixer channels to reserve.
 
         Returns:
             None
         """
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
         self.sounds = {}
+        self.settings = {}
+        self.last_played = {}
+        self.warned = set()
+        import pygame
+
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            pygame.mixer.set_num_channels(channels)
+            pygame.mixer.set_reserved(channels)
+            self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+            self.headless = False
+        except pygame.error as error:
+            logger.warning("Audio unavailable, sounds are disabled: %s", error)
+            self.channels = []
+            self.headless = True
+        self.voices = [None] * len(self.channels)
+        self.voice_limit = len(self.channels)
 
     def load_sound(self, name, sound_path, volume=0.5):
         """
         Load a sound file and store it in the sound manager.
 
+        Several sounds may be loaded at once from worker threads.
+
         Parameters:
         - name (str): The name to associate with the loaded sound.
         - sound_path (str): The path to the sound file.
@@ -43,21 +101,99 @@ class SoundManager:
         Returns:
         None
         """
-        sound = pygame.mixer.Sound(sound_path)
+        import pygame
+
+        if self.headless:
+            sound = NullSound()
+        else:
+            try:
+                sound = pygame.mixer.Sound(sound_path)
+            except (pygame.error, FileNotFoundError) as error:
+                logger.warning("Could not load sound '%s': %s", name, error)
+                self.warned.add(name)
+                return
         sound.set_volume(volume)
         self.sounds[name] = sound
+        self.settings[name] = {**DEFAULT_SETTINGS, **SOUND_SETTINGS.get(name, {})}
 
     def play_sound(self, name):
         """
-        Plays the sound with the given name.
+        Plays the sound with the given name, within its voice limits.
+
+        Unknown names are reported once and then ignored.
 
         Parameters:
         - name (str): The name of the sound to be played.
 
         Returns:
-        None
+        bool: Whether the sound started playing.
         """
-        if name in self.sounds:
-            self.sounds[name].play()
-        else:
-            print(f"Sound '{name}' not loaded.")
+        sound = self.sounds.get(name)
+        if sound is None:
+            if name not in self.warned:
+                self.warned.add(name)
+                logger.warning("Sound '%s' not loaded.", name)
+            return False
+        if not self.channels:
+            return False
+
+        settings = self.settings[name]
+        now = time.perf_counter()
+        if now - self.last_played.get(name, float("-inf")) < settings["min_interval"]:
+            return False
+
+        index = self.pick_channel(name, settings)
+        if index is None:
+            return False
+        self.channels[index].play(sound, loops=settings["loops"])
+        self.voices[index] = (name, settings["priority"], now)
+        self.last_played[name] = now
+        return True
+
+    def pick_channel(self, name, settings):
+        """
+        Chooses the channel a sound should play on.
+
+        Only the first `voice_limit` channels are considered, so lowering the
+        limit caps the number of simultaneous sounds.
+
+        Parameters:
+        - name (str): The name of the sound.
+        - settings (dict): The playback settings of the sound.
+
+        Returns:
+        int: The index of the channel to use, or None to drop the sound.
+        """
+        own_voices = []
+        free = None
+        victim = None
+        for index, channel in enumerate(self.channels[: self.voice_limit]):
+            voice = self.voices[index]
+            if voice is None or not channel.get_busy():
+                self.voices[index] = None
+                if free is None:
+                    free = index
+                continue
+            if voice[0] == name:
+                own_voices.append(index)
+            if voice[1] < settings["priority"] and (
+                victim is None or voice[1:] < self.voices[victim][1:]
+            ):
+                victim = index
+
+        if len(own_voices) >= settings["max_voices"]:
+            return min(own_voices, key=lambda index: self.voices[index][2])
+        if free is not None:
+            return free
+        return victim
+
+    def close(self):
+        """
+        Shuts the mixer down and releases pygame.
+
+        Returns:
+            None
+        """
+        import pygame
+
+        pygame.quit()
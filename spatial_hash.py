@@ -0,0 +1,171 @@
+import itertools
+import numpy as np
+
+# Offset and stride used to pack a (column, row) cell into a single int64 key
+CELL_OFFSET = 1 << 20
+CELL_STRIDE = 1 << 21
+# Key deltas of a cell and its eight neighbours
+NEIGHBOUR_DELTAS = [dc * CELL_STRIDE + dr for dc in (-1, 0, 1) for dr in (-1, 0, 1)]
+# The same deltas as a column for broadcasting
+NEIGHBOUR_OFFSETS = np.array(NEIGHBOUR_DELTAS, dtype=np.int64)[:, None]
+
+
+class SpatialHash:
+    """
+    A uniform grid that buckets entity slots by position for broadphase collision checks.
+
+    The grid is stored as slots sorted by their packed cell key, so building it
+    is a single argsort and looking up the slots of many cells at once is a
+    pair of `searchsorted` calls. A query only looks at the cell containing a
+    point and its eight neighbours, so as long as the collision radius is not
+    larger than `cell_size`, every slot that can collide with the point is
+    returned.
+
+    Batched lookups only pay off for many queries: on a few dozen points the
+    fixed cost of each NumPy call dominates. `query` looks up one point in a
+    dict of Python lists instead, built from the sorted arrays the first time
+    it is needed, and returns exactly the stored slots `candidate_pairs` pairs
+    with that point.
+
+    Attributes:
+        cell_size (float): The width and height of a grid cell.
+        keys (ndarray): The sorted cell keys of the stored slots.
+        slots (ndarray): The stored slots, parallel to `keys`.
+        buckets (dict): The stored slots keyed by cell key, or None until `query` needs them.
+        bounds (tuple): The lowest and highest occupied column and row, as
+            (column_low, column_high, row_low, row_high), kept with `buckets`.
+
+    Methods:
+        clear(): Removes every slot from the grid.
+        build(store, slots): Replaces the grid contents with the given slots.
+        candidate_pairs(store, slots, offset): Returns the (query, stored) slot pairs sharing a neighbourhood.
+        query(x, y): Returns the stored slots in the neighbourhood of a point.
+    """
+
+    def __init__(self, cell_size):
+        """
+        Initializes an empty grid.
+
+        Args:
+            cell_size (float): The width and height of a grid cell.
+        """
+        self.cell_size = cell_size
+        self.clear()
+
+    def cells(self, store, slots, offset=(0.0, 0.0)):
+        """
+        Returns the cell coordinates of the given slots.
+
+        Args:
+            store (EntityStore): The store holding the positions.
+            slots (ndarray): The slots to locate.
+            offset (tuple): An (x, y) translation applied to the positions first.
+
+        Returns:
+            tuple: The (columns, rows) arrays of the cells.
+        """
+        x = store.x[slots] + offset[0]
+        y = store.y[slots] + offset[1]
+        columns = np.floor_divide(x, self.cell_size).astype(np.int64)
+        rows = np.floor_divide(y, self.cell_size).astype(np.int64)
+        return columns, rows
+
+    def clear(self):
+        """Removes every slot from the grid."""
+        self.keys = np.empty(0, dtype=np.int64)
+        self.slots = np.empty(0, dtype=np.intp)
+        self.buckets = {}
+        self.bounds = (0, -1, 0, -1)
+
+    def build(self, store, slots):
+        """
+        Replaces the grid contents with the given slots.
+
+        Args:
+            store (EntityStore): The store holding the positions.
+            slots (ndarray): The slots to bucket.
+        """
+        columns, rows = self.cells(store, slots)
+        keys = (columns + CELL_OFFSET) * CELL_STRIDE + rows
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.slots = slots[order]
+        self.buckets = None
+
+    def query(self, x, y):
+        """
+        Returns the stored slots in the cell of a point and its eight neighbours.
+
+        Args:
+            x (float): The x-coordinate of the point, in the frame the grid was built in.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            list: The slots, in ascending order.
+        """
+        buckets = self.buckets
+        if buckets is None:
+            buckets = self.buckets = {
+                key: [slot for _, slot in group]
+                for key, group in itertools.groupby(
+                    zip(self.keys.tolist(), self.slots.tolist()), lambda item: item[0]
+                )
+            }
+            rows = [(key + CELL_OFFSET) % CELL_STRIDE - CELL_OFFSET for key in buckets]
+            columns = [
+                (key - row) // CELL_STRIDE - CELL_OFFSET
+                for key, row in zip(buckets, rows)
+            ]
+            self.bounds = (
+                (min(columns), max(columns), min(rows), max(rows))
+                if buckets
+                else (0, -1, 0, -1)
+            )
+        column = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        column_low, column_high, row_low, row_high = self.bounds
+        if not (
+            column_low - 1 <= column <= column_high + 1
+            and row_low - 1 <= row <= row_high + 1
+        ):
+            return []
+        key = (column + CELL_OFFSET) * CELL_STRIDE + row
+        found = []
+        for delta in NEIGHBOUR_DELTAS:
+            bucket = buckets.get(key + delta)
+            if bucket:
+                found.extend(bucket)
+        found.sort()
+        return found
+
+    def candidate_pairs(self, store, slots, offset=(0.0, 0.0)):
+        """
+        Returns every (query, stored) slot pair whose cells are neighbours.
+
+        Args:
+            store (EntityStore): The store holding the query positions.
+            slots (ndarray): The query slots.
+            offset (tuple): An (x, y) translation applied to the query positions,
+                e.g. to bring them into the frame the grid was built in.
+
+        Returns:
+            tuple: The (query_slots, stored_slots) arrays, ordered by query slot.
+        """
+        if not len(slots) or not len(self.slots):
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        columns, rows = self.cells(store, slots, offset)
+        keys = (
+            (columns + CELL_OFFSET) * CELL_STRIDE + rows + NEIGHBOUR_OFFSETS
+        ).ravel()
+        start = np.searchsorted(self.keys, keys, side="left")
+        counts = np.searchsorted(self.keys, keys, side="right") - start
+        total = int(counts.sum())
+        if not total:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        query_slots = np.repeat(np.tile(slots, len(NEIGHBOUR_OFFSETS)), counts)
+        stored_slots = self.slots[np.repeat(start, counts) + offsets]
+        order = np.lexsort((stored_slots, query_slots))
+        return query_slots[order], stored_slots[order]
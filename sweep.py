@@ -0,0 +1,237 @@
+"""
+Multi-process difficulty sweeps for balancing Turtle Invaders.
+
+Plays many headless games for every point of a parameter grid, spread over
+worker processes, and streams one CSV row per game as soon as it finishes:
+
+    python sweep.py --set alien_speed=8,10,14 --set shoot_delay=0.3,0.5 \\
+        --runs 50 --policy scripted --output sweep.csv
+
+A grid can also be read from a JSON file mapping each parameter to its list
+of values (`--grid grid.json`). Parameters are the balancing arguments of
+`World`: rows, columns, alien_speed, projectile_speed, move_interval,
+shoot_delay, level_speedup and fire_rate. Each game is an independent task,
+so a sweep scales with the number of worker processes.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+from world import World
+from config import TICK_RATE
+
+PARAMETERS = {
+    "rows": int,
+    "columns": int,
+    "alien_speed": float,
+    "projectile_speed": float,
+    "move_interval": float,
+    "shoot_delay": float,
+    "level_speedup": float,
+    "fire_rate": float,
+}
+POLICIES = ("random", "scripted")
+RANDOM_ACTIONS = ((), ("left",), ("right",), ("shoot",))
+RESULT_FIELDS = (
+    "run",
+    "seed",
+    "policy",
+    "levels_cleared",
+    "survival_seconds",
+    "score",
+    "ticks",
+    "ticks_per_second",
+    "game_over",
+)
+
+
+def random_policy(rng, world, tick):
+    """
+    Picks a random action every tick.
+
+    Args:
+        rng (random.Random): The policy's random number generator.
+        world (World): The game being played.
+        tick (int): The index of the tick.
+
+    Returns:
+        tuple: The actions for the tick.
+    """
+    return rng.choice(RANDOM_ACTIONS)
+
+
+def scripted_policy(rng, world, tick):
+    """
+    Sweeps the ship across the screen while firing as often as allowed.
+
+    Args:
+        rng (random.Random): The policy's random number generator.
+        world (World): The game being played.
+        tick (int): The index of the tick.
+
+    Returns:
+        tuple: The actions for the tick.
+    """
+    return ("left" if (tick // TICK_RATE) % 2 else "right", "shoot")
+
+
+def play(task):
+    """
+    Plays one game without a display; runs in a worker process.
+
+    Args:
+        task (tuple): The (point, run, seed, policy, max_ticks) of the game,
+            where point maps parameter names to values.
+
+    Returns:
+        dict: The point and the results of the game.
+    """
+    point, run, seed, policy, max_ticks = task
+    world = World(random.Random(seed), **point)
+    rng = random.Random(seed + 1)
+    choose = random_policy if policy == "random" else scripted_policy
+    dt = 1 / TICK_RATE
+    levels_cleared = 0
+    tick = 0
+    start = time.perf_counter()
+    while tick < max_ticks and not world.is_game_over:
+        if "level_complete" in world.step(dt, choose(rng, world, tick)):
+            levels_cleared += 1
+            world.next_level()
+        tick += 1
+    elapsed = time.perf_counter() - start
+    return {
+        **point,
+        "run": run,
+        "seed": seed,
+        "policy": policy,
+        "levels_cleared": levels_cleared,
+        "survival_seconds": tick * dt,
+        "score": world.score,
+        "ticks": tick,
+        "ticks_per_second": tick / elapsed if elapsed else None,
+        "game_over": world.is_game_over,
+    }
+
+
+def grid_points(grid):
+    """
+    Returns every combination of the grid's values.
+
+    Args:
+        grid (dict): Lists of values keyed by parameter name.
+
+    Returns:
+        list: One dict of parameter values per point.
+    """
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"unknown parameters: {', '.join(sorted(unknown))}")
+    names = sorted(grid)
+    return [
+        {name: PARAMETERS[name](value) for name, value in zip(names, values)}
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def sweep(grid, runs, output, policy="random", max_ticks=30000, workers=None, seed=0):
+    """
+    Plays `runs` games for every point of the grid and writes one row per game.
+
+    Rows are written in completion order and flushed as they arrive, so a
+    long sweep can be inspected while it runs.
+
+    Args:
+        grid (dict): Lists of values keyed by parameter name.
+        runs (int): The number of games per point.
+        output (file): The text stream to write the CSV to.
+        policy (str): "random" or "scripted".
+        max_ticks (int): The most ticks a game may last.
+        workers (int, optional): The number of processes; defaults to the CPU count.
+        seed (int): The seed of the first game; every game gets its own seed.
+
+    Returns:
+        int: The number of games played.
+    """
+    points = grid_points(grid)
+    tasks = [
+        (point, run, seed + 2 * (index * runs + run), policy, max_ticks)
+        for index, point in enumerate(points)
+        for run in range(runs)
+    ]
+    writer = csv.DictWriter(output, fieldnames=sorted(grid) + list(RESULT_FIELDS))
+    writer.writeheader()
+    workers = workers or multiprocessing.cpu_count()
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with multiprocessing.Pool(workers) as pool:
+        for row in pool.imap_unordered(play, tasks, chunksize):
+            writer.writerow(row)
+            output.flush()
+    return len(tasks)
+
+
+def parse_set(values):
+    """
+    Parses --set arguments into a grid.
+
+    Args:
+        values (list): Strings of the form "name=value1,value2".
+
+    Returns:
+        dict: Lists of values keyed by parameter name.
+    """
+    grid = {}
+    for value in values:
+        name, _, listed = value.partition("=")
+        grid[name.strip()] = [item for item in listed.split(",") if item]
+    return grid
+
+
+def main():
+    """Parses the command line and runs the sweep."""
+    parser = argparse.ArgumentParser(description="Turtle Invaders parameter sweep")
+    parser.add_argument("--grid", help="JSON file mapping parameters to value lists")
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="values of one parameter (repeatable)",
+    )
+    parser.add_argument("--runs", type=int, default=10, help="games per grid point")
+    parser.add_argument("--policy", choices=POLICIES, default="random")
+    parser.add_argument("--max-ticks", type=int, default=30000)
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid:
+        with open(args.grid, "r") as file:
+            grid.update(json.load(file))
+    grid.update(parse_set(args.set))
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        sweep(
+            grid,
+            args.runs,
+            output,
+            args.policy,
+            args.max_ticks,
+            args.workers,
+            args.seed,
+        )
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+import hashlib
+import random
+import time
+import pytest
+from world import World
+from netplay import (
+    INPUT,
+    INPUT_HEADER,
+    MAGIC,
+    SCALARS,
+    SNAPSHOT,
+    SNAPSHOT_HEADER,
+    ClientLink,
+    HostLink,
+    apply_state,
+    blank_state,
+    capture,
+    decode_state,
+    encode_state,
+    open_socket,
+)
+
+
+def state_hash(state):
+    """
+    Returns a digest of every field of a networked state.
+
+    Args:
+        state (NetState): The state.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(SCALARS.pack(*state.scalars))
+    for field in (state.ships, state.aliens, state.projectiles, state.barriers):
+        digest.update(field.tobytes())
+    return digest.hexdigest()
+
+
+def host_states(ticks, seed=0):
+    """
+    Plays a two-player host world and yields its state after every tick.
+
+    Args:
+        ticks (int): The number of ticks to play.
+        seed (int): The seed of the world.
+
+    Yields:
+        tuple: The host world and its captured state.
+    """
+    world = World(random.Random(seed), players=2)
+    for tick in range(ticks):
+        sweep = "left" if tick // 60 % 2 else "right"
+        events = world.step(1 / 60, (sweep, "shoot"), ("shoot",))
+        if "level_complete" in events:
+            world.next_level()
+        elif world.is_game_over:
+            world.restart()
+        yield world, capture(world)
+
+
+def test_full_snapshots_round_trip():
+    """A state encoded against the blank baseline decodes to the same state."""
+    for world, state in host_states(900):
+        blank = blank_state(world)
+        data = b"\0\0" + encode_state(state, blank)
+        assert state_hash(decode_state(data, 2, blank)) == state_hash(state)
+
+
+def test_delta_chain_round_trips():
+    """Deltas against the previous decoded state reproduce every host state."""
+    base = None
+    for world, state in host_states(3000, seed=4):
+        if base is None:
+            base = blank_state(world)
+        decoded = decode_state(encode_state(state, base), 0, base)
+        assert state_hash(decoded) == state_hash(state)
+        base = decoded
+
+
+def test_mirror_shows_the_host_state():
+    """A mirror fed the decoded states captures the same state as the host."""
+    mirror = None
+    base = None
+    resyncs = 0
+    for tick, (world, state) in enumerate(host_states(1500, seed=2)):
+        if mirror is None:
+            mirror = World(random.Random(2), players=2)
+            base = blank_state(world)
+        decoded = decode_state(encode_state(state, base), 0, base)
+        resyncs += len(apply_state(mirror, decoded))
+        assert state_hash(capture(mirror)) == state_hash(state)
+        base = decoded
+        if tick == 500:
+            world.next_level()
+        elif tick == 1000:
+            world.restart()
+    assert resyncs == 2
+
+
+@pytest.fixture
+def session():
+    """
+    Connects a host and a client over loopback sockets.
+
+    Yields:
+        tuple: The host link, its world, the client link and its world.
+    """
+    host = HostLink(sock=open_socket("127.0.0.1", 0))
+    client = ClientLink(
+        "127.0.0.1", host.socket.getsockname()[1], sock=open_socket("127.0.0.1", 0)
+    )
+    host_world = World(random.Random(0), players=2)
+    client_world = World(random.Random(0), players=2)
+    client.step(client_world, 1 / 60, ())
+    time.sleep(0.05)
+    host.step(host_world, 1 / 60, ())
+    time.sleep(0.05)
+    yield host, host_world, client, client_world
+    host.close()
+    client.close()
+
+
+def test_client_drops_bad_snapshots(session):
+    """Truncated snapshots and packets from strangers do not reach the mirror."""
+    host, host_world, client, client_world = session
+    truncated = SNAPSHOT_HEADER.pack(MAGIC, SNAPSHOT, 999, 0, 0, 0.0) + b"\0\1\2"
+    host.socket.sendto(truncated, client.socket.getsockname())
+    stranger = open_socket("127.0.0.1", 0)
+    for _ in range(3):
+        host.step(host_world, 1 / 60, ("shoot",))
+    stranger.sendto(
+        SNAPSHOT_HEADER.pack(MAGIC, SNAPSHOT, 5000, 0, 0, 0.0) + b"\0" * 64,
+        client.socket.getsockname(),
+    )
+    time.sleep(0.05)
+    client.step(client_world, 1 / 60, ())
+    stranger.close()
+    assert client.latest == host.tick
+    assert state_hash(capture(client_world)) == state_hash(capture(host_world))
+
+
+def test_host_ignores_other_senders(session):
+    """Only the first client's inputs are applied and answered."""
+    host, host_world, client, _ = session
+    peer = host.peer
+    stranger = open_socket("127.0.0.1", 0)
+    stranger.sendto(
+        INPUT_HEADER.pack(MAGIC, INPUT, 50, 0, 0.0, 1) + bytes([1]),
+        host.socket.getsockname(),
+    )
+    time.sleep(0.05)
+    host.step(host_world, 1 / 60, ())
+    stranger.close()
+    assert host.peer == peer == client.socket.getsockname()
+    assert 50 not in host.inputs
+
+
+def test_mirror_reports_the_game_over_once():
+    """A mirror reports the game over from the state, once, without its event."""
+    host_world = World(random.Random(0), players=2)
+    mirror = World(random.Random(0), players=2)
+    base = blank_state(host_world)
+    assert (
+        apply_state(
+            mirror, decode_state(encode_state(capture(host_world), base), 0, base)
+        )
+        == []
+    )
+    host_world.end_game([])
+    state = decode_state(encode_state(capture(host_world), base), 0, base)
+    assert apply_state(mirror, state) == ["game_over"]
+    assert mirror.is_game_over
+    assert apply_state(mirror, state) == []
+
+
+def test_more_than_eight_barriers_round_trip():
+    """The changed-barrier mask grows with the number of barriers."""
+    world = World(random.Random(0), players=2)
+    state = capture(world)
+    state.barriers = state.barriers[[0] * 12]
+    base = blank_state(world)
+    base.barriers = base.barriers[[0] * 12]
+    decoded = decode_state(encode_state(state, base), 0, base)
+    assert state_hash(decoded) == state_hash(state)
+
+    eroded = capture(world)
+    eroded.barriers = state.barriers.copy()
+    eroded.barriers[10, :4] = False
+    delta = decode_state(encode_state(eroded, decoded), 0, decoded)
+    assert state_hash(delta) == state_hash(eroded)
@@ -0,0 +1,70 @@
+import random
+import pytest
+from world import World
+from savestate import load_state, save_state
+
+ACTIONS = ((), ("left",), ("right",), ("shoot",), ("left", "shoot"), ("right", "shoot"))
+
+
+def play(world, rng, ticks):
+    """
+    Steps a world with random inputs, moving on when a level is won or lost.
+
+    Args:
+        world (World): The world to step.
+        rng (random.Random): The source of the inputs.
+        ticks (int): The number of ticks to play.
+    """
+    for _ in range(ticks):
+        events = world.step(1 / 60, rng.choice(ACTIONS))
+        if "level_complete" in events:
+            world.next_level()
+        elif world.is_game_over:
+            world.restart()
+
+
+@pytest.mark.parametrize("ticks", [0, 1, 250, 1500])
+def test_load_reproduces_the_saved_state(ticks):
+    """A restored world hashes like the saved one and keeps playing in step."""
+    world = World(random.Random(3))
+    play(world, random.Random(4), ticks)
+    data = save_state(world)
+
+    restored = World(random.Random(99))
+    play(restored, random.Random(5), 40)
+    load_state(restored, data)
+    assert restored.state_hash() == world.state_hash()
+
+    play(world, random.Random(6), 600)
+    play(restored, random.Random(6), 600)
+    assert restored.state_hash() == world.state_hash()
+
+
+def test_two_player_world_round_trips():
+    """Both ships and their shot timers survive a save and load."""
+    world = World(random.Random(8), players=2)
+    for tick in range(400):
+        world.step(1 / 60, ("shoot",), ("left", "shoot") if tick % 90 < 45 else ())
+    restored = World(random.Random(0), players=2)
+    load_state(restored, save_state(world))
+    assert restored.state_hash() == world.state_hash()
+
+
+def test_wide_formation_round_trips():
+    """Shooter columns past 255 are stored without wrapping around."""
+    world = World(random.Random(1), rows=2, columns=300)
+    play(world, random.Random(2), 120)
+    assert max(world.formation.shooter_columns) > 255
+    restored = World(random.Random(0), rows=2, columns=300)
+    load_state(restored, save_state(world))
+    assert restored.formation.shooter_columns == world.formation.shooter_columns
+    assert restored.state_hash() == world.state_hash()
+
+
+def test_load_rejects_another_setup():
+    """A snapshot only loads into a world of the same dimensions."""
+    data = save_state(World(random.Random(1), rows=3, columns=8))
+    with pytest.raises(ValueError):
+        load_state(World(random.Random(1), rows=4, columns=8), data)
+    with pytest.raises(ValueError):
+        load_state(World(random.Random(1)), data[:20])
@@ -0,0 +1,72 @@
+import random
+import pytest
+from world import World
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+
+ACTIONS = ((), ("left",), ("right",), ("shoot",), ("left", "shoot"), ("right", "shoot"))
+
+
+def seeded_world(seed, rows, columns, threshold):
+    """
+    Builds a world whose collisions and movement use the given batch threshold.
+
+    Args:
+        seed (int): The seed of the world.
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        threshold (int): The most live projectiles handled one at a time.
+
+    Returns:
+        World: The world.
+    """
+    world = World(random.Random(seed), rows, columns)
+    world.batch_threshold = threshold
+    world.projectiles.batch_threshold = threshold
+    return world
+
+
+def hashes(seed, rows, columns, projectiles, threshold, ticks=600):
+    """
+    Plays a seeded game and yields the state hash after every tick.
+
+    Random projectiles are spawned to keep `projectiles` of them alive, so
+    both collision paths see crowded grids as well as sparse ones.
+
+    Args:
+        seed (int): The seed of the world, the inputs and the projectiles.
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        projectiles (int): The number of projectiles kept alive.
+        threshold (int): The most live projectiles handled one at a time.
+        ticks (int): The number of ticks to play.
+
+    Yields:
+        str: The state hash after each tick.
+    """
+    world = seeded_world(seed, rows, columns, threshold)
+    rng = random.Random(seed + 1)
+    for _ in range(ticks):
+        while len(world.projectiles) < projectiles:
+            world.projectiles.spawn(
+                rng.uniform(-SCREEN_WIDTH / 2, SCREEN_WIDTH / 2),
+                rng.uniform(-SCREEN_HEIGHT / 2, SCREEN_HEIGHT / 2),
+                rng.choice((1, -1)),
+            )
+        world.step(1 / 60, rng.choice(ACTIONS))
+        if world.is_game_over:
+            world.restart()
+        elif world.is_level_complete:
+            world.next_level()
+        yield world.state_hash()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize(
+    "rows, columns, projectiles", [(3, 8, 0), (3, 8, 16), (6, 12, 64)]
+)
+def test_scalar_and_batched_paths_agree(seed, rows, columns, projectiles):
+    """Checking every projectile alone or in batches gives the same game."""
+    scalar = hashes(seed, rows, columns, projectiles, 10**9)
+    batched = hashes(seed, rows, columns, projectiles, 0)
+    for tick, (expected, actual) in enumerate(zip(scalar, batched)):
+        assert actual == expected, f"diverged at tick {tick}"
@@ -0,0 +1,635 @@
+import hashlib
+import random
+import struct
+import numpy as np
+from entity_store import EntityStore, hits
+from spatial_hash import SpatialHash
+from formation import AlienFormation
+from barrier_mask import BarrierMasks, load_mask
+from config import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    SHIP_SPEED,
+    ALIEN_ROWS,
+    ALIEN_COLUMNS,
+    BARRIER_POSITION,
+    BARRIER_IMAGE,
+    BARRIER_CRATER_RADIUS,
+    ALIEN_MOVE_INTERVAL,
+    INITIAL_ALIEN_SPEED,
+    INITIAL_PROJECTILE_SPEED,
+    SHOOT_DELAY,
+    TICK_RATE,
+    ALIEN_MARCH_SPEEDUP,
+    LEVEL_SPEEDUP,
+    ALIEN_FIRE_RATE,
+    ALIEN_SHOT_BATCH,
+    BATCH_THRESHOLD,
+)
+
+HIT_RADIUS = 20
+SHIP_START = (0, -250)
+SHIP_SPACING = 200  # distance between the ships of a two-player game
+
+
+class Entity:
+    """
+    A lightweight object in the simulated game world.
+
+    Attributes:
+        x (float): The x-coordinate of the entity.
+        y (float): The y-coordinate of the entity.
+        direction (int): Direction of movement (1 for right/up, -1 for left/down).
+        alive (bool): Whether the entity is still part of the world.
+    """
+
+    __slots__ = ("x", "y", "direction", "alive")
+
+    def __init__(self, x, y, direction=1):
+        """
+        Initializes the entity at the given position.
+
+        Args:
+            x (float): The x-coordinate of the entity.
+            y (float): The y-coordinate of the entity.
+            direction (int): Direction of movement.
+        """
+        self.x = x
+        self.y = y
+        self.direction = direction
+        self.alive = True
+
+
+class World:
+    """
+    The headless game model holding every rule of Turtle Invaders.
+
+    The world knows nothing about turtle, Tk or pygame: it only tracks positions,
+    directions, alive flags and the score, and advances them with `step`.
+
+    Attributes:
+        rng (random.Random): The random number generator used by the simulation.
+        rows (int): The number of alien rows.
+        columns (int): The number of alien columns.
+        initial_alien_speed (float): The alien speed on the first level.
+        initial_projectile_speed (float): The projectile speed on the first level.
+        move_interval (float): Seconds between two alien steps of a full formation.
+        shoot_delay (float): The minimum seconds between two shots of the player.
+        level_speedup (float): The factor both speeds grow by on each new level.
+        fire_rate (float): The mean number of alien shots per second.
+        players (int): The number of ships, 1 or 2.
+        batch_threshold (int): The most live projectiles checked for collisions
+            one at a time; above it they are checked in array batches.
+        alien_shot_times (list): Upcoming alien shot times, drawn ahead for the level.
+        next_alien_shot (int): The index of the next due time in `alien_shot_times`.
+        alien_speed (float): The distance the aliens move on each alien step.
+        projectile_speed (float): The distance a projectile moves per nominal tick.
+        score (int): The current score of the player.
+        level (int): The current level, starting at 1.
+        time (float): Simulated seconds elapsed in the current level.
+        resets (int): The number of levels started, counting restarts.
+        ships (list): The spaceship of each player; a hit ship stops being alive.
+        ship (Entity): The first player's spaceship.
+        last_shot_times (list): The level time of each player's last shot.
+        aliens (EntityStore): The aliens, at positions relative to the formation.
+        formation (AlienFormation): The offset, direction and bounds of the aliens.
+        barriers (EntityStore): The barriers; a barrier dies once its mask is empty.
+        barrier_masks (BarrierMasks): The eroded occupancy bitmask of each barrier.
+        projectiles (EntityStore): Every projectile; direction 1 for the
+            spaceship's shots and -1 for the aliens'.
+        is_game_over (bool): Whether every ship has been hit.
+        is_level_complete (bool): Whether every alien of the level is destroyed.
+        profiler (Profiler): Records the time of each phase of `step`, or None.
+
+    Methods:
+        reset_level(): Places a fresh formation, barriers and ship.
+        next_level(): Speeds the game up and starts the next level.
+        restart(): Starts a new game from the first level.
+        step(dt, inputs, partner_inputs): Advances the simulation and returns the
+            events that happened.
+        state_hash(): Returns a digest of the whole simulation state.
+    """
+
+    def __init__(
+        self,
+        rng=None,
+        rows=ALIEN_ROWS,
+        columns=ALIEN_COLUMNS,
+        alien_speed=INITIAL_ALIEN_SPEED,
+        projectile_speed=INITIAL_PROJECTILE_SPEED,
+        move_interval=ALIEN_MOVE_INTERVAL,
+        shoot_delay=SHOOT_DELAY,
+        level_speedup=LEVEL_SPEEDUP,
+        fire_rate=ALIEN_FIRE_RATE,
+        players=1,
+    ):
+        """
+        Initializes the world at the first level.
+
+        The balancing arguments default to the values in config.py; they are
+        only overridden by tools such as the parameter sweep.
+
+        Args:
+            rng (random.Random, optional): The random number generator to use.
+            rows (int): The number of alien rows.
+            columns (int): The number of alien columns.
+            alien_speed (float): The alien speed on the first level.
+            projectile_speed (float): The projectile speed on the first level.
+            move_interval (float): Seconds between two alien steps of a full formation.
+            shoot_delay (float): The minimum seconds between two shots of the player.
+            level_speedup (float): The factor both speeds grow by on each new level.
+            fire_rate (float): The mean number of alien shots per second.
+            players (int): The number of ships, 1 or 2.
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self.rows = rows
+        self.columns = columns
+        self.initial_alien_speed = alien_speed
+        self.initial_projectile_speed = projectile_speed
+        self.move_interval = move_interval
+        self.shoot_delay = shoot_delay
+        self.level_speedup = level_speedup
+        self.fire_rate = fire_rate
+        self.players = players
+        self.batch_threshold = BATCH_THRESHOLD
+        self.resets = 0
+        self.profiler = None
+        self.alien_speed = alien_speed
+        self.projectile_speed = projectile_speed
+        self.score = 0
+        self.level = 1
+        self.aliens = EntityStore(rows * columns)
+        self.formation = AlienFormation(self.aliens, ALIEN_MARCH_SPEEDUP)
+        self.barriers = EntityStore(len(BARRIER_POSITION))
+        self.barrier_masks = BarrierMasks(
+            load_mask(BARRIER_IMAGE), BARRIER_CRATER_RADIUS
+        )
+        self.projectiles = EntityStore()
+        self.alien_grid = SpatialHash(HIT_RADIUS)
+        self.barrier_grid = SpatialHash(HIT_RADIUS)
+        self.projectile_grid = SpatialHash(HIT_RADIUS)
+        self.reset_level()
+
+    def reset_level(self):
+        """Places a fresh formation, barriers and ship for the current level."""
+        self.time = 0.0
+        self.alien_move_timer = 0.0
+        self.last_shot_times = [-self.shoot_delay] * self.players
+        self.is_game_over = False
+        self.is_level_complete = False
+        x, y = SHIP_START
+        self.ships = [
+            Entity(x + (player - (self.players - 1) / 2) * SHIP_SPACING, y)
+            for player in range(self.players)
+        ]
+        self.resets += 1
+        self.formation.create(self.rows, self.columns)
+        self.barriers.clear()
+        for x, y in BARRIER_POSITION:
+            self.barriers.spawn(x, y)
+        self.barrier_masks.reset(len(BARRIER_POSITION))
+        self.projectiles.clear()
+        self.alien_grid.build(self.aliens, self.aliens.alive_slots())
+        self.barrier_grid.build(self.barriers, self.barriers.alive_slots())
+        self.schedule_alien_shots(0.0)
+
+    @property
+    def ship(self):
+        """
+        Returns the first player's spaceship.
+
+        Returns:
+            Entity: The spaceship.
+        """
+        return self.ships[0]
+
+    def schedule_alien_shots(self, start):
+        """
+        Draws the times of the next alien shots ahead of time.
+
+        Shots form a Poisson process: the gaps between them are exponential
+        with mean 1 / `fire_rate`, so the rate in simulated seconds does not
+        depend on the tick rate.
+
+        Args:
+            start (float): The level time the first gap is counted from.
+        """
+        times = []
+        if self.fire_rate > 0:
+            for _ in range(ALIEN_SHOT_BATCH):
+                start += self.rng.expovariate(self.fire_rate)
+                times.append(start)
+        else:
+            times.append(float("inf"))
+        self.alien_shot_times = times
+        self.next_alien_shot = 0
+
+    def next_level(self):
+        """Speeds the game up and starts the next level."""
+        self.alien_speed *= self.level_speedup
+        self.projectile_speed *= self.level_speedup
+        self.level += 1
+        self.reset_level()
+
+    def restart(self):
+        """Starts a new game from the first level."""
+        self.alien_speed = self.initial_alien_speed
+        self.projectile_speed = self.initial_projectile_speed
+        self.score = 0
+        self.level = 1
+        self.reset_level()
+
+    def step(self, dt, inputs=(), partner_inputs=()):
+        """
+        Advances the simulation.
+
+        Args:
+            dt (float): The simulated time to advance, in seconds.
+            inputs (iterable): Actions to apply this step ("left", "right", "shoot").
+            partner_inputs (iterable): The second player's actions, if there is one.
+
+        Returns:
+            list: The names of the events that happened during the step.
+        """
+        events = []
+        if self.is_game_over or self.is_level_complete:
+            return events
+
+        profiler = self.profiler
+        self.time += dt
+        for action in inputs:
+            self.apply_input(action, dt, events)
+        for action in partner_inputs:
+            self.apply_input(action, dt, events, player=1)
+        if profiler is not None:
+            profiler.mark("inputs")
+
+        self.alien_move_timer += dt
+        if self.alien_move_timer >= self.formation.move_interval(self.move_interval):
+            self.formation.step(self.alien_speed)
+            self.alien_move_timer = 0.0
+        if profiler is not None:
+            profiler.mark("move_aliens")
+        self.move_projectiles(dt)
+        if profiler is not None:
+            profiler.mark("move_projectiles")
+        self.check_collisions(events)
+        if profiler is not None:
+            profiler.mark("check_collisions")
+        if self.is_game_over:
+            return events
+
+        self.alien_shoot(events)
+        if profiler is not None:
+            profiler.mark("alien_shoot")
+        if not self.aliens:
+            self.is_level_complete = True
+            events.append("level_complete")
+        return events
+
+    def apply_input(self, action, dt, events, player=0):
+        """
+        Applies a single player action for one step.
+
+        "left" and "right" mean the movement key is held during the step, so
+        the ship covers a distance proportional to `dt` whatever the tick rate.
+        Ships that were hit ignore their player's actions.
+
+        Args:
+            action (str): One of "left", "right" or "shoot".
+            dt (float): The simulated time of the step, in seconds.
+            events (list): The list to append resulting events to.
+            player (int): The index of the player acting.
+        """
+        ship = self.ships[player]
+        if not ship.alive:
+            return
+        if action == "left":
+            new_x = ship.x - SHIP_SPEED * TICK_RATE * dt
+            if new_x > -SCREEN_WIDTH / 2:
+                ship.x = new_x
+        elif action == "right":
+            new_x = ship.x + SHIP_SPEED * TICK_RATE * dt
+            if new_x < SCREEN_WIDTH / 2:
+                ship.x = new_x
+        elif action == "shoot":
+            if self.time - self.last_shot_times[player] >= self.shoot_delay:
+                self.projectiles.spawn(ship.x, ship.y, 1)
+                self.last_shot_times[player] = self.time
+                events.append("shoot")
+
+    def move_projectiles(self, dt):
+        """
+        Moves every projectile and drops those that leave the screen.
+
+        Args:
+            dt (float): The simulated time to advance, in seconds.
+        """
+        self.projectiles.move(dy=self.projectile_speed * TICK_RATE * dt)
+        self.projectiles.cull(-SCREEN_HEIGHT / 2, SCREEN_HEIGHT / 2)
+
+    def check_collisions(self, events):
+        """
+        Checks for and handles collisions between projectiles, aliens, barriers, and the ship.
+
+        Each NumPy call has a fixed cost of a few microseconds, which dominates
+        when only a handful of projectiles are in flight, as in a normal game.
+        Up to `batch_threshold` live projectiles are therefore checked one at
+        a time in plain Python, and larger volleys in array batches. Both
+        paths apply the same tests in the same order, so they reach the same
+        state and the choice never changes a replay.
+
+        Args:
+            events (list): The list to append resulting events to.
+        """
+        live = self.projectiles.alive_slots()
+        if len(live) > self.batch_threshold:
+            self.check_collisions_batched(events, live)
+        else:
+            self.check_collisions_scalar(events, live)
+
+    def check_collisions_batched(self, events, live):
+        """
+        Checks collisions with array operations over every projectile at once.
+
+        Candidate pairs come from spatial hashes, so each projectile is only
+        tested against nearby objects, and the distance tests run as batched
+        array operations. Only the (rare) actual hits are resolved one by one,
+        and the entities they destroy are removed once each phase is resolved,
+        so no collection is mutated while it is iterated. The alien grid holds
+        formation-local positions, so it is built once per level and queried
+        with the formation offset; dead aliens left in it are skipped by their
+        alive flag. Barriers are tested against their bitmasks instead of a
+        radius, and each hit carves a crater out of the barrier it struck.
+
+        Args:
+            events (list): The list to append resulting events to.
+            live (ndarray): The slots of the live projectiles.
+        """
+        projectiles = self.projectiles
+        aliens = self.aliens
+        formation = self.formation
+        offset = (formation.offset_x, formation.offset_y)
+        upward = live[projectiles.direction[live] > 0]
+        downward = live[projectiles.direction[live] < 0]
+
+        shots, targets = self.alien_grid.candidate_pairs(
+            projectiles, upward, (-offset[0], -offset[1])
+        )
+        shots, targets = hits(projectiles, shots, aliens, targets, HIT_RADIUS, offset)
+        spent = set()
+        destroyed = set()
+        for shot, alien in zip(shots.tolist(), targets.tolist()):
+            if shot in spent or alien in destroyed or not aliens.alive[alien]:
+                continue
+            spent.add(shot)
+            destroyed.add(alien)
+            self.score += 10
+            events.append("alien_hit")
+        formation.kill(destroyed)
+        projectiles.kill(spent)
+        upward = upward[projectiles.alive[upward]]
+
+        barriers = self.barriers
+        masks = self.barrier_masks
+        for group in (upward, downward):
+            shots, targets = self.barrier_grid.candidate_pairs(projectiles, group)
+            dx = projectiles.x[shots] - barriers.x[targets]
+            dy = projectiles.y[shots] - barriers.y[targets]
+            solid = masks.contains(targets, dx, dy)
+            spent.clear()
+            for shot, barrier, x, y in zip(
+                shots[solid].tolist(),
+                targets[solid].tolist(),
+                dx[solid].tolist(),
+                dy[solid].tolist(),
+            ):
+                if shot in spent:
+                    continue
+                spent.add(shot)
+                events.append("barrier_hit")
+                if not masks.erode(barrier, x, y):
+                    barriers.kill((barrier,))
+            projectiles.kill(spent)
+        upward = upward[projectiles.alive[upward]]
+        downward = downward[projectiles.alive[downward]]
+
+        for ship in self.ships:
+            if not ship.alive:
+                continue
+            dx = projectiles.x[downward] - ship.x
+            dy = projectiles.y[downward] - ship.y
+            if np.any(dx * dx + dy * dy < HIT_RADIUS * HIT_RADIUS):
+                ship.alive = False
+                if any(other.alive for other in self.ships):
+                    events.append("ship_destroyed")
+        if not any(other.alive for other in self.ships):
+            self.end_game(events)
+            return
+
+        self.projectile_grid.build(projectiles, upward)
+        shots, targets = self.projectile_grid.candidate_pairs(projectiles, downward)
+        shots, targets = hits(projectiles, shots, projectiles, targets, HIT_RADIUS)
+        spent.clear()
+        for shot, target in zip(shots.tolist(), targets.tolist()):
+            if shot not in spent and target not in spent:
+                spent.add(shot)
+                spent.add(target)
+        projectiles.kill(spent)
+
+        if formation.bottom_y() <= SHIP_START[1] + HIT_RADIUS:
+            self.end_game(events)
+
+    def check_collisions_scalar(self, events, live):
+        """
+        Checks collisions one projectile at a time, for small numbers of them.
+
+        Mirrors `check_collisions_batched` step for step: the same grids
+        select the candidates, pairs are visited in the same (projectile,
+        target) order, every barrier hit of a group is tested before any of
+        them erodes, and the same sets are filled in the same order, so both
+        paths kill the same entities in the same slot order.
+
+        Args:
+            events (list): The list to append resulting events to.
+            live (ndarray): The slots of the live projectiles.
+        """
+        projectiles = self.projectiles
+        aliens = self.aliens
+        formation = self.formation
+        offset_x, offset_y = formation.offset_x, formation.offset_y
+        reach = HIT_RADIUS * HIT_RADIUS
+        slots = live.tolist()
+        xs = projectiles.x.tolist()
+        ys = projectiles.y.tolist()
+        position = {slot: (xs[slot], ys[slot]) for slot in slots}
+        directions = projectiles.direction.tolist()
+        upward = [slot for slot in slots if directions[slot] > 0]
+        downward = [slot for slot in slots if directions[slot] < 0]
+
+        spent = set()
+        destroyed = set()
+        for shot in upward:
+            x, y = position[shot]
+            for alien in self.alien_grid.query(x - offset_x, y - offset_y):
+                dx = x - (aliens.x.item(alien) + offset_x)
+                dy = y - (aliens.y.item(alien) + offset_y)
+                if dx * dx + dy * dy >= reach:
+                    continue
+                if shot in spent or alien in destroyed or not aliens.alive[alien]:
+                    continue
+                spent.add(shot)
+                destroyed.add(alien)
+                self.score += 10
+                events.append("alien_hit")
+        formation.kill(destroyed)
+        projectiles.kill(spent)
+        upward = [shot for shot in upward if shot not in spent]
+
+        barriers = self.barriers
+        masks = self.barrier_masks
+        for group in (upward, downward):
+            solid = []
+            for shot in group:
+                x, y = position[shot]
+                for barrier in self.barrier_grid.query(x, y):
+                    dx = x - barriers.x.item(barrier)
+                    dy = y - barriers.y.item(barrier)
+                    if masks.contains_point(barrier, dx, dy):
+                        solid.append((shot, barrier, dx, dy))
+            spent.clear()
+            for shot, barrier, dx, dy in solid:
+                if shot in spent:
+                    continue
+                spent.add(shot)
+                events.append("barrier_hit")
+                if not masks.erode(barrier, dx, dy):
+                    barriers.kill((barrier,))
+            projectiles.kill(spent)
+        alive = projectiles.alive
+        upward = [shot for shot in upward if alive[shot]]
+        downward = [shot for shot in downward if alive[shot]]
+
+        for ship in self.ships:
+            if not ship.alive:
+                continue
+            for shot in downward:
+                x, y = position[shot]
+                dx = x - ship.x
+                dy = y - ship.y
+                if dx * dx + dy * dy < reach:
+                    ship.alive = False
+                    if any(other.alive for other in self.ships):
+                        events.append("ship_destroyed")
+                    break
+        if not any(other.alive for other in self.ships):
+            self.end_game(events)
+            return
+
+        cell_size = self.projectile_grid.cell_size
+        cells = []
+        for target in upward:
+            x, y = position[target]
+            cells.append((target, int(x // cell_size), int(y // cell_size)))
+        spent.clear()
+        for shot in downward:
+            x, y = position[shot]
+            column, row = int(x // cell_size), int(y // cell_size)
+            for target, target_column, target_row in cells:
+                if not (
+                    -1 <= target_row - row <= 1 and -1 <= target_column - column <= 1
+                ):
+                    continue
+                target_x, target_y = position[target]
+                dx = x - target_x
+                dy = y - target_y
+                if (
+                    dx * dx + dy * dy < reach
+                    and shot not in spent
+                    and target not in spent
+                ):
+                    spent.add(shot)
+                    spent.add(target)
+        projectiles.kill(spent)
+
+        if formation.bottom_y() <= SHIP_START[1] + HIT_RADIUS:
+            self.end_game(events)
+
+    def alien_shoot(self, events):
+        """
+        Fires every alien shot scheduled up to the current time.
+
+        Each shot comes from a random column, from its lowest living alien.
+
+        Args:
+            events (list): The list to append resulting events to.
+        """
+        times = self.alien_shot_times
+        while self.time >= times[self.next_alien_shot]:
+            shooter = self.formation.shooter(self.rng)
+            if shooter is None:
+                return
+            self.projectiles.spawn(
+                self.aliens.x[shooter] + self.formation.offset_x,
+                self.aliens.y[shooter] + self.formation.offset_y,
+                -1,
+            )
+            events.append("alien_shoot")
+            self.next_alien_shot += 1
+            if self.next_alien_shot == len(times):
+                self.schedule_alien_shots(times[-1])
+                times = self.alien_shot_times
+
+    def end_game(self, events):
+        """
+        Marks the game as lost.
+
+        Args:
+            events (list): The list to append the game over event to.
+        """
+        self.is_game_over = True
+        events.append("game_over")
+
+    def state_hash(self):
+        """
+        Returns a digest of the whole simulation state.
+
+        Two worlds built with the same seed and fed the same inputs have the
+        same digest after every step, which is what replays are checked against.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest.
+        """
+        digest = hashlib.sha256()
+        digest.update(
+            struct.pack(
+                "<qq??b7d",
+                self.score,
+                self.level,
+                self.is_game_over,
+                self.is_level_complete,
+                self.formation.direction,
+                self.time,
+                self.alien_move_timer,
+                self.alien_speed,
+                self.projectile_speed,
+                self.alien_shot_times[self.next_alien_shot],
+                self.formation.offset_x,
+                self.formation.offset_y,
+            )
+        )
+        for ship, last_shot_time in zip(self.ships, self.last_shot_times):
+            digest.update(
+                struct.pack("<?3d", ship.alive, ship.x, ship.y, last_shot_time)
+            )
+        for store in (self.aliens, self.barriers, self.projectiles):
+            slots = store.alive_slots()
+            for column in (
+                slots,
+                store.x[slots],
+                store.y[slots],
+                store.direction[slots],
+            ):
+                digest.update(column.tobytes())
+        digest.update(self.barrier_masks.masks.tobytes())
+        return digest.hexdigest()